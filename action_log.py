@@ -0,0 +1,240 @@
+"""
+Journal des actions du joueur (ajout seul)
+Chaque action qui modifie l'état de la partie est enregistrée sur 2 octets,
+à la suite de la graine : la partie peut ensuite être rejouée à l'identique (voir replay.py)
+
+Format (petit-boutiste) :
+    en-tête        : magic (4 o), version (1 o), graine (8 o), lignes et colonnes de la grille (2 x 2 o),
+                     profil de difficulté (longueur sur 1 o, nom en UTF-8)
+    action         : code (1 o), argument (1 o)
+    instantané     : SNAPSHOT (1 o), 0 (1 o), longueur (4 o), sauvegarde (voir savegame.py)
+"""
+import io
+import struct
+import config
+
+
+MAGIC = b"BPLG"
+VERSION = 1
+
+# Codes des actions (stables : ne pas renuméroter)
+MOVE = 1              # argument : direction
+CHOOSE_ROOM = 2       # argument : index de la salle proposée
+REROLL = 3            # argument : index de la salle sélectionnée au moment de la relance
+CANCEL_SELECTION = 4
+OPEN_ITEMS = 5
+OPEN_SHOP = 6
+CLOSE_MENU = 7
+INTERACT = 8          # argument : index de l'objet dans la salle
+BUY = 9               # argument : index de l'article de la boutique
+RESTART = 10
+SNAPSHOT = 255        # état chargé depuis une sauvegarde
+
+ACTION_NAMES = {
+    MOVE: "déplacement",
+    CHOOSE_ROOM: "choix de salle",
+    REROLL: "relance",
+    CANCEL_SELECTION: "annulation",
+    OPEN_ITEMS: "ouverture des objets",
+    OPEN_SHOP: "ouverture de la boutique",
+    CLOSE_MENU: "fermeture du menu",
+    INTERACT: "interaction",
+    BUY: "achat",
+    RESTART: "redémarrage",
+    SNAPSHOT: "instantané",
+}
+
+DIRECTIONS = ("UP", "DOWN", "LEFT", "RIGHT")
+DIRECTION_CODES = {d: i for i, d in enumerate(DIRECTIONS)}
+
+_HEADER = struct.Struct("<4sBQ")
+_DIMENSIONS = struct.Struct("<HH")
+_NAME_LENGTH = struct.Struct("<B")
+_RECORD = struct.Struct("<BB")
+_LENGTH = struct.Struct("<I")
+
+
+class ActionLog:
+    """Journal des actions, écrit au fil de l'eau dans un flux binaire"""
+
+    def __init__(self, seed, stream=None, rows=None, cols=None, difficulty=None):
+        """
+        Initialisation du journal
+
+        Args:
+            seed: Graine de la partie
+            stream: Flux binaire en écriture (en mémoire si None)
+            rows: Nombre de lignes de la grille (config.GRID_ROWS par défaut)
+            cols: Nombre de colonnes de la grille (config.GRID_COLS par défaut)
+            difficulty: Nom du profil de difficulté de la partie (config.DIFFICULTY par défaut)
+        """
+        self.seed = seed
+        self.rows = rows if rows is not None else config.GRID_ROWS
+        self.cols = cols if cols is not None else config.GRID_COLS
+        self.difficulty = difficulty if difficulty is not None else config.DIFFICULTY
+        name = self.difficulty.encode("utf-8")
+        if len(name) > 255:
+            raise ValueError(f"Nom de profil de difficulté trop long : {self.difficulty}")
+        self.stream = stream if stream is not None else io.BytesIO()
+        self.count = 0
+        self.stream.write(
+            _HEADER.pack(MAGIC, VERSION, seed) + _DIMENSIONS.pack(self.rows, self.cols)
+            + _NAME_LENGTH.pack(len(name)) + name
+        )
+
+    @classmethod
+    def create(cls, path, seed, rows=None, cols=None, difficulty=None):
+        """
+        Créer un journal dans un fichier
+
+        Args:
+            path: Chemin du fichier
+            seed: Graine de la partie
+            rows: Nombre de lignes de la grille
+            cols: Nombre de colonnes de la grille
+            difficulty: Nom du profil de difficulté
+
+        Returns:
+            ActionLog
+        """
+        return cls(seed, open(path, "wb"), rows, cols, difficulty)
+
+    @classmethod
+    def resume(cls, data):
+        """
+        Reprendre un journal en mémoire (les actions suivantes s'ajoutent à celles de data)
+
+        Args:
+            data: Contenu binaire du journal
+
+        Returns:
+            ActionLog
+        """
+        seed, rows, cols, difficulty, offset = _read_header(data)
+        log = cls(seed, rows=rows, cols=cols, difficulty=difficulty)
+        log.stream.write(data[offset:])
+        log.count = len(read_log(data)[1])
+        return log
+
+    def record(self, action, arg=0):
+        """
+        Ajouter une action
+
+        Args:
+            action: Code de l'action
+            arg: Argument (0-255)
+
+        Raises:
+            ValueError: si l'argument ne tient pas sur un octet
+        """
+        if not 0 <= arg <= 255:
+            raise ValueError(f"Argument d'action hors limites (0-255) : {arg}")
+        self.stream.write(_RECORD.pack(action, arg))
+        self.count += 1
+
+    def snapshot(self, data):
+        """
+        Ajouter un instantané complet (après un chargement de sauvegarde)
+
+        Args:
+            data: Sauvegarde produite par savegame.dumps()
+        """
+        self.stream.write(_RECORD.pack(SNAPSHOT, 0) + _LENGTH.pack(len(data)) + data)
+        self.count += 1
+
+    def getvalue(self):
+        """Obtenir le contenu d'un journal en mémoire"""
+        return self.stream.getvalue()
+
+    def flush(self):
+        """Vider le tampon d'écriture"""
+        self.stream.flush()
+
+    def close(self):
+        """Fermer le flux"""
+        self.stream.close()
+
+
+def _read_header(data):
+    """Décoder l'en-tête : (graine, lignes, colonnes, profil, position du premier enregistrement)"""
+    if len(data) < _HEADER.size:
+        raise ValueError("Journal tronqué")
+    magic, version, seed = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Ce fichier n'est pas un journal d'actions Blue Prince")
+    if version != VERSION:
+        raise ValueError(f"Version de journal non prise en charge : {version}")
+    offset = _HEADER.size + _DIMENSIONS.size
+    if len(data) < offset:
+        raise ValueError("Journal tronqué")
+    rows, cols = _DIMENSIONS.unpack_from(data, _HEADER.size)
+    if len(data) < offset + _NAME_LENGTH.size:
+        raise ValueError("Journal tronqué")
+    length = _NAME_LENGTH.unpack_from(data, offset)[0]
+    offset += _NAME_LENGTH.size
+    if len(data) < offset + length:
+        raise ValueError("Journal tronqué")
+    try:
+        difficulty = bytes(data[offset:offset + length]).decode("utf-8")
+    except UnicodeDecodeError:
+        raise ValueError("Journal corrompu : nom du profil de difficulté illisible") from None
+    return seed, rows, cols, difficulty, offset + length
+
+
+def read_header(data):
+    """
+    Décoder l'en-tête d'un journal
+
+    Args:
+        data: Contenu binaire du journal
+
+    Returns:
+        tuple: (graine, lignes, colonnes de la grille, nom du profil de difficulté)
+    """
+    return _read_header(data)[:4]
+
+
+def read_log(data):
+    """
+    Décoder un journal
+
+    Args:
+        data: Contenu binaire du journal
+
+    Returns:
+        tuple: (graine, liste de (code, argument)) ; l'argument d'un instantané est la sauvegarde
+    """
+    seed, _, _, _, offset = _read_header(data)
+
+    records = []
+    end = len(data)
+    # Un enregistrement incomplet en fin de fichier (écriture interrompue) est ignoré
+    while offset + _RECORD.size <= end:
+        action, arg = _RECORD.unpack_from(data, offset)
+        offset += _RECORD.size
+        if action == SNAPSHOT:
+            if offset + _LENGTH.size > end:
+                break
+            length = _LENGTH.unpack_from(data, offset)[0]
+            offset += _LENGTH.size
+            if offset + length > end:
+                break
+            records.append((SNAPSHOT, bytes(data[offset:offset + length])))
+            offset += length
+        else:
+            records.append((action, arg))
+    return seed, records
+
+
+def load_log(path):
+    """
+    Lire un journal depuis un fichier
+
+    Args:
+        path: Chemin du fichier
+
+    Returns:
+        tuple: (graine, liste des actions)
+    """
+    with open(path, "rb") as f:
+        return read_log(f.read())
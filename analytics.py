@@ -0,0 +1,254 @@
+"""
+Export des résultats de simulation en format colonnaire
+Les enregistrements par partie et par tour sont accumulés par colonnes puis écrits par lots
+en Parquet ou Arrow IPC (si pyarrow est installé), sinon en CSV
+"""
+import csv
+import os
+import action_log
+from events import EventType
+from inventory import FIELD_IDS
+from game import Game, GameState
+from simulation import run_game, random_policy
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pyarrow est optionnel : repli sur CSV
+    pyarrow = None
+
+
+FORMATS = ("parquet", "arrow", "csv")
+
+# Vecteur d'inventaire : une colonne par ressource, dans l'ordre de inventory.FIELD_IDS
+INVENTORY_FIELDS = (
+    ("steps", "amount"), ("coins", "amount"), ("gems", "amount"), ("keys", "amount"), ("dice", "amount"),
+    ("shovel", "count"), ("hammer", "count"), ("lockpick", "count"),
+    ("metal_detector", "count"), ("lucky_rabbit_foot", "count"),
+)
+INVENTORY_COLUMNS = tuple(("inv_" + name, "int") for name, _ in INVENTORY_FIELDS)
+
+# Colonnes (nom, type) ; les listes sont séparées par "|" en CSV
+TURN_COLUMNS = (
+    ("game_id", "int"), ("turn", "int"), ("action", "str"), ("arg", "int"), ("row", "int"), ("col", "int"),
+    ("offered_rooms", "list_str"), ("chosen_room", "str"), ("lock_levels", "list_int"),
+) + INVENTORY_COLUMNS
+
+GAME_COLUMNS = (
+    ("game_id", "int"), ("seed", "int"), ("victory", "bool"), ("turns", "int"), ("rooms_placed", "int"),
+    ("final_row", "int"), ("final_col", "int"), ("doors_opened", "int"), ("end_message", "str"),
+) + INVENTORY_COLUMNS
+
+
+def _arrow_schema(columns):
+    """Construire le schéma Arrow d'une table (types explicites : un lot vide ne change pas le schéma)"""
+    types = {
+        "int": pyarrow.int64(),
+        "str": pyarrow.string(),
+        "bool": pyarrow.bool_(),
+        "list_str": pyarrow.list_(pyarrow.string()),
+        "list_int": pyarrow.list_(pyarrow.int64()),
+    }
+    return pyarrow.schema([(name, types[kind]) for name, kind in columns])
+
+
+def inventory_vector(inventory):
+    """
+    Obtenir le vecteur d'inventaire
+
+    Args:
+        inventory: Objet Inventory
+
+    Returns:
+        list: quantités dans l'ordre de INVENTORY_COLUMNS
+    """
+    counts = inventory.counts
+    return [counts[item_id] for item_id in FIELD_IDS]
+
+
+class _ColumnTable:
+    """Table écrite par lots de colonnes dans un fichier"""
+
+    def __init__(self, path, columns, fmt):
+        self.path = path
+        self.columns = [name for name, _ in columns]
+        self.list_columns = {name for name, kind in columns if kind.startswith("list")}
+        self.schema = _arrow_schema(columns) if fmt != "csv" else None
+        self.fmt = fmt
+        self.data = {name: [] for name in self.columns}
+        self.rows = 0
+        self.writer = None
+        self.file = None
+
+    def append(self, values):
+        """Ajouter une ligne (valeurs dans l'ordre des colonnes)"""
+        for name, value in zip(self.columns, values):
+            self.data[name].append(value)
+        self.rows += 1
+
+    def flush(self):
+        """Écrire le lot en cours"""
+        if self.rows == 0:
+            return
+        if self.fmt == "csv":
+            self._flush_csv()
+        else:
+            batch = pyarrow.record_batch(
+                [pyarrow.array(self.data[field.name], type=field.type) for field in self.schema],
+                schema=self.schema,
+            )
+            if self.writer is None:
+                if self.fmt == "parquet":
+                    self.writer = pyarrow.parquet.ParquetWriter(self.path, self.schema)
+                else:
+                    self.writer = pyarrow.ipc.new_file(self.path, self.schema)
+            self.writer.write_batch(batch)
+        for values in self.data.values():
+            values.clear()
+        self.rows = 0
+
+    def _flush_csv(self):
+        """Écrire le lot en cours en CSV"""
+        if self.file is None:
+            self.file = open(self.path, "w", newline="", encoding="utf-8")
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(self.columns)
+        columns = [
+            ["|".join(str(v) for v in values) for values in self.data[name]] if name in self.list_columns
+            else self.data[name]
+            for name in self.columns
+        ]
+        self.writer.writerows(zip(*columns))
+
+    def close(self):
+        """Écrire le dernier lot et fermer le fichier"""
+        self.flush()
+        if self.fmt == "csv":
+            if self.file is not None:
+                self.file.close()
+        elif self.writer is not None:
+            self.writer.close()
+
+
+class ColumnarExporter:
+    """Exportateur des enregistrements par partie et par tour"""
+
+    def __init__(self, directory, fmt="parquet", batch_size=65536):
+        """
+        Initialisation de l'exportateur
+
+        Args:
+            directory: Répertoire de sortie (games.<ext> et turns.<ext>)
+            fmt: "parquet", "arrow" ou "csv" (repli sur "csv" sans pyarrow)
+            batch_size: Nombre de lignes par lot écrit
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Format d'export inconnu : {fmt}")
+        if pyarrow is None:
+            fmt = "csv"
+        self.fmt = fmt
+        self.batch_size = batch_size
+        os.makedirs(directory, exist_ok=True)
+        extension = {"parquet": "parquet", "arrow": "arrow", "csv": "csv"}[fmt]
+        self.turns = _ColumnTable(os.path.join(directory, f"turns.{extension}"), TURN_COLUMNS, fmt)
+        self.games = _ColumnTable(os.path.join(directory, f"games.{extension}"), GAME_COLUMNS, fmt)
+
+    def add_turn(self, values):
+        """Ajouter un enregistrement de tour (valeurs dans l'ordre de TURN_COLUMNS)"""
+        self.turns.append(values)
+        if self.turns.rows >= self.batch_size:
+            self.turns.flush()
+
+    def add_game(self, values):
+        """Ajouter un enregistrement de partie (valeurs dans l'ordre de GAME_COLUMNS)"""
+        self.games.append(values)
+        if self.games.rows >= self.batch_size:
+            self.games.flush()
+
+    def close(self):
+        """Écrire les derniers lots"""
+        self.turns.close()
+        self.games.close()
+
+
+class TurnRecorder:
+    """
+    Construit les enregistrements d'une partie simulée à partir du flux d'événements :
+    s'abonne au bus de la partie et collecte les serrures ouvertes et la salle choisie à chaque tour
+    """
+
+    def __init__(self, exporter, game_id):
+        self.exporter = exporter
+        self.game_id = game_id
+        self.offered = []
+        self.chosen = ""
+        self.lock_levels = []
+        self.doors_opened = 0
+        self.rooms_placed = 0
+
+    def write(self, event):
+        if event.type == EventType.DOOR_OPENED:
+            self.lock_levels.append(event.data["lock_level"])
+            self.doors_opened += 1
+        elif event.type == EventType.ROOM_PLACED:
+            self.chosen = event.data["name"]
+            self.rooms_placed += 1
+
+    def close(self):
+        pass
+
+    def before_action(self, game, turn, action, arg):
+        """Mémoriser les salles proposées avant l'action"""
+        if game.state == GameState.SELECTING_ROOM:
+            self.offered = [room.name for room in game.available_rooms]
+        else:
+            self.offered = []
+        self.chosen = ""
+        self.lock_levels = []
+
+    def after_action(self, game, turn, action, arg):
+        """Enregistrer le tour"""
+        player = game.player
+        self.exporter.add_turn([
+            self.game_id, turn, action_log.ACTION_NAMES[action], arg, player.row, player.col,
+            self.offered, self.chosen, self.lock_levels,
+        ] + inventory_vector(player.inventory))
+
+    def end_game(self, game, seed, turns):
+        """Enregistrer le résumé de la partie"""
+        player = game.player
+        victory = game.state == GameState.GAME_OVER and game.mansion.check_win_condition(player)
+        self.exporter.add_game([
+            self.game_id, seed, victory, turns, self.rooms_placed, player.row, player.col,
+            self.doors_opened, game.game_over_message,
+        ] + inventory_vector(player.inventory))
+
+
+def export_simulations(seeds, directory, fmt="parquet", policy=random_policy, max_actions=1000, batch_size=65536):
+    """
+    Simuler des parties et exporter leurs enregistrements
+
+    Args:
+        seeds: Graines des parties à simuler
+        directory: Répertoire de sortie
+        fmt: Format d'export
+        policy: Politique de jeu (voir simulation.py)
+        max_actions: Nombre maximal d'actions par partie
+        batch_size: Nombre de lignes par lot écrit
+
+    Returns:
+        ColumnarExporter: l'exportateur (fermé)
+    """
+    exporter = ColumnarExporter(directory, fmt, batch_size)
+    try:
+        for game_id, seed in enumerate(seeds):
+            recorder = TurnRecorder(exporter, game_id)
+            game = Game(seed=seed)
+            game.events.subscribe(recorder)
+            game, turns = run_game(seed, policy, max_actions, recorder.before_action, recorder.after_action, game=game)
+            recorder.end_game(game, seed, turns)
+            game.events.unsubscribe(recorder)
+    finally:
+        exporter.close()
+    return exporter
@@ -0,0 +1,257 @@
+"""
+Bancs d'essai des chemins critiques du moteur
+Mesure le temps par appel de chaque opération et le compare à une référence enregistrée
+
+Utilisation :
+    python bench_game.py                 # mesurer et comparer à bench_baseline.json
+    python bench_game.py --save          # mesurer et enregistrer la nouvelle référence
+    python bench_game.py -k draw_rooms   # ne lancer que les bancs dont le nom contient "draw_rooms"
+
+Le code de sortie vaut 1 si un banc est plus lent que la référence au-delà du seuil.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+# Rendu sans fenêtre pour le banc de UI.render
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import config
+from game import Game
+from mansion import Mansion
+from player import Player
+from room_selector import RoomSelector
+from rooms_data import create_room_templates
+from simulation import run_game
+
+
+BASELINE_PATH = "bench_baseline.json"
+DEFAULT_THRESHOLD = 1.25
+
+# nom -> fonction de préparation retournant (fonction mesurée, nombre d'appels par mesure)
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Décorateur d'enregistrement d'un banc d'essai"""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def _explored_mansion():
+    """Manoir avec une salle explorée au-dessus de l'entrée (portes ouvertes)"""
+    templates = create_room_templates()
+    mansion = Mansion()
+    corridor = next(room for room in templates if room.name == "Couloir")
+    mansion.set_room(config.ENTRANCE_ROW - 1, config.ENTRANCE_COL, corridor)
+    corridor.explored = True
+    corridor.door_objects['DOWN'].opened = True
+    mansion.entrance_room.door_objects['UP'].opened = True
+    return mansion, templates
+
+
+@benchmark("RoomSelector.draw_rooms")
+def bench_draw_rooms():
+    mansion, templates = _explored_mansion()
+    selector = RoomSelector(templates)
+    player = Player()
+    row, col = config.ENTRANCE_ROW - 2, config.ENTRANCE_COL
+    return lambda: selector.draw_rooms(row, col, mansion, player, required_direction='UP'), 200
+
+
+@benchmark("Room.can_place_at")
+def bench_can_place_at():
+    mansion, templates = _explored_mansion()
+
+    def run():
+        for room in templates:
+            room.can_place_at(2, 3, mansion)
+    return run, 500
+
+
+@benchmark("Room.can_place_at[200x200]")
+def bench_can_place_at_large():
+    templates = create_room_templates()
+    mansion = Mansion(200, 200)
+
+    def run():
+        for room in templates:
+            room.can_place_at(100, 100, mansion)
+    return run, 500
+
+
+@benchmark("Mansion.check_lose_condition")
+def bench_check_lose_condition():
+    mansion, _ = _explored_mansion()
+    player = Player()
+    return lambda: mansion.check_lose_condition(player), 5000
+
+
+@benchmark("Player.move")
+def bench_player_move():
+    mansion, _ = _explored_mansion()
+    player = Player()
+    player.inventory.add_steps(10 ** 9)
+
+    def run():
+        player.move('UP', mansion)
+        player.move('DOWN', mansion)
+    return run, 2000
+
+
+@benchmark("Room.generate_items")
+def bench_generate_items():
+    _, templates = _explored_mansion()
+    rooms = [room for room in templates if not room.effects.get("shop")]
+    inventory = Player().inventory
+
+    def run():
+        for room in rooms:
+            del room.items[:]
+            room.generate_items(inventory)
+    return run, 500
+
+
+@benchmark("Room._create_doors")
+def bench_create_doors():
+    _, templates = _explored_mansion()
+    rooms = [room.clone() for room in templates]
+    for room in rooms:
+        room.row = 2
+
+    def run():
+        for room in rooms:
+            room._create_doors()
+    return run, 500
+
+
+@benchmark("simulation.run_game")
+def bench_simulation():
+    seeds = iter(range(10 ** 9))
+    return lambda: run_game(next(seeds), max_actions=300), 5
+
+
+@benchmark("UI.render")
+def bench_ui_render():
+    import pygame
+    from ui import UI
+    pygame.init()
+    game = Game(seed=1)
+    ui = UI()
+    return lambda: ui.render(game), 50
+
+
+@benchmark("UI.render[200x200]")
+def bench_ui_render_large():
+    import pygame
+    from ui import UI
+    pygame.init()
+    game = Game(seed=1, rows=200, cols=200)
+    ui = UI()
+    return lambda: ui.render(game), 50
+
+
+def measure(func, loops, repeat):
+    """
+    Mesurer une fonction
+
+    Args:
+        func: Fonction à mesurer
+        loops: Nombre d'appels par mesure
+        repeat: Nombre de mesures
+
+    Returns:
+        list: temps par appel (s) de chaque mesure
+    """
+    func()  # échauffement (caches d'images, polices, etc.)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        timings.append((time.perf_counter() - start) / loops)
+    return timings
+
+
+def run_benchmarks(names, repeat=5):
+    """
+    Lancer les bancs d'essai
+
+    Returns:
+        dict: nom -> {"min", "median"} en secondes par appel
+    """
+    results = {}
+    for name in names:
+        random.seed(0)
+        func, loops = BENCHMARKS[name]()
+        timings = measure(func, loops, repeat)
+        results[name] = {"min": min(timings), "median": statistics.median(timings)}
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Comparer des résultats à la référence (sur le meilleur temps, le moins bruité)
+
+    Returns:
+        list: noms des bancs en régression
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference and result["min"] > reference["min"] * threshold:
+            regressions.append(name)
+    return regressions
+
+
+def _format_time(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:9.2f} µs"
+    return f"{seconds * 1e3:9.2f} ms"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bancs d'essai du moteur Blue Prince")
+    parser.add_argument("-k", dest="filter", default="", help="ne lancer que les bancs contenant ce texte")
+    parser.add_argument("--repeat", type=int, default=5, help="nombre de mesures par banc")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="fichier de référence")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="rapport maximal toléré par rapport à la référence")
+    parser.add_argument("--save", action="store_true", help="enregistrer les résultats comme référence")
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS if args.filter in name]
+    results = run_benchmarks(names, args.repeat)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    regressions = compare(results, baseline, args.threshold)
+    for name, result in results.items():
+        line = f"{name:32s} min {_format_time(result['min'])}  médiane {_format_time(result['median'])}"
+        reference = baseline.get(name)
+        if reference:
+            ratio = result["min"] / reference["min"]
+            line += f"  x{ratio:.2f}" + ("  RÉGRESSION" if name in regressions else "")
+        print(line)
+
+    if args.save:
+        baseline.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Référence enregistrée dans {args.baseline}")
+        return 0
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
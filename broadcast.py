@@ -0,0 +1,161 @@
+"""
+Diffusion d'une partie à des spectateurs
+Le concentrateur (SpectatorHub) est un récepteur du flux d'événements : chaque message (événement,
+différences d'état) est sérialisé une seule fois dans un journal circulaire partagé, et chaque
+spectateur n'y garde qu'un curseur. Publier coûte donc le même prix quel que soit le nombre de
+spectateurs ; un spectateur trop lent (curseur sorti du journal ou retard au-delà de sa limite)
+abandonne son retard et repart de l'instantané le plus récent.
+
+Messages (JSON, un par ligne) :
+    snapshot : {"type": "snapshot", "state": état complet}
+    event    : {"type": "event", "event": GameEvent.to_dict()}
+    diff     : {"type": "diff", "diff": différences d'état (server.diff_views)}
+"""
+import asyncio
+import collections
+import itertools
+import json
+
+
+DEFAULT_CAPACITY = 1024
+
+
+def _line(message):
+    return json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+class Viewer:
+    """Spectateur : curseur dans le journal du concentrateur"""
+
+    def __init__(self, hub, max_lag):
+        """
+        Args:
+            hub: SpectatorHub observé
+            max_lag: Retard maximal (en messages) avant de repartir d'un instantané
+        """
+        self.hub = hub
+        self.max_lag = max_lag
+        # None : le prochain envoi est un instantané
+        self.cursor = None
+        self.dropped = 0
+        self.snapshots = 0
+
+    def pending(self):
+        """Nombre de messages en attente"""
+        return self.hub.head - self.cursor if self.cursor is not None else 1
+
+    def take(self):
+        """
+        Prendre les messages en attente
+
+        Returns:
+            list: Lignes JSON encodées (un instantané seul si le spectateur a pris trop de retard)
+        """
+        hub = self.hub
+        oldest = hub.head - len(hub.log)
+        cursor = self.cursor
+        if cursor is None or cursor < oldest or hub.head - cursor > self.max_lag:
+            if cursor is not None:
+                self.dropped += hub.head - cursor
+            self.cursor = hub.head
+            self.snapshots += 1
+            return [hub.snapshot_line()]
+        self.cursor = hub.head
+        return list(itertools.islice(hub.log, cursor - oldest, None))
+
+    async def stream(self, writer):
+        """
+        Envoyer les messages au fil de l'eau jusqu'à la fermeture du concentrateur
+        (seule la tâche de ce spectateur attend son client)
+
+        Args:
+            writer: asyncio.StreamWriter du spectateur
+        """
+        hub = self.hub
+        while True:
+            await hub.wait(self)
+            if self.pending():
+                writer.write(b"".join(self.take()))
+                await writer.drain()
+            elif hub.closed:
+                return
+
+
+class SpectatorHub:
+    """Concentrateur de diffusion d'une partie (récepteur d'EventBus)"""
+
+    def __init__(self, snapshot, capacity=DEFAULT_CAPACITY):
+        """
+        Initialisation du concentrateur
+
+        Args:
+            snapshot: Fonction sans argument renvoyant l'état complet courant (sérialisable en JSON)
+            capacity: Nombre de messages conservés dans le journal
+        """
+        self.snapshot = snapshot
+        self.capacity = capacity
+        self.log = collections.deque(maxlen=capacity)
+        # Nombre total de messages publiés : position absolue du prochain message
+        self.head = 0
+        self.viewers = set()
+        self.closed = False
+        self._changed = None
+        self._snapshot = None
+
+    def add_viewer(self, max_lag=None):
+        """
+        Ajouter un spectateur (il reçoit d'abord un instantané)
+
+        Args:
+            max_lag: Retard maximal avant de repartir d'un instantané (capacité du journal par défaut)
+
+        Returns:
+            Viewer
+        """
+        viewer = Viewer(self, min(max_lag or self.capacity, self.capacity))
+        self.viewers.add(viewer)
+        return viewer
+
+    def remove_viewer(self, viewer):
+        self.viewers.discard(viewer)
+
+    def publish(self, message):
+        """
+        Publier un message à tous les spectateurs (sérialisé une fois)
+
+        Args:
+            message: dict sérialisable en JSON (ignoré s'il n'y a aucun spectateur)
+        """
+        if self.viewers:
+            self.log.append(_line(message))
+        else:
+            # Sans spectateur, rien n'est sérialisé (le prochain spectateur part d'un instantané)
+            self.log.clear()
+        self.head += 1
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
+
+    def write(self, event):
+        """Publier un événement du jeu (interface des récepteurs d'EventBus)"""
+        self.publish({"type": "event", "event": event.to_dict()} if self.viewers else None)
+
+    def snapshot_line(self):
+        """Instantané courant encodé (calculé une fois par position du journal)"""
+        if self._snapshot is None or self._snapshot[0] != self.head:
+            self._snapshot = (self.head, _line({"type": "snapshot", "state": self.snapshot()}))
+        return self._snapshot[1]
+
+    async def wait(self, viewer):
+        """Attendre qu'un message soit en attente pour viewer, ou la fermeture du concentrateur"""
+        while not viewer.pending() and not self.closed:
+            if self._changed is None:
+                self._changed = asyncio.Event()
+            await self._changed.wait()
+
+    def close(self):
+        """Fermer le concentrateur : les spectateurs reçoivent leurs derniers messages puis s'arrêtent"""
+        self.closed = True
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
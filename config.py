@@ -1,9 +1,12 @@
 """
 Constantes de configuration du jeu
 """
-# Dimensions de la grille
+# Dimensions de la grille par défaut (chaque partie peut choisir les siennes : Game(rows=..., cols=...))
 GRID_ROWS = 5
 GRID_COLS = 9
+# Dimensions acceptées pour les parties venues de l'extérieur (sessions du serveur, journaux soumis)
+MIN_GRID_SIZE = 3
+MAX_GRID_SIZE = 256
 
 # Inventaire initial du joueur
 INITIAL_STEPS = 70
@@ -15,7 +18,16 @@ INITIAL_DICE = 0
 # Mode d'interaction : Le mode strict nécessite "Sélection par touches directionnelles + Espace pour confirmer" ; le mode pratique permet de se déplacer en appuyant sur la touche directionnelle.
 STRICT_MODE = False
 
-# Position de l'entrée (milieu de la dernière ligne)
+# Catalogue déclaratif des salles (JSON ou TOML)
+ROOM_CATALOG_PATH = "rooms.json"
+
+# Fichier de sauvegarde (F5 : sauvegarder, F9 : charger)
+SAVE_PATH = "sauvegarde.bps"
+
+# Journal des actions de la dernière partie (None pour désactiver)
+ACTION_LOG_PATH = "derniere_partie.bplog"
+
+# Position de l'entrée pour la grille par défaut (milieu de la dernière ligne, voir Mansion.entrance_row)
 ENTRANCE_ROW = GRID_ROWS - 1
 ENTRANCE_COL = GRID_COLS // 2
 
@@ -49,6 +61,10 @@ ROOM_COLORS = {
     'BLUE': 'Bleu'
 }
 
+# Profil de difficulté par défaut (voir difficulty.PROFILES : "facile", "normal", "difficile")
+# Le profil regroupe les distributions ci-dessous (rareté, serrures) et celles des objets
+DIFFICULTY = "normal"
+
 # Poids de probabilité de rareté (la probabilité est divisée par 3 pour chaque augmentation de niveau de rareté)
 RARITY_WEIGHTS = {
     0: 1.0,
@@ -58,7 +74,13 @@ RARITY_WEIGHTS = {
 }
 
 #Probabilité du niveau de serrure de la porte (basée sur la position de la ligne)
-# Ligne 1 (index 0) : Ne génère que le niveau 0
-# Dernière ligne (index GRID_ROWS-1) : Ne génère que le niveau 2
-# Lignes intermédiaires : Distribution mixte
+# Ligne de l'entrée (dernière ligne) : Ne génère que le niveau 0
+# Ligne du Hall Avant (FRONT_HALL_ROW) : Ne génère que le niveau 2
+# Lignes intermédiaires : Distribution mixte selon la progression de l'entrée vers le Hall Avant
+# (progression limite, seuils cumulés) : niveau = nombre de seuils <= tirage ; la dernière bande couvre le reste
+LOCK_LEVEL_BANDS = (
+    (0.3, (0.8,)),       # Premiers 30% : niveau 0 (80%), niveau 1 (20%)
+    (0.7, (0.5, 0.9)),   # Milieu 40% : niveau 0 (50%), niveau 1 (40%), niveau 2 (10%)
+    (None, (0.3, 0.7)),  # Derniers 30% : niveau 0 (30%), niveau 1 (40%), niveau 2 (30%)
+)
 
@@ -0,0 +1,320 @@
+"""
+Manoir du jour : graine quotidienne, analyses précalculées et classement
+Tout le monde joue la même graine, avec le même profil de difficulté (DAILY_DIFFICULTY, quel que soit
+config.DIFFICULTY), un jour donné. Pour chaque graine et profil, des analyses sont calculées une
+seule fois hors ligne par le simulateur (simulation.py) puis conservées : probabilité de victoire
+estimée par des parties simulées, pas de référence (« par ») et salles clés. Le classement est une
+base SQLite indexée par graine, profil et score ; le haut du classement de chaque graine est gardé en
+mémoire et tenu à jour à chaque envoi, si bien que sa lecture ne touche pas la base.
+
+Utilisation :
+    python daily.py                       # graine et analyses du jour
+    python daily.py --date 2026-01-31     # graine et analyses d'un autre jour
+    python daily.py --precompute 7        # précalculer les analyses des 7 prochains jours
+"""
+import argparse
+import bisect
+import datetime
+import hashlib
+import json
+import sqlite3
+import statistics
+import time
+from collections import Counter, namedtuple
+import config
+from events import EventType
+from game import Game, GameState
+from simulation import GreedyPolicy, run_game
+
+
+DEFAULT_DATABASE = "daily.db"
+# Profil de difficulté du manoir du jour (le même pour tous les joueurs)
+DAILY_DIFFICULTY = "normal"
+DEFAULT_ROLLOUTS = 200
+DEFAULT_MAX_ACTIONS = 1000
+KEY_ROOMS = 5
+# Nombre d'entrées du haut du classement gardées en mémoire pour chaque graine
+TOP_SIZE = 100
+VICTORY_SCORE = 1000
+
+# Analyses d'une graine jouée avec un profil de difficulté : probabilité de victoire, pas de référence
+# (médiane des pas dépensés dans les victoires, None sans victoire), salles clés (les plus placées
+# dans les victoires, ou dans toutes les parties sans victoire)
+SeedAnalytics = namedtuple("SeedAnalytics",
+                           ["seed", "difficulty", "rollouts", "win_probability", "par_steps", "key_rooms"])
+
+# Entrée du classement
+Score = namedtuple("Score", ["player", "score", "turns", "submitted"])
+
+
+def daily_seed(date=None):
+    """
+    Graine du manoir d'un jour (stable d'une installation à l'autre)
+
+    Args:
+        date: datetime.date (aujourd'hui par défaut)
+
+    Returns:
+        int: Graine
+    """
+    date = date or datetime.date.today()
+    return int.from_bytes(hashlib.sha256(date.isoformat().encode("ascii")).digest()[:8], "little") % 1000000
+
+
+def score_game(game):
+    """
+    Score d'une partie terminée : bonus de victoire, puis pas restants et salles placées
+
+    Args:
+        game: Objet Game
+
+    Returns:
+        int: Score
+    """
+    player = game.player
+    victory = game.state == GameState.GAME_OVER and game.mansion.check_win_condition(player)
+    return (VICTORY_SCORE if victory else 0) + player.inventory.steps.amount + len(game.mansion.rooms)
+
+
+class _RolloutSink:
+    """Récepteur d'événements d'une partie simulée : salles placées, pas dépensés, issue"""
+
+    def __init__(self):
+        self.placed = set()
+        self.steps = 0
+        self.victory = False
+
+    def write(self, event):
+        if event.type is EventType.ROOM_PLACED:
+            self.placed.add(event.data["name"])
+        elif event.type is EventType.STEPS_SPENT:
+            self.steps += event.data["amount"]
+        elif event.type is EventType.GAME_ENDED:
+            self.victory = event.data["victory"]
+
+    def close(self):
+        pass
+
+
+def analyze_seed(seed, rollouts=DEFAULT_ROLLOUTS, policy=None, max_actions=DEFAULT_MAX_ACTIONS,
+                 difficulty=DAILY_DIFFICULTY):
+    """
+    Analyser une graine par des parties simulées (même graine de partie, politique tirée différemment)
+
+    Args:
+        seed: Graine de la partie
+        rollouts: Nombre de parties simulées
+        policy: Politique de jeu (voir simulation.py ; simulation.GreedyPolicy si None)
+        max_actions: Nombre maximal d'actions par partie
+        difficulty: Nom du profil de difficulté des parties
+
+    Returns:
+        SeedAnalytics
+    """
+    if policy is None:
+        policy = GreedyPolicy()
+    game = Game(seed=seed, difficulty=difficulty)
+    wins = []
+    placed_in_wins = Counter()
+    placed = Counter()
+    for rollout in range(rollouts):
+        if rollout:
+            game.reset(seed)
+        sink = game.events.subscribe(_RolloutSink())
+        run_game(seed, policy, max_actions, game=game, policy_seed=seed * rollouts + rollout)
+        game.events.unsubscribe(sink)
+        placed.update(sink.placed)
+        if sink.victory:
+            wins.append(sink.steps)
+            placed_in_wins.update(sink.placed)
+    ranking = placed_in_wins if wins else placed
+    key_rooms = tuple(name for name, _ in sorted(ranking.items(), key=lambda item: (-item[1], item[0]))[:KEY_ROOMS])
+    return SeedAnalytics(
+        seed=seed,
+        difficulty=game.difficulty,
+        rollouts=rollouts,
+        win_probability=len(wins) / rollouts if rollouts else 0.0,
+        par_steps=int(statistics.median(wins)) if wins else None,
+        key_rooms=key_rooms,
+    )
+
+
+class DailyStore:
+    """Analyses des graines et classement (base SQLite)"""
+
+    def __init__(self, path=DEFAULT_DATABASE, top_size=TOP_SIZE):
+        """
+        Ouvrir (ou créer) la base
+
+        Args:
+            path: Chemin du fichier SQLite (":memory:" pour une base temporaire)
+            top_size: Nombre d'entrées du haut du classement gardées en mémoire par graine
+        """
+        self.connection = sqlite3.connect(path)
+        self.top_size = top_size
+        # (graine, profil) -> entrées du haut du classement, triées par clé de classement
+        self._top = {}
+        self._keys = {}
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS seed_analytics ("
+                "seed INTEGER NOT NULL, difficulty TEXT NOT NULL, rollouts INTEGER NOT NULL, "
+                "win_probability REAL NOT NULL, par_steps INTEGER, key_rooms TEXT NOT NULL, computed REAL NOT NULL, "
+                "PRIMARY KEY (seed, difficulty))"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS scores ("
+                "seed INTEGER NOT NULL, difficulty TEXT NOT NULL, player TEXT NOT NULL, score INTEGER NOT NULL, "
+                "turns INTEGER NOT NULL, submitted REAL NOT NULL, PRIMARY KEY (seed, difficulty, player))"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS scores_by_rank ON scores (seed, difficulty, score DESC, submitted, player)"
+            )
+
+    def analytics(self, seed, rollouts=DEFAULT_ROLLOUTS, compute=True, difficulty=DAILY_DIFFICULTY):
+        """
+        Analyses d'une graine, calculées au premier appel puis lues dans la base
+
+        Args:
+            seed: Graine
+            rollouts: Nombre de parties simulées si le calcul est nécessaire
+            compute: Calculer les analyses absentes (sinon renvoyer None)
+            difficulty: Nom du profil de difficulté des parties
+
+        Returns:
+            SeedAnalytics, ou None
+        """
+        row = self.connection.execute(
+            "SELECT rollouts, win_probability, par_steps, key_rooms FROM seed_analytics "
+            "WHERE seed = ? AND difficulty = ?", (seed, difficulty)
+        ).fetchone()
+        if row is not None:
+            return SeedAnalytics(seed, difficulty, row[0], row[1], row[2], tuple(json.loads(row[3])))
+        if not compute:
+            return None
+        analytics = analyze_seed(seed, rollouts, difficulty=difficulty)
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO seed_analytics VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (seed, difficulty, analytics.rollouts, analytics.win_probability, analytics.par_steps,
+                 json.dumps(analytics.key_rooms, ensure_ascii=False), time.time()),
+            )
+        return analytics
+
+    def precompute(self, seeds, rollouts=DEFAULT_ROLLOUTS, difficulty=DAILY_DIFFICULTY):
+        """Calculer les analyses des graines qui n'en ont pas encore"""
+        for seed in seeds:
+            self.analytics(seed, rollouts, difficulty=difficulty)
+
+    def _load_top(self, seed, difficulty):
+        """Charger le haut du classement d'une graine (une requête sur l'index)"""
+        top = self._top.get((seed, difficulty))
+        if top is None:
+            top = [Score(*row) for row in self.connection.execute(
+                "SELECT player, score, turns, submitted FROM scores WHERE seed = ? AND difficulty = ? "
+                "ORDER BY score DESC, submitted, player LIMIT ?", (seed, difficulty, self.top_size),
+            )]
+            self._top[seed, difficulty] = top
+            self._keys[seed, difficulty] = [_rank_key(entry) for entry in top]
+        return top
+
+    def submit(self, seed, player, score, turns, difficulty=DAILY_DIFFICULTY):
+        """
+        Envoyer un score (seul le meilleur score d'un joueur pour une graine et un profil est conservé)
+
+        Args:
+            seed: Graine jouée
+            player: Nom du joueur
+            score: Score (score_game)
+            turns: Nombre d'actions jouées
+            difficulty: Nom du profil de difficulté de la partie
+
+        Returns:
+            bool: True si le score améliore celui du joueur
+        """
+        best = self.best(seed, player, difficulty)
+        if best is not None and best.score >= score:
+            return False
+        # Haut du classement chargé avant l'écriture, pour ne pas y compter deux fois ce score
+        top, keys = self._load_top(seed, difficulty), self._keys[seed, difficulty]
+        entry = Score(player, score, turns, time.time())
+        with self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?, ?, ?)",
+                                    (seed, difficulty, player, score, turns, entry.submitted))
+        # Mise à jour du haut du classement en mémoire (sans relire la base)
+        if best is not None:
+            for index, current in enumerate(top):
+                if current.player == player:
+                    del top[index]
+                    del keys[index]
+                    break
+        key = _rank_key(entry)
+        index = bisect.bisect(keys, key)
+        if index < self.top_size:
+            top.insert(index, entry)
+            keys.insert(index, key)
+            if len(top) > self.top_size:
+                top.pop()
+                keys.pop()
+        return True
+
+    def top(self, seed, count=10, difficulty=DAILY_DIFFICULTY):
+        """
+        Haut du classement d'une graine (lu en mémoire après le premier appel)
+
+        Returns:
+            list: Entrées Score, de la meilleure à la moins bonne
+        """
+        return self._load_top(seed, difficulty)[:min(count, self.top_size)]
+
+    def best(self, seed, player, difficulty=DAILY_DIFFICULTY):
+        """Meilleur score d'un joueur pour une graine et un profil (Score, ou None)"""
+        row = self.connection.execute(
+            "SELECT player, score, turns, submitted FROM scores WHERE seed = ? AND difficulty = ? AND player = ?",
+            (seed, difficulty, player)
+        ).fetchone()
+        return Score(*row) if row else None
+
+    def rank(self, seed, score, difficulty=DAILY_DIFFICULTY):
+        """Rang (à partir de 1) qu'aurait un score pour une graine et un profil (parcours de l'index)"""
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM scores WHERE seed = ? AND difficulty = ? AND score > ?", (seed, difficulty, score)
+        ).fetchone()[0] + 1
+
+    def close(self):
+        self.connection.close()
+
+
+def _rank_key(entry):
+    """Clé de classement : meilleur score d'abord, puis envoi le plus ancien"""
+    return (-entry.score, entry.submitted, entry.player)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manoir du jour : graine, analyses et classement")
+    parser.add_argument("--date", type=datetime.date.fromisoformat, help="jour (AAAA-MM-JJ, aujourd'hui par défaut)")
+    parser.add_argument("--database", default=DEFAULT_DATABASE, help="base SQLite des analyses et du classement")
+    parser.add_argument("--rollouts", type=int, default=DEFAULT_ROLLOUTS, help="parties simulées par graine")
+    parser.add_argument("--precompute", type=int, metavar="JOURS", help="précalculer les analyses des prochains jours")
+    args = parser.parse_args(argv)
+    date = args.date or datetime.date.today()
+    store = DailyStore(args.database)
+    try:
+        if args.precompute:
+            days = [date + datetime.timedelta(days=offset) for offset in range(args.precompute)]
+            store.precompute([daily_seed(day) for day in days], args.rollouts)
+        seed = daily_seed(date)
+        analytics = store.analytics(seed, args.rollouts)
+        print(f"Manoir du {date.isoformat()} : graine {seed}, difficulté {analytics.difficulty}")
+        print(f"  Probabilité de victoire estimée : {analytics.win_probability:.1%} ({analytics.rollouts} parties simulées)")
+        par = analytics.par_steps if analytics.par_steps is not None else "-"
+        print(f"  Pas de référence : {par} (sur {config.INITIAL_STEPS})")
+        print(f"  Salles clés : {', '.join(analytics.key_rooms) or '-'}")
+        for position, entry in enumerate(store.top(seed), 1):
+            print(f"  {position:>3}. {entry.player} — {entry.score}")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
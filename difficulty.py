@@ -0,0 +1,171 @@
+"""
+Profils de difficulté
+Chaque profil regroupe les distributions du jeu (objets des salles par couleur, contenu des conteneurs,
+serrures des portes, poids de rareté) ; il est compilé une seule fois en tables de tirage,
+et changer de profil revient à changer de table active
+"""
+import json
+import config
+import loot
+
+
+_FOODS = [["Pomme", 2], ["Banane", 3], ["Gâteau", 10]]
+_PERMANENTS = ["Pelle", "Marteau", "Kit de crochetage", "Détecteur de métaux"]
+
+# Profils déclaratifs (tables compilées par loot.compile_table) : chaque entrée est tirée
+# indépendamment, dans l'ordre, avec la probabilité "probability" multipliée par le facteur "scale" du joueur :
+#   find     : probabilité de trouver des objets (patte de lapin)
+#   key_coin : probabilité de trouver clés et pièces (détecteur de métaux)
+#   (absent) : probabilité fixe
+PROFILES = {
+    "normal": {
+        "rarity_weights": config.RARITY_WEIGHTS,
+        "lock_bands": config.LOCK_LEVEL_BANDS,
+        "room_items": {
+            # Salle VERTE : gemmes, points à creuser, objets permanents
+            "GREEN": [
+                {"probability": 0.6, "scale": "find", "reward": {"type": "consumable", "name": "Gemme", "amount": [1, 3]}},
+                {"probability": 0.4, "scale": "find", "reward": {"type": "digging_spot"}},
+                {"probability": 0.1, "scale": "find", "reward": {
+                    "type": "reward", "kind": "permanent",
+                    "choices": _PERMANENTS + ["Patte de lapin porte-bonheur"]}},
+            ],
+            # Salle JAUNE (Magasin) : pièces d'or
+            "YELLOW": [
+                {"probability": 0.5, "reward": {"type": "consumable", "name": "Pièces d'or", "amount": [10, 30]}},
+            ],
+            # Salle VIOLETTE (Chambre) : nourriture
+            "PURPLE": [
+                {"probability": 0.5, "scale": "find", "reward": {"type": "food", "choices": _FOODS}},
+            ],
+            # Salle BLEUE : objets divers
+            "BLUE": [
+                {"probability": 0.3, "scale": "key_coin", "reward": {"type": "consumable", "name": "Clé", "amount": [1, 2]}},
+                {"probability": 0.3, "scale": "key_coin", "reward": {"type": "consumable", "name": "Pièces d'or", "amount": [5, 15]}},
+                {"probability": 0.2, "scale": "find", "reward": {"type": "consumable", "name": "Gemme", "amount": 1}},
+                {"probability": 0.1, "scale": "find", "reward": {"type": "chest"}},
+            ],
+        },
+        "chest": [
+            {"probability": 0.3, "scale": "find", "reward": {"type": "reward", "kind": "coins", "amount": [5, 20]}},
+            {"probability": 0.4, "scale": "find", "reward": {"type": "reward", "kind": "keys", "amount": [1, 2]}},
+            {"probability": 0.3, "scale": "find", "reward": {"type": "reward", "kind": "gems", "amount": [1, 2]}},
+            {"probability": 0.2, "scale": "find", "reward": {"type": "reward", "kind": "dice", "amount": 1}},
+            {"probability": 0.1, "scale": "find", "reward": {"type": "reward", "kind": "steps", "choices": _FOODS + [["Sandwich", 15]]}},
+        ],
+        "digging_spot": [
+            {"probability": 0.5, "scale": "find", "reward": {"type": "reward", "kind": "coins", "amount": [3, 15]}},
+            {"probability": 0.3, "scale": "find", "reward": {"type": "reward", "kind": "keys", "amount": 1}},
+            {"probability": 0.2, "scale": "find", "reward": {"type": "reward", "kind": "gems", "amount": 1}},
+            {"probability": 0.1, "scale": "find", "reward": {
+                "type": "reward", "kind": "permanent", "choices": _PERMANENTS + ["Patte de lapin"]}},
+        ],
+        "locker": [
+            {"probability": 0.4, "scale": "find", "reward": {"type": "reward", "kind": "coins", "amount": [5, 25]}},
+            {"probability": 0.3, "scale": "find", "reward": {"type": "reward", "kind": "keys", "amount": [1, 3]}},
+            {"probability": 0.2, "scale": "find", "reward": {"type": "reward", "kind": "gems", "amount": [1, 3]}},
+        ],
+    },
+}
+
+# Facile : serrures plus rares, objets plus fréquents, salles rares plus accessibles
+PROFILES["facile"] = dict(
+    PROFILES["normal"],
+    probability_factor=1.5,
+    rarity_weights={0: 1.0, 1: 1.0 / 2, 2: 1.0 / 4, 3: 1.0 / 8},
+    lock_bands=((0.3, (0.9,)), (0.7, (0.7, 0.95)), (None, (0.5, 0.85))),
+)
+
+# Difficile : serrures plus fréquentes, objets plus rares, salles rares quasi introuvables
+PROFILES["difficile"] = dict(
+    PROFILES["normal"],
+    probability_factor=0.6,
+    rarity_weights={0: 1.0, 1: 1.0 / 4, 2: 1.0 / 16, 3: 1.0 / 64},
+    lock_bands=((0.3, (0.6,)), (0.7, (0.3, 0.8)), (None, (0.15, 0.5))),
+)
+
+# Profils compilés (nom -> DifficultyProfile) et profil actif
+_COMPILED = {}
+_active = None
+
+
+class DifficultyProfile:
+    """Profil de difficulté compilé (tables de tirage prêtes à l'emploi)"""
+
+    def __init__(self, name, spec):
+        """
+        Compiler un profil
+
+        Args:
+            name: Nom du profil
+            spec: Description déclarative (voir PROFILES) ; "probability_factor" multiplie toutes les probabilités d'objets
+        """
+        factor = spec.get("probability_factor", 1.0)
+        self.name = name
+        self.probability_factor = factor
+        self.rarity_weights = dict(spec["rarity_weights"])
+        self.lock_bands = tuple((limit, tuple(thresholds)) for limit, thresholds in spec["lock_bands"])
+        self.room_items = {color: loot.compile_table(entries, factor) for color, entries in spec["room_items"].items()}
+        self.chest = loot.compile_table(spec["chest"], factor)
+        self.digging_spot = loot.compile_table(spec["digging_spot"], factor)
+        self.locker = loot.compile_table(spec["locker"], factor)
+        # Tables des salles spéciales du catalogue, compilées à la première salle : description -> table
+        self._special_items = {}
+
+    def special_items(self, key):
+        """
+        Obtenir la table de tirage des objets d'une salle spéciale
+
+        Args:
+            key: Entrées déclaratives en JSON canonique (effects["loot"], voir rooms_data)
+
+        Returns:
+            tuple: Table compilée avec le facteur de probabilité du profil
+        """
+        table = self._special_items.get(key)
+        if table is None:
+            table = self._special_items[key] = loot.compile_table(json.loads(key), self.probability_factor)
+        return table
+
+    def __repr__(self):
+        return f"DifficultyProfile({self.name})"
+
+
+def get_profile(name):
+    """
+    Obtenir un profil compilé (compilé une seule fois)
+
+    Args:
+        name: Nom du profil (clé de PROFILES)
+
+    Returns:
+        DifficultyProfile
+    """
+    profile = _COMPILED.get(name)
+    if profile is None:
+        if name not in PROFILES:
+            raise ValueError(f"Profil de difficulté inconnu : {name}")
+        profile = _COMPILED[name] = DifficultyProfile(name, PROFILES[name])
+    return profile
+
+
+def active():
+    """Obtenir le profil actif (config.DIFFICULTY par défaut)"""
+    if _active is None:
+        set_profile(config.DIFFICULTY)
+    return _active
+
+
+def set_profile(name):
+    """
+    Changer de profil actif
+
+    Args:
+        name: Nom du profil
+
+    Returns:
+        DifficultyProfile: Profil désormais actif
+    """
+    global _active
+    _active = get_profile(name)
+    return _active
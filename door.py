@@ -2,13 +2,103 @@
 Définition de la classe Door
 """
 import random
+from bisect import bisect_right
 import config
+import difficulty
+import pool
+from events import EventType
+
+
+# Tables de verrouillage déjà calculées : (lignes, id des bandes) -> (bandes, table par ligne)
+_LOCK_TABLES = {}
+
+
+def _row_entry(row, grid_rows, bands):
+    """
+    Calculer l'entrée de table d'une ligne
+    
+    Returns:
+        int (niveau fixe, sans tirage) ou tuple de seuils cumulés (un tirage aléatoire)
+    """
+    entrance_row = grid_rows - 1
+    
+    # Ligne de l’entrée : uniquement niveau 0
+    if row == entrance_row:
+        return 0
+    
+    # Ligne du hall avant : uniquement niveau 2
+    if row == config.FRONT_HALL_ROW:
+        return 2
+    
+    # Lignes intermédiaires : bande choisie selon le “progrès” de l’entrée vers le hall avant
+    # progress: 0 = proche de l’entrée ; 1 = proche du hall avant
+    total_span = max(1, entrance_row - config.FRONT_HALL_ROW)
+    progress = (entrance_row - row) / total_span
+    for limit, thresholds in bands:
+        if limit is None or progress < limit:
+            return thresholds
+    return bands[-1][1]
+
+
+def lock_table(grid_rows=None, bands=None):
+    """
+    Obtenir la table de verrouillage par ligne (calculée une seule fois par taille de grille et bandes)
+    
+    Args:
+        grid_rows: Nombre de lignes de la grille (config.GRID_ROWS par défaut)
+        bands: Bandes de probabilités (celles du profil de difficulté actif par défaut)
+    
+    Returns:
+        tuple: Entrée de chaque ligne (voir _row_entry)
+    """
+    if bands is None:
+        bands = difficulty.active().lock_bands
+    # Clé par identité : hacher les bandes à chaque porte coûterait plus que le tirage lui-même
+    cached = _LOCK_TABLES.get((grid_rows, id(bands)))
+    if cached is not None and cached[0] is bands:
+        return cached[1]
+    rows = grid_rows if grid_rows is not None else config.GRID_ROWS
+    table = tuple(_row_entry(row, rows, bands) for row in range(rows))
+    _LOCK_TABLES[(grid_rows, id(bands))] = (bands, table)
+    return table
+
+
+def roll_lock_levels(row, count, grid_rows=None, bands=None):
+    """
+    Tirer les niveaux de verrouillage de toutes les portes d'une salle en un seul appel
+    (un tirage par porte, dans l'ordre, comme des portes créées une à une)
+    
+    Args:
+        row: Ligne de la salle (None : portes non verrouillées)
+        count: Nombre de portes
+        grid_rows: Nombre de lignes de la grille (config.GRID_ROWS par défaut)
+        bands: Bandes de probabilités (celles du profil de difficulté actif par défaut)
+    
+    Returns:
+        list: Niveau de verrouillage de chaque porte (0, 1 ou 2)
+    """
+    if row is None:
+        return [0] * count
+    if bands is None:
+        bands = difficulty.active().lock_bands
+    cached = _LOCK_TABLES.get((grid_rows, id(bands)))
+    table = cached[1] if cached is not None and cached[0] is bands else lock_table(grid_rows, bands)
+    if 0 <= row < len(table):
+        entry = table[row]
+    else:
+        entry = _row_entry(row, len(table), bands)
+    if entry.__class__ is int:
+        return [entry] * count
+    if count == 1:
+        return [bisect_right(entry, random.random())]
+    rand = random.random
+    return [bisect_right(entry, rand()) for _ in range(count)]
 
 
 class Door:
     """Classe Door, gère l'état de verrouillage des portes"""
     
-    def __init__(self, direction, lock_level=None, row=None):
+    def __init__(self, direction, lock_level=None, row=None, grid_rows=None):
         """
         Initialisation d'une porte
         
@@ -17,64 +107,41 @@ class Door:
             lock_level: Niveau de verrouillage (0=non verrouillée, 1=verrouillée, 2=doublement verrouillée),
                         si None alors généré aléatoirement selon la ligne
             row: Ligne de la salle, utilisée pour calculer le niveau de verrouillage
+            grid_rows: Nombre de lignes de la grille (config.GRID_ROWS par défaut)
         """
+        self.reset(direction, lock_level, row, grid_rows)
+    
+    @classmethod
+    def acquire(cls, direction, lock_level=None, row=None, grid_rows=None):
+        """Obtenir une porte, recyclée depuis la réserve si possible (mêmes arguments que le constructeur)"""
+        door = pool.DOORS.acquire()
+        if door is None:
+            return cls(direction, lock_level, row, grid_rows)
+        door.reset(direction, lock_level, row, grid_rows)
+        return door
+    
+    def reset(self, direction, lock_level=None, row=None, grid_rows=None):
+        """Réinitialiser la porte sur place (mêmes arguments que le constructeur)"""
         self.direction = direction
         self.opened = False
         
         if lock_level is not None:
             self.lock_level = lock_level
         else:
-            self.lock_level = self._calculate_lock_level(row)
+            self.lock_level = self._calculate_lock_level(row, grid_rows)
     
-    def _calculate_lock_level(self, row):
+    def _calculate_lock_level(self, row, grid_rows=None):
         """
         Calculer le niveau de verrouillage en fonction de la ligne
         
         Args:
-            row: Ligne de la salle (0-4)
+            row: Ligne de la salle (0 à grid_rows - 1)
+            grid_rows: Nombre de lignes de la grille (config.GRID_ROWS par défaut)
         
         Returns:
             int: Niveau de verrouillage (0, 1 ou 2)
         """
-        if row is None:
-            return 0
-
-        # Ligne de l’entrée : uniquement niveau 0
-        if row == config.ENTRANCE_ROW:
-            return 0
-
-        # Ligne du hall avant : uniquement niveau 2
-        if row == config.FRONT_HALL_ROW:
-            return 2
-
-        # Lignes intermédiaires : calcul du niveau selon le “progrès” de l’entrée vers le hall avant
-        # progress: 0 = proche de l’entrée ; 1 = proche du hall avant
-        total_span = max(1, config.ENTRANCE_ROW - config.FRONT_HALL_ROW)
-        progress = (config.ENTRANCE_ROW - row) / total_span
-        
-        rand = random.random()
-        if progress < 0.3:
-            # Premiers 30% : surtout niveau 0, quelques niveau 1
-            if rand < 0.8:
-                return 0
-            else:
-                return 1
-        elif progress < 0.7:
-            # Milieu 40% : mélange de niveaux 0 et 1, quelques niveau 2
-            if rand < 0.5:
-                return 0
-            elif rand < 0.9:
-                return 1
-            else:
-                return 2
-        else:
-            # Derniers 30% : principalement niveaux 1 et 2
-            if rand < 0.3:
-                return 0
-            elif rand < 0.7:
-                return 1
-            else:
-                return 2
+        return roll_lock_levels(row, 1, grid_rows)[0]
     
     def can_open(self, player):
         """
@@ -138,6 +205,9 @@ class Door:
             player.inventory.keys.remove(1)
         
         self.opened = True
+        if player.events is not None:
+            player.events.emit(EventType.DOOR_OPENED, direction=self.direction, lock_level=self.lock_level,
+                               row=player.row, col=player.col)
         return True, f"Porte ouverte avec succès ({message})"
     
     def __str__(self):
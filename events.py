@@ -0,0 +1,185 @@
+"""
+Flux d'événements du jeu
+Les objets du jeu publient des événements typés sur un bus ; des récepteurs (sinks)
+les conservent en mémoire ou les écrivent sur disque sans bloquer la boucle d'images
+"""
+import collections
+import json
+import queue
+import threading
+from enum import Enum
+
+
+class EventType(Enum):
+    """Énumération des types d'événements"""
+    ROOM_DRAWN = "room_drawn"        # salles proposées au joueur
+    ROOM_PLACED = "room_placed"      # salle placée dans la grille
+    DOOR_OPENED = "door_opened"      # porte ouverte (avec son niveau de verrouillage)
+    ITEM_GAINED = "item_gained"      # objet ou ressource obtenu
+    STEPS_SPENT = "steps_spent"      # pas consommés ou perdus
+    GAME_ENDED = "game_ended"        # victoire ou défaite
+
+
+class GameEvent:
+    """Événement du jeu"""
+
+    __slots__ = ("seq", "type", "data")
+
+    def __init__(self, seq, event_type, data):
+        """
+        Initialisation de l'événement
+
+        Args:
+            seq: Numéro d'ordre de l'événement sur le bus
+            event_type: EventType
+            data: Dictionnaire des informations de l'événement
+        """
+        self.seq = seq
+        self.type = event_type
+        self.data = data
+
+    def to_dict(self):
+        """Obtenir le dictionnaire de l'événement (sérialisable en JSON)"""
+        record = {"seq": self.seq, "type": self.type.value}
+        record.update(self.data)
+        return record
+
+    def __repr__(self):
+        return f"GameEvent({self.seq}, {self.type.value}, {self.data})"
+
+
+class EventBus:
+    """Bus d'événements : diffuse chaque événement à tous les récepteurs abonnés"""
+
+    def __init__(self):
+        self.sinks = []
+        self.seq = 0
+
+    def subscribe(self, sink):
+        """Abonner un récepteur (objet possédant une méthode write(event))"""
+        self.sinks.append(sink)
+        return sink
+
+    def unsubscribe(self, sink):
+        """Désabonner un récepteur"""
+        if sink in self.sinks:
+            self.sinks.remove(sink)
+
+    def emit(self, event_type, **data):
+        """
+        Publier un événement
+
+        Args:
+            event_type: EventType
+            **data: Informations de l'événement
+        """
+        # Sans récepteur, aucun événement n'est construit
+        if not self.sinks:
+            return
+        self.seq += 1
+        event = GameEvent(self.seq, event_type, data)
+        for sink in self.sinks:
+            sink.write(event)
+
+    def close(self):
+        """Fermer tous les récepteurs"""
+        for sink in self.sinks:
+            sink.close()
+        self.sinks = []
+
+
+class RingBufferSink:
+    """Récepteur en mémoire conservant les N derniers événements"""
+
+    def __init__(self, capacity=1024):
+        self.buffer = collections.deque(maxlen=capacity)
+
+    def write(self, event):
+        self.buffer.append(event)
+
+    def events(self):
+        """Obtenir la liste des événements conservés"""
+        return list(self.buffer)
+
+    def clear(self):
+        self.buffer.clear()
+
+    def close(self):
+        pass
+
+
+class JsonlFileSink:
+    """Récepteur écrivant un événement JSON par ligne (écriture tamponnée)"""
+
+    def __init__(self, path):
+        self.file = open(path, "a", encoding="utf-8")
+
+    def write(self, event):
+        self.file.write(json.dumps(event.to_dict(), ensure_ascii=False) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+class BatchedWriterSink:
+    """
+    Récepteur asynchrone : les événements sont mis en file et écrits par lots (JSONL)
+    par un fil d'exécution en arrière-plan. Si la file est pleine, l'événement est
+    abandonné plutôt que de bloquer la boucle de jeu.
+    """
+
+    def __init__(self, path, batch_size=256, flush_interval=0.5, max_pending=65536):
+        """
+        Initialisation du récepteur
+
+        Args:
+            path: Chemin du fichier JSONL
+            batch_size: Nombre maximal d'événements par écriture
+            flush_interval: Délai maximal (s) avant l'écriture d'un lot incomplet
+            max_pending: Taille maximale de la file d'attente
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.dropped = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="BatchedWriterSink", daemon=True)
+        self._thread.start()
+
+    def write(self, event):
+        # La sérialisation est faite par le fil d'arrière-plan
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        """Boucle du fil d'écriture"""
+        with open(self.path, "a", encoding="utf-8") as f:
+            running = True
+            while running:
+                batch = []
+                try:
+                    event = self.queue.get(timeout=self.flush_interval)
+                    while True:
+                        if event is None:
+                            running = False
+                            break
+                        batch.append(event)
+                        if len(batch) >= self.batch_size:
+                            break
+                        event = self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+                if batch:
+                    f.write("".join(json.dumps(e.to_dict(), ensure_ascii=False) + "\n" for e in batch))
+                    f.flush()
+
+    def close(self):
+        """Écrire les événements restants puis arrêter le fil"""
+        if self._closed:
+            return
+        self._closed = True
+        self.queue.put(None)
+        self._thread.join()
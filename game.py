@@ -2,12 +2,19 @@
 Classe principale du jeu, gérant les états du jeu et la boucle principale.
 """
 import random
+import struct
 import pygame
-from item import TreasureChest, DiggingSpot, Locker, FoodItem, ConsumableItem
+import savegame
+import action_log
+import loot
+import pool
+from events import EventBus, EventType
+from item import TreasureChest, DiggingSpot, Locker, FoodItem, ConsumableItem, ITEM_NAMES
 from player import Player
 from mansion import Mansion
 from room_selector import RoomSelector
 from rooms_data import create_room_templates
+from difficulty import set_profile, active as active_profile
 import config
 
 
@@ -24,21 +31,35 @@ class GameState:
 class Game:
     """Classe principale du jeu."""
     
-    def __init__(self):
-        """Initialiser le jeu."""
-        # Définir une graine aléatoire (différente pour chaque jeu).
-        import time
-        random.seed(int(time.time() * 1000) % 1000000)
+    def __init__(self, seed=None, rows=None, cols=None, difficulty=None):
+        """
+        Initialiser le jeu.
         
-        # initialiser pygame
-        pygame.init()
+        Args:
+            seed: Graine aléatoire ; si None, une graine différente est tirée pour chaque jeu
+            rows: Nombre de lignes du manoir (config.GRID_ROWS par défaut)
+            cols: Nombre de colonnes du manoir (config.GRID_COLS par défaut)
+            difficulty: Nom du profil de difficulté (si None, le profil actif, config.DIFFICULTY par défaut)
+        """
+        # Définir une graine aléatoire (différente pour chaque jeu).
+        if seed is None:
+            import time
+            seed = int(time.time() * 1000) % 1000000
+        self.seed = seed
+        random.seed(seed)
+        # Profil de difficulté (tables de tirage partagées par tout le processus)
+        self.difficulty = (set_profile(difficulty) if difficulty is not None else active_profile()).name
         
         # Création d’un objet de jeu
-        self.mansion = Mansion()
-        self.player = Player()
+        self.mansion = Mansion(rows, cols)
+        self.player = Player(self.mansion.entrance_row, self.mansion.entrance_col)
         self.room_templates = create_room_templates()
         self.room_selector = RoomSelector(self.room_templates)
         
+        # Flux d'événements (abonner des récepteurs avec self.events.subscribe)
+        self.events = EventBus()
+        self._connect_events()
+        
         # État du jeu
         self.state = GameState.PLAYING
         self.selected_direction = None
@@ -58,6 +79,9 @@ class Game:
         
         # Verrouillage mobile: empêche le déclenchement de nouveaux mouvements pendant le déplacement
         self.is_moving = False
+        
+        # Journal des actions (voir record_actions)
+        self.action_log = None
     
     def handle_key_event(self, key):
         """
@@ -94,6 +118,142 @@ class Game:
         # La détection de clic du bouton de réinitialisation réelle est traitée dans l'UI
         return None
     
+    def record_actions(self, log):
+        """
+        Enregistre les actions suivantes dans un journal (None pour arrêter)
+        
+        Args:
+            log: Objet ActionLog
+        """
+        self.action_log = log
+    
+    def _connect_events(self):
+        """Relie le joueur et le sélecteur de salles au flux d'événements"""
+        self.player.events = self.events
+        self.room_selector.events = self.events
+    
+    def _record(self, action, arg=0):
+        """Ajoute une action au journal, s'il y en a un"""
+        if self.action_log is not None:
+            self.action_log.record(action, arg)
+    
+    # Actions de jeu : chaque entrée du joueur qui modifie l'état passe par l'une de ces méthodes,
+    # ce qui permet de les journaliser et de les rejouer sans interface.
+    
+    def move(self, direction):
+        """
+        Action : se déplacer dans une direction
+        
+        Args:
+            direction: direction de déplacement ('UP', 'DOWN', 'LEFT', 'RIGHT')
+        """
+        self._record(action_log.MOVE, action_log.DIRECTION_CODES[direction])
+        self.selected_direction = None
+        if self.state == GameState.SELECTING_DIRECTION:
+            self.state = GameState.PLAYING
+        self._try_move(direction)
+    
+    def choose_room(self, index):
+        """
+        Action : choisir l'une des salles proposées
+        
+        Args:
+            index: index de la salle dans la liste proposée
+        """
+        self._record(action_log.CHOOSE_ROOM, index)
+        self.selected_room_index = index
+        self._confirm_room_selection()
+    
+    def reroll(self):
+        """Action : relancer le tirage des salles avec un dé"""
+        self._record(action_log.REROLL, self.selected_room_index)
+        self._reroll_rooms()
+    
+    def cancel_room_selection(self):
+        """Action : annuler la sélection de salle et revenir au jeu"""
+        self._record(action_log.CANCEL_SELECTION)
+        # Remarque : la porte est déjà ouverte, mais le joueur n’a pas choisi de salle ; la porte reste donc ouverte.
+        # Ainsi, le joueur pourra plus tard choisir de nouveau une salle ou une autre direction.
+        self.message = "La sélection de chambres a été annulée"
+        self.state = GameState.PLAYING
+        # Réinitialiser les données liées à la sélection de salle.
+        self.available_rooms = []
+        self.selected_room_index = 0
+        self.target_position = None
+        self.pending_direction = None
+    
+    def open_items(self):
+        """Action : ouvrir la liste d'interaction avec les objets de la salle"""
+        room = self.get_current_room()
+        if room and room.items:
+            self._record(action_log.OPEN_ITEMS)
+            self.item_selection_index = 0
+            self.state = GameState.PICKING_ITEMS
+            self.message = "Ouvrir la liste d’interaction avec les objets."
+    
+    def open_shop(self):
+        """Action : entrer dans la boutique de la salle"""
+        room = self.get_current_room()
+        if room and room.effects and room.effects.get("shop"):
+            self._record(action_log.OPEN_SHOP)
+            self.shop_selection_index = 0
+            self.state = GameState.SHOP
+            self.message = "Boutique: Haut et Bas Sélectionner, Entrée pour acheter, ESC Retour"
+    
+    def close_menu(self):
+        """Action : quitter la boutique ou la liste d'objets"""
+        self._record(action_log.CLOSE_MENU)
+        self.state = GameState.PLAYING
+    
+    def interact_item(self, index):
+        """
+        Action : interagir avec un objet de la salle
+        
+        Args:
+            index: index de l'objet dans la salle
+        """
+        room = self.get_current_room()
+        if not room or not (0 <= index < len(room.items)):
+            return
+        self._record(action_log.INTERACT, index)
+        self.item_selection_index = index
+        item = room.items[index]
+        success, msg = self._interact_with_item(item, room)
+        self.message = msg or ""
+        if success and self.item_selection_index >= len(room.items):
+            self.item_selection_index = max(0, len(room.items) - 1)
+        if not room.items:
+            self.state = GameState.PLAYING
+    
+    def buy(self, index):
+        """
+        Action : acheter un article de la boutique
+        
+        Args:
+            index: index de l'article dans la boutique
+        """
+        room = self.get_current_room()
+        items = room.effects.get("items", []) if room and room.effects else []
+        if not (0 <= index < len(items)):
+            return
+        self._record(action_log.BUY, index)
+        self.shop_selection_index = index
+        spec = items[index]
+        price = spec.get("price", 0)
+        if self.player.inventory.coins.amount < price:
+            self.message = "Pièces d'or insuffisantes"
+            return
+        # Payer et obtenir l'article
+        self.player.inventory.remove_coins(price)
+        it = spec.get("item")
+        if isinstance(it, ConsumableItem) and it.item_id is not None:
+            self.player.inventory.add_item(it.item_id, it.amount)
+        elif isinstance(it, FoodItem):
+            self.player.inventory.add_steps(it.steps_restored)
+        self.events.emit(EventType.ITEM_GAINED, name=spec.get("name", "Article"), amount=1,
+                         source="boutique", price=price)
+        self.message = f"Achat réussi :{spec.get('name','Article')}"
+    
     def _handle_playing(self, key):
         """Gérer les touches pendant la phase de jeu."""
         # Si vous vous déplacez, ignorez toutes les entrées des touches fléchées (pour éviter de sauter des pièces).
@@ -107,48 +267,39 @@ class Game:
             if config.STRICT_MODE:
                 self.state = GameState.SELECTING_DIRECTION
             else:
-                self._try_move(self.selected_direction)
-                self.selected_direction = None
+                self.move(self.selected_direction)
         elif key == pygame.K_s or key == pygame.K_DOWN:
             self.selected_direction = 'DOWN'
             if config.STRICT_MODE:
                 self.state = GameState.SELECTING_DIRECTION
             else:
-                self._try_move(self.selected_direction)
-                self.selected_direction = None
+                self.move(self.selected_direction)
         elif key == pygame.K_a or key == pygame.K_LEFT or key == pygame.K_q:
             self.selected_direction = 'LEFT'
             if config.STRICT_MODE:
                 self.state = GameState.SELECTING_DIRECTION
             else:
-                self._try_move(self.selected_direction)
-                self.selected_direction = None
+                self.move(self.selected_direction)
         elif key == pygame.K_d or key == pygame.K_RIGHT:
             self.selected_direction = 'RIGHT'
             if config.STRICT_MODE:
                 self.state = GameState.SELECTING_DIRECTION
             else:
-                self._try_move(self.selected_direction)
-                self.selected_direction = None
+                self.move(self.selected_direction)
         # Barre d'espace pour confirmation (ou laissez-la).
         elif key == pygame.K_SPACE:
             if self.selected_direction:
-                self._try_move(self.selected_direction)
-                self.selected_direction = None
+                self.move(self.selected_direction)
         elif key == pygame.K_e:
             # Ouvrir la liste d'interaction avec l'objet
-            room = self.get_current_room()
-            if room and room.items:
-                self.item_selection_index = 0
-                self.state = GameState.PICKING_ITEMS
-                self.message = "Ouvrir la liste d’interaction avec les objets."
+            self.open_items()
         elif key == pygame.K_b:
             # Entrer dans la boutique.
-            room = self.get_current_room()
-            if room and room.effects and room.effects.get("shop"):
-                self.shop_selection_index = 0
-                self.state = GameState.SHOP
-                self.message = "Boutique: Haut et Bas Sélectionner, Entrée pour acheter, ESC Retour"
+            self.open_shop()
+        elif key == pygame.K_F5:
+            self.message = self.save(config.SAVE_PATH)[1]
+        elif key == pygame.K_F9:
+            self.message = self.load(config.SAVE_PATH)[1]
         elif key == pygame.K_i:
             # Debug : afficher l’état des portes à la position actuelle.
             current_room = self.mansion.get_room(self.player.row, self.player.col)
@@ -176,9 +327,7 @@ class Game:
         if key == pygame.K_SPACE:
             # Confirmer le déplacement
             if self.selected_direction:
-                self._try_move(self.selected_direction)
-                self.selected_direction = None
-                self.state = GameState.PLAYING
+                self.move(self.selected_direction)
         elif key == pygame.K_ESCAPE:
             # Annuler la sélection.
             self.selected_direction = None
@@ -211,27 +360,18 @@ class Game:
             if not (0 <= self.selected_room_index < len(self.available_rooms)):
                 self.selected_room_index = 0
             # Appeler la méthode de validation de la sélection.
-            self._confirm_room_selection()
+            self.choose_room(self.selected_room_index)
         elif key == pygame.K_r:
             # Relancer les dés pour tirer à nouveau.
-            self._reroll_rooms()
+            self.reroll()
         elif key == pygame.K_ESCAPE:
-            # Annuler la sélection de salle et revenir au jeu.
-            # Remarque : la porte est déjà ouverte, mais le joueur n’a pas choisi de salle ; la porte reste donc ouverte.
-            # Ainsi, le joueur pourra plus tard choisir de nouveau une salle ou une autre direction.
-            self.message = "La sélection de chambres a été annulée"
-            self.state = GameState.PLAYING
-            # Réinitialiser les données liées à la sélection de salle.
-            self.available_rooms = []
-            self.selected_room_index = 0
-            self.target_position = None
-            self.pending_direction = None
+            self.cancel_room_selection()
     
     def _handle_shop(self, key):
         """Traite l'interaction avec le magasin"""
         room = self.get_current_room()
         if key == pygame.K_ESCAPE:
-            self.state = GameState.PLAYING
+            self.close_menu()
             return
         if not room or not (room.effects and room.effects.get("shop")):
             self.state = GameState.PLAYING
@@ -245,33 +385,13 @@ class Game:
         elif key in (pygame.K_DOWN, pygame.K_s):
             self.shop_selection_index = (self.shop_selection_index + 1) % len(items)
         elif key in (pygame.K_RETURN, pygame.K_SPACE):
-            spec = items[self.shop_selection_index]
-            price = spec.get("price", 0)
-            if self.player.inventory.coins.amount < price:
-                self.message = "Pièces d'or insuffisantes"
-                return
-            # Payer et obtenir l'article
-            self.player.inventory.remove_coins(price)
-            it = spec.get("item")
-            if hasattr(it, "name"):
-                if isinstance(it, ConsumableItem):
-                    if it.name == "Pièces d'or":
-                        self.player.inventory.add_coins(it.amount)
-                    elif it.name == "Gemmes":
-                        self.player.inventory.add_gems(it.amount)
-                    elif it.name == "Clés":
-                        self.player.inventory.add_keys(it.amount)
-                    elif it.name == "Dés":
-                        self.player.inventory.add_dice(it.amount)
-                elif isinstance(it, FoodItem):
-                    self.player.inventory.add_steps(it.steps_restored)
-            self.message = f"Achat réussi :{spec.get('name','Article')}"
+            self.buy(self.shop_selection_index)
     
     def _handle_item_picking(self, key):
         """Traite le ramassage d'objets"""
         room = self.get_current_room()
         if key == pygame.K_ESCAPE:
-            self.state = GameState.PLAYING
+            self.close_menu()
             return
         if not room or not room.items:
             self.state = GameState.PLAYING
@@ -281,13 +401,7 @@ class Game:
         elif key in (pygame.K_DOWN, pygame.K_s):
             self.item_selection_index = (self.item_selection_index + 1) % len(room.items)
         elif key in (pygame.K_RETURN, pygame.K_SPACE):
-            item = room.items[self.item_selection_index]
-            success, msg = self._interact_with_item(item, room)
-            self.message = msg or ""
-            if success and self.item_selection_index >= len(room.items):
-                self.item_selection_index = max(0, len(room.items) - 1)
-            if not room.items:
-                self.state = GameState.PLAYING
+            self.interact_item(self.item_selection_index)
     
     def _try_move(self, direction):
         """
@@ -316,15 +430,11 @@ class Game:
                 self.message = message
                 # Vérifie si le hall d'entrée est atteint
                 if self.mansion.check_win_condition(self.player):
-                    self.state = GameState.GAME_OVER
-                    self.game_over_message = "🎉 Félicitations ! Vous avez atteint le hall d'entrée avec succès ! Victoire du jeu !"
-                    self.is_moving = False
+                    self._end_game(True, "🎉 Félicitations ! Vous avez atteint le hall d'entrée avec succès ! Victoire du jeu !")
                 # Vérifie si le jeu est perdu
                 elif self.mansion.check_lose_condition(self.player)[0]:
-                    self.state = GameState.GAME_OVER
                     lose_reason = self.mansion.check_lose_condition(self.player)[1]
-                    self.game_over_message = f"Fin du jeu:{lose_reason}"
-                    self.is_moving = False
+                    self._end_game(False, f"Fin du jeu:{lose_reason}")
                 else:
                     # Mouvement réussi, relâche le verrou de mouvement (après vérification de l'état du jeu)
                     self.is_moving = False
@@ -339,8 +449,8 @@ class Game:
     
     def _interact_with_item(self, item, room):
         """Interagit avec l'article et traite le résultat"""
-        # Type tuple (Nom, Quantité/Valeur)
-        if isinstance(item, tuple):
+        # Récompense typée posée dans la salle (voir loot.Reward)
+        if isinstance(item, loot.Reward):
             success, msg = self.player.pick_up_item(item, self.mansion)
             if success:
                 if item in room.items:
@@ -382,27 +492,13 @@ class Game:
         return success, msg
 
     def _gain_contents(self, contents):
-        """Ajoute le contenu obtenu des conteneurs/fouilles à l'inventaire"""
+        """Ajoute le contenu obtenu des conteneurs/fouilles à l'inventaire (récompenses typées, voir loot)"""
         if not contents:
             return
-        for entry in contents:
-            if isinstance(entry, tuple):
-                name, val = entry
-                if name == "pièces":
-                    self.player.inventory.add_coins(val)
-                elif name == "gemmes":
-                    self.player.inventory.add_gems(val)
-                elif name == "clés":
-                    self.player.inventory.add_keys(val)
-                elif name == "dés":
-                    self.player.inventory.add_dice(val)
-                elif name == "Article permanent":
-                    self.player.inventory.add_permanent_item(val)
-                elif name in ["Pomme", "Banane", "Gâteau", "Sandwich", "Grand repas"]:
-                    # Mangé directement
-                    food_map = {"Pomme": 2, "Banane": 3, "Gâteau": 10, "Sandwich": 15, "Grand repas": 25}
-                    self.player.inventory.add_steps(food_map.get(name, 0))
-            # Autres types ignorés
+        for reward in contents:
+            self.events.emit(EventType.ITEM_GAINED, name=reward.name or ITEM_NAMES[reward.kind],
+                             amount=reward.amount, source="conteneur")
+        loot.apply(contents, self.player.inventory)
     
     def _start_room_selection(self, direction):
         """
@@ -492,7 +588,7 @@ class Game:
                 return
             
             # Consomme un pas et bouge
-            if not self.player.inventory.consume_step():
+            if not self.player.consume_step():
                 self.message = "Pas insuffisants, impossible de bouger"
                 self.state = GameState.PLAYING
                 return
@@ -527,10 +623,12 @@ class Game:
             
             # 2. Porte inversée de la nouvelle pièce (C'est la clé !)
             # Utilise l'objet pièce réel dans la grille
+            # Une salle sans porte (salle d'arrivée, comme le Hall Avant) n'a pas de porte inversée :
+            # la partie s'y achève, l'effet et la victoire sont traités ci-dessous
             opposite_door = placed_room.door_objects.get(opposite)
             if opposite_door:
                 opposite_door.opened = True
-            else:
+            elif placed_room.doors:
                 # C'est une erreur grave si la porte arrière n'existe pas.
                 self.message = f"Erreur critique : La nouvelle pièce n'a pas de porte dans la direction{opposite}"
                 self.state = GameState.PLAYING
@@ -551,17 +649,14 @@ class Game:
                 final_opposite_door = final_room.door_objects.get(opposite)
                 if final_opposite_door:
                     final_opposite_door.opened = True
-                else:
+                elif final_room.doors:
                     self.message = f"Erreur critique : L'objet pièce final n'a pas de porte dans la direction{opposite}"
                     self.state = GameState.PLAYING
                     return
             
             # Vérifie les conditions de fin de jeu (assurez-vous que la porte inversée est ouverte avant de vérifier)
             if self.mansion.check_win_condition(self.player):
-                self.state = GameState.GAME_OVER
-                self.game_over_message = "🎉 Félicitations ! Vous avez atteint le hall d'entrée avec succès ! Victoire du jeu !"
-                # Assurez-vous que le verrouillage du téléphone portable a été déverrouillé.
-                self.is_moving = False
+                self._end_game(True, "🎉 Félicitations ! Vous avez atteint le hall d'entrée avec succès ! Victoire du jeu !")
             else:
                 # Vérifie les conditions de défaite
                 lose_result = self.mansion.check_lose_condition(self.player)
@@ -573,11 +668,26 @@ class Game:
                         all_doors = list(final_room.door_objects.keys())
                         debug_info += f"Toutes les portes : {all_doors}, Portes ouvertes : {opened_doors}, "
                         debug_info += f"Porte inversée({opposite}): {'Ouverte' if final_room.door_objects.get(opposite) and final_room.door_objects[opposite].opened else 'Non ouverte'}"
-                    self.state = GameState.GAME_OVER
-                    self.game_over_message = f"Fin du jeu:{lose_result[1]} ({debug_info})"
+                    self._end_game(False, f"Fin du jeu:{lose_result[1]} ({debug_info})")
                 else:
                     self.state = GameState.PLAYING
     
+    def _end_game(self, victory, message):
+        """
+        Termine la partie
+        
+        Args:
+            victory: True en cas de victoire
+            message: Message de fin de partie
+        """
+        self.state = GameState.GAME_OVER
+        self.game_over_message = message
+        # Assurez-vous que le verrouillage du téléphone portable a été déverrouillé.
+        self.is_moving = False
+        self.events.emit(EventType.GAME_ENDED, victory=victory, message=message,
+                         row=self.player.row, col=self.player.col,
+                         steps=self.player.inventory.steps.amount)
+    
     def _reroll_rooms(self):
         """Utilise un dé pour retier des pièces"""
         if not self.player.inventory.dice.has(1):
@@ -614,11 +724,39 @@ class Game:
     
     def restart(self):
         """Redémarre le jeu"""
-        # Réinitialise
-        self.mansion = Mansion()
-        self.player = Player()
+        self._record(action_log.RESTART)
+        self._reset_objects()
+    
+    def reset(self, seed=None):
+        """
+        Commence une nouvelle partie en réutilisant les structures existantes
+        (grille, joueur, sélecteur ; salles, portes et objets repassent par les réserves)
+        
+        Args:
+            seed: Graine aléatoire ; si None, une nouvelle graine est tirée
+        """
+        if seed is None:
+            import time
+            seed = int(time.time() * 1000) % 1000000
+        self.seed = seed
+        random.seed(seed)
+        self._reset_objects()
+        # Le journal ne connaît que la graine initiale : on y enregistre l'état de départ
+        if self.action_log is not None:
+            self.action_log.snapshot(savegame.dumps(self))
+    
+    def _reset_objects(self):
+        """Réinitialise la partie sur place (mêmes dimensions de grille, même ordre de tirage que le constructeur)"""
+        set_profile(self.difficulty)
+        pool.release_rooms(
+            list(self.mansion.rooms.values()) + self.room_selector.available_rooms
+            + self.available_rooms + self.room_templates
+        )
+        self.mansion.reset()
+        self.player.reset(self.mansion.entrance_row, self.mansion.entrance_col)
         self.room_templates = create_room_templates()
-        self.room_selector = RoomSelector(self.room_templates)
+        self.room_selector.reset(self.room_templates)
+        self._connect_events()
         
         self.state = GameState.PLAYING
         self.selected_direction = None
@@ -627,6 +765,47 @@ class Game:
         self.target_position = None
         self.message = ""
         self.game_over_message = ""
+        self.pending_room_selection = False
+        self.pending_direction = None
+        self.pending_position = None
+        self.item_selection_index = 0
+        self.shop_selection_index = 0
+        self.is_moving = False
+    
+    def save(self, path):
+        """
+        Sauvegarde la partie dans un fichier
+        
+        Args:
+            path: Chemin du fichier de sauvegarde
+        
+        Returns:
+            tuple: (succès, message)
+        """
+        try:
+            savegame.save_game(self, path)
+        except (OSError, ValueError) as e:
+            return False, f"Échec de la sauvegarde : {e}"
+        return True, "Partie sauvegardée"
+    
+    def load(self, path):
+        """
+        Charge une partie depuis un fichier
+        
+        Args:
+            path: Chemin du fichier de sauvegarde
+        
+        Returns:
+            tuple: (succès, message)
+        """
+        try:
+            savegame.load_game(self, path)
+        except (OSError, ValueError, struct.error) as e:
+            return False, f"Échec du chargement : {e}"
+        # L'état chargé ne découle pas des actions précédentes : l'inscrire dans le journal
+        if self.action_log is not None:
+            self.action_log.snapshot(savegame.dumps(self))
+        return True, "Partie chargée"
     
     def get_current_room(self):
         """Obtient la pièce actuelle"""
@@ -637,14 +816,8 @@ class Game:
         # Vérifie les conditions de fin de jeu
         if self.state == GameState.PLAYING:
             if self.mansion.check_win_condition(self.player):
-                self.state = GameState.GAME_OVER
-                self.game_over_message = "🎉 Félicitations ! Vous avez atteint le hall d'entrée avec succès ! Victoire du jeu !"
-                # Assurez-vous que le verrouillage du téléphone portable a été déverrouillé.
-                self.is_moving = False
+                self._end_game(True, "🎉 Félicitations ! Vous avez atteint le hall d'entrée avec succès ! Victoire du jeu !")
             elif self.mansion.check_lose_condition(self.player)[0]:
-                self.state = GameState.GAME_OVER
                 lose_reason = self.mansion.check_lose_condition(self.player)[1]
-                self.game_over_message = f"Fin du jeu:{lose_reason}"
-                # Assurez-vous que le verrouillage du téléphone portable a été déverrouillé.
-                self.is_moving = False
+                self._end_game(False, f"Fin du jeu:{lose_reason}")
 
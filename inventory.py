@@ -1,11 +1,114 @@
 """ 
 Classe de gestion de l'inventaire 
 """
-from item import ConsumableItem, PermanentItem
+from item import ItemId, ItemType, ITEM_IDS, PERMANENT_IDS, STEPS_ID, RABBIT_FOOT_ID, METAL_DETECTOR_ID
+
+
+# Ordre des compteurs dans les sauvegardes, l'analyse et l'affichage : consommables puis articles permanents
+FIELD_IDS = (ItemId.STEPS, ItemId.COINS, ItemId.GEMS, ItemId.KEYS, ItemId.DICE) + PERMANENT_IDS
+
+# Articles dont dépendent les multiplicateurs de probabilité (cache invalidé quand ils changent)
+_MULTIPLIER_IDS = frozenset((ItemId.RABBIT_FOOT, ItemId.METAL_DETECTOR))
+
+
+class ResourceSlot:
+    """Vue d'une ressource de l'inventaire (même interface que ConsumableItem), stockée dans le vecteur"""
+    
+    __slots__ = ("_counts", "item_id", "name")
+    item_type = ItemType.CONSUMABLE
+    description = ""
+    
+    def __init__(self, inventory, item_id, name):
+        """
+        Args:
+            inventory: Inventaire propriétaire du vecteur
+            item_id: Identifiant (ItemId), index dans le vecteur
+            name: Nom affiché
+        """
+        self._counts = inventory.counts
+        self.item_id = item_id
+        self.name = name
+    
+    @property
+    def amount(self):
+        return self._counts[self.item_id]
+    
+    @amount.setter
+    def amount(self, value):
+        self._counts[self.item_id] = value
+    
+    def add(self, amount):
+        """Augmenter la quantité"""
+        self._counts[self.item_id] += amount
+    
+    def remove(self, amount):
+        """Réduire la quantité, retourner si réussite"""
+        counts = self._counts
+        if counts[self.item_id] >= amount:
+            counts[self.item_id] -= amount
+            return True
+        return False
+    
+    def has(self, amount=1):
+        """Vérifier si quantité suffisante"""
+        return self._counts[self.item_id] >= amount
+    
+    def __str__(self):
+        return self.name
+
+
+class PermanentSlot:
+    """Vue d'un article permanent de l'inventaire (même interface que PermanentItem), stockée dans le vecteur"""
+    
+    __slots__ = ("_inventory", "_counts", "item_id", "name", "description")
+    item_type = ItemType.PERMANENT
+    
+    def __init__(self, inventory, item_id, name, description=""):
+        """
+        Args:
+            inventory: Inventaire propriétaire du vecteur
+            item_id: Identifiant (ItemId), index dans le vecteur
+            name: Nom affiché
+            description: Description de l'article
+        """
+        self._inventory = inventory
+        self._counts = inventory.counts
+        self.item_id = item_id
+        self.name = name
+        self.description = description
+    
+    @property
+    def count(self):
+        return self._counts[self.item_id]
+    
+    @count.setter
+    def count(self, value):
+        self._counts[self.item_id] = value
+        self._inventory._multipliers = None
+    
+    def add(self, amount=1):
+        """Ajouter un article permanent"""
+        self.count += amount
+    
+    def has(self):
+        """Vérifier possession"""
+        return self._counts[self.item_id] > 0
+    
+    def get_count(self):
+        """Obtenir la quantité"""
+        return self._counts[self.item_id]
+    
+    def __str__(self):
+        return self.name
 
 
 class Inventory:
-    """Gestion de l'inventaire du joueur"""
+    """Gestion de l'inventaire du joueur
+    
+    Les quantités sont stockées dans un vecteur d'entiers de taille fixe (counts, indexé par ItemId) ;
+    les attributs steps, coins... en sont des vues. Les multiplicateurs de probabilité dérivés des
+    articles permanents sont mis en cache et recalculés seulement après un changement de ces articles.
+    """
     
     def __init__(self, initial_steps=70, initial_coins=0, initial_gems=2, 
                  initial_keys=0, initial_dice=0):
@@ -19,19 +122,84 @@ class Inventory:
             initial_keys: Clés initiales
             initial_dice: Dés initiaux
         """
+        # Vecteur des quantités (l'index 5, réservé, reste à 0)
+        self.counts = [0] * (max(ItemId) + 1)
+        self._multipliers = None
+        
         # Consommables
-        self.steps = ConsumableItem("Pas", initial_steps)
-        self.coins = ConsumableItem("pièces", initial_coins)
-        self.gems = ConsumableItem("gemmes", initial_gems)
-        self.keys = ConsumableItem("clés", initial_keys)
-        self.dice = ConsumableItem("dés", initial_dice)
+        self.steps = ResourceSlot(self, ItemId.STEPS, "Pas")
+        self.coins = ResourceSlot(self, ItemId.COINS, "pièces")
+        self.gems = ResourceSlot(self, ItemId.GEMS, "gemmes")
+        self.keys = ResourceSlot(self, ItemId.KEYS, "clés")
+        self.dice = ResourceSlot(self, ItemId.DICE, "dés")
         
         # Articles permanents
-        self.shovel = PermanentItem("Pelle", "Permet de creuser à certains endroits")
-        self.hammer = PermanentItem("Marteau", "Peut casser les cadenas des coffres")
-        self.lockpick = PermanentItem("Kit de crochetage", "Permet d’ouvrir des portes de niveau 1 sans consommer de clé")
-        self.metal_detector = PermanentItem("Détecteur de métaux", "Augmente la probabilité de trouver des clés et des pièces")
-        self.lucky_rabbit_foot = PermanentItem("Patte de lapin", "Augmente la probabilité de trouver des objets")
+        self.shovel = PermanentSlot(self, ItemId.SHOVEL, "Pelle", "Permet de creuser à certains endroits")
+        self.hammer = PermanentSlot(self, ItemId.HAMMER, "Marteau", "Peut casser les cadenas des coffres")
+        self.lockpick = PermanentSlot(self, ItemId.LOCKPICK, "Kit de crochetage", "Permet d’ouvrir des portes de niveau 1 sans consommer de clé")
+        self.metal_detector = PermanentSlot(self, ItemId.METAL_DETECTOR, "Détecteur de métaux", "Augmente la probabilité de trouver des clés et des pièces")
+        self.lucky_rabbit_foot = PermanentSlot(self, ItemId.RABBIT_FOOT, "Patte de lapin", "Augmente la probabilité de trouver des objets")
+        
+        # Vues par identifiant (None pour les identifiants inutilisés)
+        self.slots = [None] * len(self.counts)
+        for slot in (self.coins, self.gems, self.keys, self.dice, self.steps,
+                     self.shovel, self.hammer, self.lockpick, self.metal_detector, self.lucky_rabbit_foot):
+            self.slots[slot.item_id] = slot
+        
+        # Vecteur initial, restauré par reset
+        initial = [0] * len(self.counts)
+        initial[ItemId.STEPS] = initial_steps
+        initial[ItemId.COINS] = initial_coins
+        initial[ItemId.GEMS] = initial_gems
+        initial[ItemId.KEYS] = initial_keys
+        initial[ItemId.DICE] = initial_dice
+        self._initial = tuple(initial)
+        self.counts[:] = self._initial
+    
+    def reset(self):
+        """Restaurer l'inventaire initial sur place (nouvelle partie)"""
+        self.restore(self._initial)
+    
+    def snapshot(self):
+        """
+        Copier le vecteur des quantités
+        
+        Returns:
+            tuple: Quantité de chaque identifiant (indexé par ItemId)
+        """
+        return tuple(self.counts)
+    
+    def restore(self, vector):
+        """
+        Remplacer toutes les quantités sur place (instantané de snapshot)
+        
+        Args:
+            vector: Quantité de chaque identifiant
+        """
+        if len(vector) != len(self.counts):
+            raise ValueError("Le vecteur doit avoir une entrée par identifiant")
+        self.counts[:] = vector
+        self._multipliers = None
+    
+    def apply_delta(self, vector):
+        """
+        Ajouter un vecteur de variations en une seule opération (tout ou rien)
+        
+        Args:
+            vector: Variation de chaque identifiant (indexé par ItemId)
+        
+        Raises:
+            ValueError: si une quantité deviendrait négative (l'inventaire n'est pas modifié)
+        """
+        counts = self.counts
+        if len(vector) != len(counts):
+            raise ValueError("Le vecteur doit avoir une entrée par identifiant")
+        result = [count + delta for count, delta in zip(counts, vector)]
+        if min(result) < 0:
+            raise ValueError("Quantité insuffisante pour appliquer les variations")
+        counts[:] = result
+        if vector[RABBIT_FOOT_ID] or vector[METAL_DETECTOR_ID]:
+            self._multipliers = None
     
     def add_steps(self, amount):
         """Augmenter les pas"""
@@ -39,8 +207,9 @@ class Inventory:
     
     def consume_step(self):
         """Consommer un pas, retourner si encore des pas disponibles"""
-        if self.steps.has(1):
-            self.steps.remove(1)
+        counts = self.counts
+        if counts[STEPS_ID] >= 1:
+            counts[STEPS_ID] -= 1
             return True
         return False
     
@@ -76,19 +245,41 @@ class Inventory:
         """Consommer des dés"""
         return self.dice.remove(amount)
     
-    def add_permanent_item(self, item_name):
-        """Ajouter un article permanent"""
-        if item_name == "Pelle":
-            self.shovel.add()
-        elif item_name == "Marteau":
-            self.hammer.add()
-        elif item_name == "Kit de crochetage":
-            self.lockpick.add()
-        elif item_name == "Détecteur de métaux":
-            self.metal_detector.add()
-        elif item_name == "Patte de lapin":
-            self.lucky_rabbit_foot.add()
-
+    def add_item(self, item_id, amount=1):
+        """
+        Ajouter une ressource ou un article permanent par son identifiant
+        
+        Args:
+            item_id: Identifiant (ItemId)
+            amount: Quantité (nombre d'exemplaires pour un article permanent)
+        """
+        self.counts[item_id] += amount
+        if item_id in _MULTIPLIER_IDS:
+            self._multipliers = None
+    
+    def add_permanent_item(self, item):
+        """
+        Ajouter un article permanent
+        
+        Args:
+            item: Identifiant (ItemId) ou nom de l'article
+        """
+        self.add_item(item if isinstance(item, int) else ITEM_IDS[item])
+    
+    def _compute_multipliers(self):
+        """Calculer (et mettre en cache) les multiplicateurs, dans l'ordre de loot.SCALES (fixe, découverte, clés et pièces)"""
+        counts = self.counts
+        self._multipliers = (1.0, 1.0 + 0.5 * counts[RABBIT_FOOT_ID], 1.0 + 0.5 * counts[METAL_DETECTOR_ID])
+        return self._multipliers
+    
+    def get_multipliers(self):
+        """
+        Obtenir les facteurs d'échelle des tables de butin (tuple mis en cache, voir loot.multipliers)
+        
+        Returns:
+            tuple: Facteur de chaque index de loot.SCALES
+        """
+        return self._multipliers or self._compute_multipliers()
     
     def get_item_find_probability(self):
         """
@@ -97,10 +288,7 @@ class Inventory:
         Returns:
             float: multiplicateur
         """
-        multiplier = 1.0
-        if self.lucky_rabbit_foot.has():
-            multiplier += 0.5 * self.lucky_rabbit_foot.get_count()
-        return multiplier
+        return (self._multipliers or self._compute_multipliers())[1]
     
     def get_key_coin_probability(self):
         """
@@ -110,10 +298,7 @@ class Inventory:
         Returns:
             float: multiplicateur
         """
-        multiplier = 1.0
-        if self.metal_detector.has():
-            multiplier += 0.5 * self.metal_detector.get_count()
-        return multiplier
+        return (self._multipliers or self._compute_multipliers())[2]
     
     def get_dict(self):
         """Obtenir le dictionnaire de l'inventaire pour affichage"""
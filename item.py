@@ -1,8 +1,9 @@
 """
 Définition de la classe d'objets
 """
-import random
-from enum import Enum
+from enum import Enum, IntEnum
+import difficulty
+import loot
 
 
 class ItemType(Enum):
@@ -14,6 +15,60 @@ class ItemType(Enum):
     INTERACTABLE = "Objet interactif"
 
 
+class ItemId(IntEnum):
+    """Identifiants entiers des ressources et articles permanents (stables : écrits dans les sauvegardes)"""
+    COINS = 0
+    GEMS = 1
+    KEYS = 2
+    DICE = 3
+    STEPS = 4
+    # 5 : réservé (non attribué)
+    SHOVEL = 6
+    HAMMER = 7
+    LOCKPICK = 8
+    METAL_DETECTOR = 9
+    RABBIT_FOOT = 10
+
+
+# Identifiants lus à chaque tour (pas, pièces, multiplicateurs), en entiers simples pour les chemins critiques
+STEPS_ID = int(ItemId.STEPS)
+COINS_ID = int(ItemId.COINS)
+RABBIT_FOOT_ID = int(ItemId.RABBIT_FOOT)
+METAL_DETECTOR_ID = int(ItemId.METAL_DETECTOR)
+
+PERMANENT_IDS = (ItemId.SHOVEL, ItemId.HAMMER, ItemId.LOCKPICK, ItemId.METAL_DETECTOR, ItemId.RABBIT_FOOT)
+
+# Noms d'affichage (interface et messages uniquement)
+ITEM_NAMES = {
+    ItemId.COINS: "pièces",
+    ItemId.GEMS: "gemmes",
+    ItemId.KEYS: "clés",
+    ItemId.DICE: "dés",
+    ItemId.STEPS: "pas",
+    ItemId.SHOVEL: "Pelle",
+    ItemId.HAMMER: "Marteau",
+    ItemId.LOCKPICK: "Kit de crochetage",
+    ItemId.METAL_DETECTOR: "Détecteur de métaux",
+    ItemId.RABBIT_FOOT: "Patte de lapin",
+}
+
+# Noms rencontrés dans le catalogue, les profils et les anciennes sauvegardes -> identifiant
+# (résolus une fois, à la création des objets ; la logique du jeu ne compare jamais de noms)
+ITEM_IDS = {
+    "pièces": ItemId.COINS, "Pièces d'or": ItemId.COINS, "Pièce d'or": ItemId.COINS, "Pièce d’or": ItemId.COINS,
+    "gemmes": ItemId.GEMS, "Gemmes": ItemId.GEMS, "Gemme": ItemId.GEMS,
+    "clés": ItemId.KEYS, "Clés": ItemId.KEYS, "Clé": ItemId.KEYS,
+    "dés": ItemId.DICE, "Dés": ItemId.DICE, "Dé": ItemId.DICE,
+    "Pas": ItemId.STEPS, "pas": ItemId.STEPS,
+    "Pelle": ItemId.SHOVEL,
+    "Marteau": ItemId.HAMMER,
+    "Kit de crochetage": ItemId.LOCKPICK,
+    "Détecteur de métaux": ItemId.METAL_DETECTOR,
+    "Patte de lapin": ItemId.RABBIT_FOOT,
+    "Patte de lapin porte-bonheur": ItemId.RABBIT_FOOT,
+}
+
+
 class Item:
     """Classe de base des objets"""
     
@@ -65,16 +120,18 @@ class FoodItem(Item):
 class ConsumableItem(Item):
     """Objet consommable (pièces, gemmes, clés, dés)"""
     
-    def __init__(self, name, initial_amount=0):
+    def __init__(self, name, initial_amount=0, item_id=None):
         """
         Initialisation de l'objet consommable
         
         Args:
             name: Nom de l'objet
             initial_amount: Quantité initiale
+            item_id: Identifiant de la ressource (ItemId), déduit du nom si None
         """
         super().__init__(name, ItemType.CONSUMABLE)
         self.amount = initial_amount
+        self.item_id = item_id if item_id is not None else ITEM_IDS.get(name)
     
     def add(self, amount):
         """Augmenter la quantité"""
@@ -95,20 +152,22 @@ class ConsumableItem(Item):
 class PermanentItem(Item):
     """Article permanent"""
     
-    def __init__(self, name, description=""):
+    def __init__(self, name, description="", item_id=None):
         """
         Initialisation de l'article permanent
         
         Args:
             name: Nom de l'objet
             description: Description de l'objet
+            item_id: Identifiant de l'article (ItemId), déduit du nom si None
         """
         super().__init__(name, ItemType.PERMANENT, description)
         self.count = 0  # Certains objets permanents peuvent être multiples
+        self.item_id = item_id if item_id is not None else ITEM_IDS.get(name)
     
-    def add(self):
+    def add(self, amount=1):
         """Ajouter un article permanent"""
-        self.count += 1
+        self.count += amount
     
     def has(self):
         """Vérifier possession"""
@@ -134,23 +193,7 @@ class TreasureChest(Item):
         Args:
             base_probability: Probabilité de base (effets type patte de lapin)
         """
-        if random.random() < 0.3 * base_probability:
-            self.contents.append(("pièces", random.randint(5, 20)))
-        if random.random() < 0.4 * base_probability:
-            self.contents.append(("clés", random.randint(1, 2)))
-        if random.random() < 0.3 * base_probability:
-            self.contents.append(("gemmes", random.randint(1, 2)))
-        if random.random() < 0.2 * base_probability:
-            self.contents.append(("dés", 1))
-        if random.random() < 0.1 * base_probability:
-            foods = [
-                ("Pomme", 2),
-                ("Banane", 3),
-                ("Gâteau", 10),
-                ("Sandwich", 15)
-            ]
-            food_name, steps = random.choice(foods)
-            self.contents.append((food_name, steps))
+        self.contents.extend(loot.roll(difficulty.active().chest, loot.multipliers(find=base_probability)))
     
     def open_with_key(self, player):
         """Ouvrir le coffre avec une clé"""
@@ -191,15 +234,7 @@ class DiggingSpot(Item):
         Args:
             base_probability: Probabilité de base
         """
-        if random.random() < 0.5 * base_probability:
-            self.contents.append(("pièces", random.randint(3, 15)))
-        if random.random() < 0.3 * base_probability:
-            self.contents.append(("clés", 1))
-        if random.random() < 0.2 * base_probability:
-            self.contents.append(("gemmes", 1))
-        if random.random() < 0.1 * base_probability:
-            permanent_items = ["Pelle", "Marteau", "Kit de crochetage", "Détecteur de métaux", "Patte de lapin"]
-            self.contents.append(("Article permanent", random.choice(permanent_items)))
+        self.contents.extend(loot.roll(difficulty.active().digging_spot, loot.multipliers(find=base_probability)))
     
     def dig(self, player):
         """Creuser"""
@@ -223,12 +258,7 @@ class Locker(Item):
     
     def generate_contents(self, base_probability=1.0):
         """Générer le contenu du casier"""
-        if random.random() < 0.4 * base_probability:
-            self.contents.append(("pièces", random.randint(5, 25)))
-        if random.random() < 0.3 * base_probability:
-            self.contents.append(("clés", random.randint(1, 3)))
-        if random.random() < 0.2 * base_probability:
-            self.contents.append(("gemmes", random.randint(1, 3)))
+        self.contents.extend(loot.roll(difficulty.active().locker, loot.multipliers(find=base_probability)))
     
     def open(self, player):
         """Ouvrir le casier avec une clé"""
@@ -0,0 +1,195 @@
+"""
+Moteur de tables de butin
+Les tables (profils de difficulté) sont compilées en tuples (probabilité, facteur d'échelle, fabrique) ;
+les récompenses des conteneurs sont des enregistrements typés (Reward) à identifiant entier (item.ItemId),
+appliqués à l'inventaire en un seul vecteur de variations, éventuellement par lots
+"""
+import random
+from collections import namedtuple
+import item
+import pool
+
+
+# Récompense typée : type (item.ItemId), quantité, nom de l'aliment (récompenses STEPS, "" sinon)
+Reward = namedtuple("Reward", ["kind", "amount", "name"])
+
+# Nom des types dans les descriptions déclaratives -> nom du membre de item.ItemId
+_KIND_CODES = {"coins": "COINS", "gems": "GEMS", "keys": "KEYS", "dice": "DICE", "steps": "STEPS", "permanent": None}
+
+# Facteurs d'échelle des probabilités (index dans le tuple renvoyé par multipliers()) :
+#   find     : probabilité de trouver des objets (patte de lapin)
+#   key_coin : probabilité de trouver clés et pièces (détecteur de métaux)
+SCALES = (None, "find", "key_coin")
+_SCALE_CODES = {scale: index for index, scale in enumerate(SCALES)}
+
+
+def _chooser(spec):
+    """
+    Compiler un tirage parmi "choices" (pondéré si "weights" est fourni, uniforme sinon)
+    en fonction sans argument
+    """
+    choices = [tuple(choice) if isinstance(choice, list) else choice for choice in spec["choices"]]
+    weights = spec.get("weights")
+    if weights is not None and len(weights) != len(choices):
+        raise ValueError("Les poids doivent correspondre aux choix")
+    if len(choices) == 1:
+        # Un seul choix : aucun tirage
+        choice = choices[0]
+        return lambda: choice
+    if weights is None:
+        return lambda: random.choice(choices)
+    cum_weights = []
+    total = 0
+    for weight in weights:
+        total += weight
+        cum_weights.append(total)
+    return lambda: random.choices(choices, cum_weights=cum_weights)[0]
+
+
+def compile_reward(spec):
+    """
+    Compiler une description de récompense en fabrique sans argument
+
+    Types reconnus :
+        reward (kind : coins, gems, keys, dice ; amount : entier ou [min, max]) : Reward typée
+        reward (kind : steps ; choices [[aliment, pas], ...]) : Reward STEPS tirée parmi les aliments
+        reward (kind : permanent ; choices [noms]) : Reward de l'article tiré (identifiant résolu à la compilation)
+        consumable (name, amount), food (choices [[nom, pas], ...]), chest, digging_spot, locker : objets posés dans une salle
+    Les classes d'objets sont résolues à l'appel (item.py importe ce module pour les conteneurs).
+    """
+    kind = spec.get("type")
+    if kind == "reward":
+        if spec.get("kind") not in _KIND_CODES:
+            raise ValueError(f"Type de récompense inconnu : {spec.get('kind')}")
+        if spec["kind"] == "permanent":
+            # Articles désignés par leur nom dans la description, résolus ici en identifiants
+            spec = dict(spec, choices=[item.ITEM_IDS[name] for name in spec["choices"]])
+            choose = _chooser(spec)
+            return lambda: Reward(choose(), 1, "")
+        code = item.ItemId[_KIND_CODES[spec["kind"]]]
+        if code == item.ItemId.STEPS:
+            choose = _chooser(spec)
+
+            def make_meal():
+                name, steps = choose()
+                return Reward(code, steps, name)
+            return make_meal
+        amount = spec["amount"]
+        if isinstance(amount, list):
+            low, high = amount
+            return lambda: Reward(code, random.randint(low, high), "")
+        return lambda: Reward(code, amount, "")
+    if kind == "consumable":
+        name, amount = spec["name"], spec["amount"]
+        if isinstance(amount, list):
+            low, high = amount
+            return lambda: pool.new_item(item.ConsumableItem, name, random.randint(low, high))
+        return lambda: pool.new_item(item.ConsumableItem, name, amount)
+    if kind == "food":
+        choose = _chooser(spec)
+        return lambda: pool.new_item(item.FoodItem, *choose())
+    if kind == "chest":
+        return lambda: pool.new_item(item.TreasureChest)
+    if kind == "digging_spot":
+        return lambda: pool.new_item(item.DiggingSpot)
+    if kind == "locker":
+        return lambda: pool.new_item(item.Locker)
+    raise ValueError(f"Type de récompense inconnu : {kind}")
+
+
+def compile_table(entries, factor=1.0):
+    """
+    Compiler une liste d'entrées {"probability", "scale", "reward"} en table de tirage
+
+    Args:
+        entries: Entrées déclaratives (tirées indépendamment, dans l'ordre)
+        factor: Multiplicateur appliqué à toutes les probabilités
+
+    Returns:
+        tuple: (probabilité, index du facteur d'échelle, fabrique) pour chaque entrée
+    """
+    table = []
+    for entry in entries:
+        scale = entry.get("scale")
+        if scale not in _SCALE_CODES:
+            raise ValueError(f"Facteur d'échelle inconnu : {scale}")
+        table.append((entry["probability"] * factor, _SCALE_CODES[scale], compile_reward(entry["reward"])))
+    return tuple(table)
+
+
+def multipliers(inventory=None, find=None, key_coin=None):
+    """
+    Calculer les facteurs d'échelle d'un joueur
+
+    Args:
+        inventory: Inventaire du joueur (facteurs à 1.0 si None)
+        find: Facteur "find" imposé
+        key_coin: Facteur "key_coin" imposé
+
+    Returns:
+        tuple: Facteur de chaque index de SCALES
+    """
+    if inventory is not None and find is None and key_coin is None:
+        # Tuple mis en cache par l'inventaire, invalidé quand ses articles permanents changent
+        return inventory.get_multipliers()
+    if find is None:
+        find = inventory.get_item_find_probability() if inventory is not None else 1.0
+    if key_coin is None:
+        key_coin = inventory.get_key_coin_probability() if inventory is not None else 1.0
+    return (1.0, find, key_coin)
+
+
+def roll(table, scales):
+    """
+    Tirer une table : un tirage par entrée, dans l'ordre
+
+    Args:
+        table: Table compilée
+        scales: Facteurs d'échelle (voir multipliers)
+
+    Returns:
+        list: Récompenses obtenues
+    """
+    rand = random.random
+    return [make() for probability, scale, make in table if rand() < probability * scales[scale]]
+
+
+def delta(rewards, size):
+    """
+    Cumuler des récompenses en vecteur de variations (voir Inventory.apply_delta)
+
+    Args:
+        rewards: Récompenses (Reward) ; les autres entrées sont ignorées
+        size: Taille du vecteur (len(inventory.counts))
+
+    Returns:
+        list: Quantité cumulée par identifiant
+    """
+    vector = [0] * size
+    for reward in rewards:
+        if reward.__class__ is Reward:
+            vector[reward.kind] += reward.amount
+    return vector
+
+
+def apply(rewards, inventory):
+    """
+    Appliquer des récompenses à l'inventaire en une seule opération
+
+    Args:
+        rewards: Récompenses (Reward) ; les autres entrées sont ignorées
+        inventory: Inventaire du joueur
+    """
+    inventory.apply_delta(delta(rewards, len(inventory.counts)))
+
+
+def apply_batch(batches, inventory):
+    """
+    Appliquer plusieurs lots de récompenses en une seule opération
+    (quantités cumulées par identifiant, quel que soit le nombre de récompenses)
+
+    Args:
+        batches: Itérable de listes de récompenses
+        inventory: Inventaire du joueur
+    """
+    inventory.apply_delta(delta((reward for rewards in batches for reward in rewards), len(inventory.counts)))
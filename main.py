@@ -3,6 +3,8 @@ Point d'entrée principal du jeu
 """
 import pygame
 import sys
+import config
+from action_log import ActionLog
 from game import Game
 from ui import UI
 
@@ -17,6 +19,13 @@ def main():
     game = Game()
     ui = UI()
     
+    # Journal des actions de la partie (permet de la rejouer avec replay.py)
+    log = None
+    if config.ACTION_LOG_PATH:
+        log = ActionLog.create(config.ACTION_LOG_PATH, game.seed, game.mansion.rows, game.mansion.cols,
+                               game.difficulty)
+        game.record_actions(log)
+    
     # Suivi de l'état des touches pour éviter les déclenchements répétés (compatibilité Windows)
     keys_pressed_last_frame = set()
     key_repeat_timer = {}  # Minuteries de répétition des touches (en millisecondes)
@@ -95,12 +104,15 @@ def main():
                             game.handle_key_event(event.key)
                             # Marquer cette touche comme traitée pour cette frame
                             processed_direction_keys_this_frame.add(event.key)
-                    else:
-                        # Touche non directionnelle, traitement normal
+                    elif not ui.handle_camera_key(event.key):
+                        # Touche non directionnelle (hors caméra), traitement normal
                         game.handle_key_event(event.key)
                 # Réinitialiser le compteur de répétition pour cette touche
                 if event.key in key_repeat_timer:
                     key_repeat_timer[event.key] = 0
+            elif event.type in (pygame.MOUSEWHEEL, pygame.MOUSEMOTION):
+                # Zoom (molette) et défilement de la grille (glisser clic droit)
+                ui.handle_camera_event(event)
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 # Vérifier si le bouton de réinitialisation a été cliqué
                 if hasattr(ui, 'reset_button_rect') and ui.reset_button_rect:
@@ -253,6 +265,8 @@ def main():
         clock.tick(60)
     
     # Quitter proprement
+    if log is not None:
+        log.close()
     pygame.quit()
     sys.exit()
 
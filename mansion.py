@@ -2,38 +2,96 @@
 Classe de gestion de la grille du Manoir
 """
 import config
-from room import Room
+from rooms_data import create_entrance_room
+from item import FoodItem, STEPS_ID, COINS_ID
+from loot import Reward
 
 
 class Mansion:
-    """Classe Manoir, gère la grille 5x9 et la disposition des pièces"""
+    """Classe Manoir, gère la grille (5x9 par défaut) et la disposition des pièces"""
     
-    def __init__(self):
-        """Initialise le manoir"""
-        self.grid = [[None for _ in range(config.GRID_COLS)] 
-                     for _ in range(config.GRID_ROWS)]
+    def __init__(self, rows=None, cols=None):
+        """
+        Initialise le manoir
+        
+        Args:
+            rows: Nombre de lignes (config.GRID_ROWS par défaut)
+            cols: Nombre de colonnes (config.GRID_COLS par défaut)
+        """
+        self.rows = rows if rows is not None else config.GRID_ROWS
+        self.cols = cols if cols is not None else config.GRID_COLS
+        # Entrée au milieu de la dernière ligne, Hall Avant au milieu de la première
+        self.entrance_row = self.rows - 1
+        self.entrance_col = self.cols // 2
+        self.front_hall_row = config.FRONT_HALL_ROW
+        self.front_hall_col = self.cols // 2
+        # Stockage creux : seules les cases occupées sont conservées, (ligne, colonne) -> Room
+        self.rooms = {}
+        # Frontière indexée : cases vides de la grille derrière une porte d'une pièce placée
+        self.frontier = set()
         self.entrance_room = None
         self.front_hall_room = None
         self._initialize_entrance()
     
+    @property
+    def grid(self):
+        """Vue dense de la grille (liste de lignes), construite à la demande"""
+        rooms = self.rooms
+        return [[rooms.get((row, col)) for col in range(self.cols)] for row in range(self.rows)]
+    
+    def in_bounds(self, row, col):
+        """Vérifie si la position est dans la grille"""
+        return 0 <= row < self.rows and 0 <= col < self.cols
+    
     def _initialize_entrance(self):
         """Initialise la pièce d'entrée"""
-        entrance = Room(
-            name="Hall d'entrée",
-            color="BLUE",
-            rarity=0,
-            gem_cost=0,
-            doors=['UP'],  # La seule entrée est une porte orientée vers le haut.
-            image_path="images/SalleOrdinaire.png"  # L'entrée utilise l'image de salle ordinaire
-        )
-        entrance.set_position(config.ENTRANCE_ROW, config.ENTRANCE_COL)
+        entrance = create_entrance_room()
         entrance.explored = True
-        self.set_room(config.ENTRANCE_ROW, config.ENTRANCE_COL, entrance)
+        self.set_room(self.entrance_row, self.entrance_col, entrance)
         self.entrance_room = entrance
         # S'assurer que la porte de l'entrée vers le haut est déverrouillée (pour faciliter le début du jeu)
         if 'UP' in entrance.door_objects:
             entrance.door_objects['UP'].lock_level = 0
     
+    def clear(self):
+        """Vide la grille sans recréer la pièce d'entrée (utilisé au chargement d'une sauvegarde)"""
+        self.rooms.clear()
+        self.frontier.clear()
+        self.entrance_room = None
+        self.front_hall_room = None
+    
+    def reset(self):
+        """Vide la grille sur place et replace la pièce d'entrée (nouvelle partie)"""
+        self.clear()
+        self._initialize_entrance()
+    
+    def _index_room(self, row, col, room):
+        """Enregistre une pièce dans le stockage creux et met à jour la frontière"""
+        self.rooms[(row, col)] = room
+        self.frontier.discard((row, col))
+        for direction in room.doors:
+            dr, dc = config.DIRECTIONS[direction]
+            target = (row + dr, col + dc)
+            if target not in self.rooms and self.in_bounds(*target):
+                self.frontier.add(target)
+    
+    def restore_room(self, row, col, room):
+        """
+        Replace une pièce déjà positionnée sans régénérer ses portes
+        
+        Args:
+            row: Position en ligne
+            col: Position en colonne
+            room: Objet Room dont les portes sont déjà restaurées
+        """
+        room.row = row
+        room.col = col
+        self._index_room(row, col, room)
+        if room.name == "Hall d'entrée" and row == self.entrance_row:
+            self.entrance_room = room
+        if room.name == "Hall Avant" or (room.name == "Hall d'entrée" and row == self.front_hall_row):
+            self.front_hall_room = room
+    
     def set_room(self, row, col, room):
         """
         Définit la pièce à la position spécifiée
@@ -43,15 +101,15 @@ class Mansion:
             col: Position en colonne
             room: Objet Room
         """
-        if 0 <= row < config.GRID_ROWS and 0 <= col < config.GRID_COLS:
-            room.set_position(row, col)
-            self.grid[row][col] = room
+        if self.in_bounds(row, col):
+            room.set_position(row, col, self.rows)
+            self._index_room(row, col, room)
             
             # Si c'est le hall d'entrée (Front Hall) ou Hall Avant, l'enregistrer
             #Le Hall Avant est la salle cible (tout en haut), et le Hall d'entrée est la salle d'entrée (tout en bas).
             if room.name == "Hall d'entrée" or room.name == "Hall Avant":
                 # Seul le Hall Avant, tout en haut, est la véritable cible.
-                if room.name == "Hall Avant" or (room.name == "Hall d'entrée" and room.row == config.FRONT_HALL_ROW):
+                if room.name == "Hall Avant" or (room.name == "Hall d'entrée" and room.row == self.front_hall_row):
                     self.front_hall_room = room
     
     def get_room(self, row, col):
@@ -65,19 +123,11 @@ class Mansion:
         Returns:
             Objet Room ou None
         """
-        if 0 <= row < config.GRID_ROWS and 0 <= col < config.GRID_COLS:
-            return self.grid[row][col]
-        return None
+        return self.rooms.get((row, col))
     
     def count_explored_rooms(self):
         """Compte le nombre de pièces explorées"""
-        count = 0
-        for row in range(config.GRID_ROWS):
-            for col in range(config.GRID_COLS):
-                room = self.grid[row][col]
-                if room and room.explored:
-                    count += 1
-        return count
+        return sum(1 for room in self.rooms.values() if room.explored)
     
     def get_adjacent_room(self, row, col, direction):
         """
@@ -131,22 +181,18 @@ class Mansion:
         Returns:
             bool:Est-ce sur le bord
         """
-        return (row == 0 or row == config.GRID_ROWS - 1 or 
-                col == 0 or col == config.GRID_COLS - 1)
+        return (row == 0 or row == self.rows - 1 or 
+                col == 0 or col == self.cols - 1)
     
     def is_last_row(self, row):
         """Vérifie si c'est la dernière ligne (ligne du Hall d'entrée)"""
-        return row == config.FRONT_HALL_ROW
+        return row == self.front_hall_row
     
     def get_all_rooms(self):
         """Obtient toutes les pièces placées"""
-        rooms = []
-        for row in range(config.GRID_ROWS):
-            for col in range(config.GRID_COLS):
-                room = self.grid[row][col]
-                if room:
-                    rooms.append(room)
-        return rooms
+        # Ordre ligne par ligne, comme un parcours de la grille
+        rooms = self.rooms
+        return [rooms[position] for position in sorted(rooms)]
     
     def check_win_condition(self, player):
         """
@@ -164,8 +210,8 @@ class Mansion:
         # Important : La victoire n'est obtenue que lorsque vous atteignez « Hall Avant » dans FRONTHALLROW (ligne 0).
         # La pièce d'entrée (ENTRANCE_ROW, dernière ligne) est « Hall d'entrée », et non la pièce cible.
         # Les deux conditions suivantes doivent être remplies simultanément : 1) L'emplacement se trouve dans la rangée FRONTHALLROW ; 2) Le nom de la salle est « Hall Avant ».
-        if (player.row == config.FRONT_HALL_ROW and 
-            player.col == config.FRONT_HALL_COL and
+        if (player.row == self.front_hall_row and 
+            player.col == self.front_hall_col and
             current_room is not None and 
             current_room.name == "Hall Avant"):
             return True
@@ -174,7 +220,7 @@ class Mansion:
         if self.front_hall_room is not None:
             if (player.row == self.front_hall_room.row and 
                 player.col == self.front_hall_room.col and
-                player.row == config.FRONT_HALL_ROW):  # Des vérifications supplémentaires garantissent qu'il s'agit de la rangée du hall avant.
+                player.row == self.front_hall_row):  # Des vérifications supplémentaires garantissent qu'il s'agit de la rangée du hall avant.
                 return True
         
         return False
@@ -193,27 +239,27 @@ class Mansion:
         current_room = self.get_room(player.row, player.col)
         if current_room is None:
             return True, "Pas de pièce à la position actuelle"
-        
+
+        # Toute pièce se place derrière une porte : sans case de frontière, le manoir ne peut plus
+        # s'étendre et le Hall Avant ne sera jamais atteint
+        if not self.frontier and self.front_hall_room is None:
+            return True, "Manoir sans issue : plus aucune case libre derrière une porte"
+
         # Vérifie les pas
-        if player.inventory.steps.amount <= 0:
+        if player.inventory.counts[STEPS_ID] <= 0:
             # Lorsque les pas sont à 0, vérifie si la pièce actuelle contient des objets qui peuvent restaurer les pas
             # S'il y en a, donne au joueur la chance de les ramasser, ne déclare pas immédiatement la défaite
             has_recoverable_items = False
+            shop = bool(current_room.effects and current_room.effects.get("shop"))
             for item in current_room.items:
                 # Vérifie s'il y a de la nourriture pour restaurer les pas
-                if isinstance(item, tuple):
-                    item_name = item[0]
-                    if item_name in ["Pomme", "Banane", "Gâteau", "Sandwich", "Grand repas"]:
-                        has_recoverable_items = True
-                        break
-                elif hasattr(item, "name"):
-                    if item.name in ["Pomme", "Banane", "Gâteau", "Sandwich", "Grand repas"]:
-                        has_recoverable_items = True
-                        break
-                    # Vérifie s'il y a des pièces d'or pour acheter de la nourriture (s'il y a une boutique)
-                    if item.name == "pièces" and current_room.effects and current_room.effects.get("shop"):
-                        has_recoverable_items = True
-                        break
+                if isinstance(item, FoodItem) or (isinstance(item, Reward) and item.kind == STEPS_ID):
+                    has_recoverable_items = True
+                    break
+                # Vérifie s'il y a des pièces d'or pour acheter de la nourriture (s'il y a une boutique)
+                if shop and getattr(item, "item_id", None) == COINS_ID:
+                    has_recoverable_items = True
+                    break
             
             # Si les pas sont à 0 et qu'il n'y a pas d'objets restaurateurs, déclare la défaite
             if not has_recoverable_items:
@@ -234,7 +280,7 @@ class Mansion:
             target_col = player.col + dc
             
             # Vérifie si la position cible est dans la grille
-            if not (0 <= target_row < config.GRID_ROWS and 0 <= target_col < config.GRID_COLS):
+            if not self.in_bounds(target_row, target_col):
                 continue
             
             # Vérifie si la porte peut être ouverte ou est déjà ouverte
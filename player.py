@@ -3,6 +3,9 @@ Classe du joueur
 """
 import config
 from inventory import Inventory
+from events import EventType
+import loot
+from item import FoodItem, ConsumableItem, ItemId, ITEM_NAMES, PERMANENT_IDS
 
 
 class Player:
@@ -19,6 +22,20 @@ class Player:
         self.inventory = Inventory()
         self.row = row if row is not None else config.ENTRANCE_ROW
         self.col = col if col is not None else config.ENTRANCE_COL
+        # Flux d'événements (EventBus), relié par Game
+        self.events = None
+    
+    def reset(self, row=None, col=None):
+        """
+        Réinitialise le joueur sur place (nouvelle partie), en conservant son flux d'événements
+        
+        Args:
+            row: Position initiale en ligne
+            col: Position initiale en colonne
+        """
+        self.inventory.reset()
+        self.row = row if row is not None else config.ENTRANCE_ROW
+        self.col = col if col is not None else config.ENTRANCE_COL
     
     def move(self, direction, mansion):
         """
@@ -41,7 +58,7 @@ class Player:
         new_col = self.col + dc
         
         # Vérifier les limites de la grille
-        if not (0 <= new_row < config.GRID_ROWS and 0 <= new_col < config.GRID_COLS):
+        if not mansion.in_bounds(new_row, new_col):
             return False, "Ne peut pas se déplacer en dehors de la grille"
         
         # Obtenir la pièce actuelle
@@ -99,7 +116,7 @@ class Player:
         
         # Après avoir confirmé le mouvement, consommer un pas (avant de changer de position)
         # Cela garantit que la consommation du pas est effectuée au bon moment, que ce soit pour une nouvelle pièce ou une pièce explorée
-        if not self.inventory.consume_step():
+        if not self.consume_step():
             return False, "Pas insuffisants, impossible de se déplacer"
         
         # Déplacer la position du joueur (après avoir consommé le pas)
@@ -149,83 +166,71 @@ class Player:
         
         return True, f"Déplacement vers{target_room_actual.name}" + (f"，{effect_message}" if effect_message else "")
     
+    def consume_step(self):
+        """
+        Consomme un pas pour un déplacement
+        
+        Returns:
+            bool: False si aucun pas n'est disponible
+        """
+        if not self.inventory.consume_step():
+            return False
+        if self.events is not None:
+            self.events.emit(EventType.STEPS_SPENT, amount=1, remaining=self.inventory.steps.amount,
+                             cause="déplacement")
+        return True
+    
     def pick_up_item(self, item, mansion):
         """
         Ramasse un objet
         
         Args:
-            item: Objet article ou tuple(item_name, amount)
+            item: Objet article ou récompense typée (loot.Reward)
             mansion: Objet Mansion(utilisé pour retirer l'article de la pièce)
         
         Returns:
             tuple: (Succès du ramassage, Message)
         """
+        success, message = self._pick_up(item, mansion)
+        if success and self.events is not None:
+            if isinstance(item, loot.Reward):
+                name, amount = item.name or ITEM_NAMES[item.kind], item.amount
+            else:
+                name = item.name
+                amount = getattr(item, "amount", getattr(item, "steps_restored", 1))
+            self.events.emit(EventType.ITEM_GAINED, name=name, amount=amount, source="salle")
+        return success, message
+    
+    def _pick_up(self, item, mansion):
+        """Applique le ramassage d'un objet (voir pick_up_item)"""
         current_room = mansion.get_room(self.row, self.col)
         if current_room is None:
             return False, "Il n'y a pas de chambres disponibles à cet emplacement."
         
         # Traiter les différents types d'objets
-        if isinstance(item, tuple):
-            item_name, amount = item
-            if item_name == "pièces":
-                self.inventory.add_coins(amount)
-                return True, f"Ramassé{amount}pièces"
-            elif item_name == "gemmes":
-                self.inventory.add_gems(amount)
-                return True, f"Ramassé{amount}gemmes"
-            elif item_name == "clés":
-                self.inventory.add_keys(amount)
-                return True, f"Ramassé{amount}clés"
-            elif item_name == "dés":
-                self.inventory.add_dice(amount)
-                return True, f"Ramassé{amount}dés"
-            elif item_name == "Article permanent":
-                self.inventory.add_permanent_item(amount)
-                return True, f"Obtenu l'article permanent：{amount}"
-            elif item_name in ["Pomme", "Banane", "Gâteau", "Sandwich", "Grand repas"]:
-                # Nourriture consommée directement
-                from item import FoodItem
-                food_map = {
-                    "Pomme": 2,
-                    "Banane": 3,
-                    "Gâteau": 10,
-                    "Sandwich": 15,
-                    "Grand repas": 25
-                }
-                steps = food_map.get(item_name, 0)
-                self.inventory.add_steps(steps)
-                return True, f"Consommé{item_name},restauré{steps}pas"
-        
-        elif hasattr(item, 'name'):
-            # Objet article
-            if item.name in ["Pomme", "Banane", "Gâteau", "Sandwich", "Grand repas"]:
-                # Nourriture
-                if hasattr(item, 'consume'):
-                    message = item.consume(self)
-                    # Retirer de la pièce
-                    if item in current_room.items:
-                        current_room.items.remove(item)
-                    return True, message
-            elif item.name == "pièces":
-                self.inventory.add_coins(item.amount)
-                if item in current_room.items:
-                    current_room.items.remove(item)
-                return True, f"Ramassé{item.amount}pièces"
-            elif item.name == "gemmes":
-                self.inventory.add_gems(item.amount)
-                if item in current_room.items:
-                    current_room.items.remove(item)
-                return True, f"Ramassé{item.amount}gemmes"
-            elif item.name == "	clés":
-                self.inventory.add_keys(item.amount)
-                if item in current_room.items:
-                    current_room.items.remove(item)
-                return True, f"Ramassé{item.amount}clés"
-            elif item.name == "dés":
-                self.inventory.add_dice(item.amount)
-                if item in current_room.items:
-                    current_room.items.remove(item)
-                return True, f"Ramassé{item.amount}dés"
+        if isinstance(item, loot.Reward):
+            # Récompense typée : ajout par la table de dispatch de l'inventaire
+            self.inventory.add_item(item.kind, item.amount)
+            if item.kind == ItemId.STEPS:
+                return True, f"Consommé{item.name},restauré{item.amount}pas"
+            if item.kind in PERMANENT_IDS:
+                return True, f"Obtenu l'article permanent：{ITEM_NAMES[item.kind]}"
+            return True, f"Ramassé{item.amount}{ITEM_NAMES[item.kind]}"
+        
+        if isinstance(item, FoodItem):
+            # Nourriture
+            message = item.consume(self)
+            # Retirer de la pièce
+            if item in current_room.items:
+                current_room.items.remove(item)
+            return True, message
+        
+        if isinstance(item, ConsumableItem) and item.item_id is not None:
+            # Ressource (pièces, gemmes, clés, dés)
+            self.inventory.add_item(item.item_id, item.amount)
+            if item in current_room.items:
+                current_room.items.remove(item)
+            return True, f"Ramassé{item.amount}{ITEM_NAMES[item.item_id]}"
         
         return False, "Impossible de ramasser cet article"
     
@@ -0,0 +1,165 @@
+"""
+Réserves d'objets réutilisables (salles, portes, objets de salle)
+Les objets libérés par Game.reset et Game.restart sont réinitialisés sur place au lieu d'être
+réalloués : un processus qui enchaîne les parties garde une mémoire stable
+"""
+
+
+class ObjectPool:
+    """Liste libre d'objets d'un même type"""
+
+    def __init__(self, limit=4096):
+        """
+        Initialisation de la réserve
+
+        Args:
+            limit: Nombre maximal d'objets conservés (les suivants sont abandonnés au ramasse-miettes)
+        """
+        self.limit = limit
+        self.free = []
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self):
+        """
+        Obtenir un objet libéré
+
+        Returns:
+            Objet recyclé à réinitialiser, ou None si la réserve est vide (l'appelant en crée un)
+        """
+        if self.free:
+            self.reused += 1
+            return self.free.pop()
+        self.created += 1
+        return None
+
+    def release(self, obj):
+        """Rendre un objet à la réserve"""
+        if len(self.free) < self.limit:
+            self.free.append(obj)
+
+
+# Réserves partagées par toutes les parties du processus
+ROOMS = ObjectPool()
+DOORS = ObjectPool()
+ITEMS = {}  # classe d'objet -> ObjectPool
+
+
+def item_pool(cls):
+    """Obtenir la réserve d'une classe d'objet de salle"""
+    pool = ITEMS.get(cls)
+    if pool is None:
+        pool = ITEMS[cls] = ObjectPool()
+    return pool
+
+
+def new_item(cls, *args):
+    """
+    Créer un objet de salle, recyclé si possible
+
+    Args:
+        cls: Classe de l'objet (ConsumableItem, FoodItem, TreasureChest...)
+        *args: Arguments du constructeur
+
+    Returns:
+        Objet initialisé
+    """
+    item = item_pool(cls).acquire()
+    if item is None:
+        return cls(*args)
+    item.__init__(*args)  # réinitialisation sur place
+    return item
+
+
+def clone_item(item, memo):
+    """
+    Copier un objet de salle (équivalent de copy.deepcopy pour ces objets simples)
+
+    Args:
+        item: Objet à copier (les tuples sont immuables et partagés)
+        memo: Copies déjà faites (id -> copie), pour préserver le partage au sein d'une salle
+
+    Returns:
+        Copie de l'objet
+    """
+    if isinstance(item, tuple):
+        return item
+    copy = memo.get(id(item))
+    if copy is not None:
+        return copy
+    cls = type(item)
+    copy = item_pool(cls).acquire()
+    if copy is None:
+        copy = cls.__new__(cls)
+    state = copy.__dict__
+    for name, value in item.__dict__.items():
+        if isinstance(value, list):
+            # Les listes (contenus des coffres...) ne contiennent que des tuples
+            current = state.get(name)
+            if isinstance(current, list):
+                current[:] = value
+            else:
+                state[name] = list(value)
+        else:
+            state[name] = value
+    memo[id(item)] = copy
+    return copy
+
+
+def clone_effects(effects, memo):
+    """
+    Copier les effets d'une salle : les objets des listes "items" sont copiés,
+    les autres valeurs (booléens, nombres, poids par couleur) ne sont jamais modifiées et sont partagées
+
+    Args:
+        effects: Dictionnaire d'effets
+        memo: Copies déjà faites (voir clone_item)
+
+    Returns:
+        dict: Copie des effets
+    """
+    copy = dict(effects)
+    if "items" in effects:
+        copy["items"] = [dict(entry, item=clone_item(entry["item"], memo)) for entry in effects["items"]]
+    return copy
+
+
+def release_rooms(rooms):
+    """
+    Rendre des salles à la réserve, avec leurs portes et leurs objets
+
+    Une même salle ou un même objet peut apparaître plusieurs fois (salle proposée puis placée,
+    objet d'effet ajouté aux objets de la salle) : chaque objet n'est libéré qu'une fois.
+
+    Args:
+        rooms: Salles qui ne sont plus référencées par aucune partie
+    """
+    seen = set()
+    for room in rooms:
+        if id(room) in seen:
+            continue
+        seen.add(id(room))
+        for door in room.door_objects.values():
+            if id(door) not in seen:
+                seen.add(id(door))
+                DOORS.release(door)
+        room.door_objects.clear()
+        items = list(room.items)
+        items.extend(entry["item"] for entry in room.effects.get("items", ()))
+        for item in items:
+            if not isinstance(item, tuple) and id(item) not in seen:
+                seen.add(id(item))
+                item_pool(type(item)).release(item)
+        ROOMS.release(room)
+
+
+def stats():
+    """
+    Obtenir les compteurs des réserves
+
+    Returns:
+        dict: nom -> (objets créés, objets réutilisés, objets libres)
+    """
+    pools = {"Room": ROOMS, "Door": DOORS}
+    pools.update((cls.__name__, pool) for cls, pool in ITEMS.items())
+    return {name: (pool.created, pool.reused, len(pool.free)) for name, pool in pools.items()}
@@ -0,0 +1,123 @@
+"""
+Moteur de relecture des journaux d'actions
+Reconstruit une partie à l'identique à partir de sa graine et de ses actions, sans rendu,
+avec des instantanés clés périodiques pour se positionner rapidement sur un tour donné
+"""
+import action_log
+import savegame
+from game import Game
+
+
+def _reroll(game, arg):
+    """Relance en restaurant la salle sélectionnée au moment de l'action"""
+    game.selected_room_index = arg
+    game.reroll()
+
+
+# Table de dispatch : code d'action -> application sur la partie
+_HANDLERS = {
+    action_log.MOVE: lambda game, arg: game.move(action_log.DIRECTIONS[arg]),
+    action_log.CHOOSE_ROOM: lambda game, arg: game.choose_room(arg),
+    action_log.REROLL: _reroll,
+    action_log.CANCEL_SELECTION: lambda game, arg: game.cancel_room_selection(),
+    action_log.OPEN_ITEMS: lambda game, arg: game.open_items(),
+    action_log.OPEN_SHOP: lambda game, arg: game.open_shop(),
+    action_log.CLOSE_MENU: lambda game, arg: game.close_menu(),
+    action_log.INTERACT: lambda game, arg: game.interact_item(arg),
+    action_log.BUY: lambda game, arg: game.buy(arg),
+    action_log.RESTART: lambda game, arg: game.restart(),
+    action_log.SNAPSHOT: lambda game, arg: savegame.loads(game, arg),
+}
+
+
+def apply_action(game, action, arg):
+    """
+    Appliquer une action journalisée à une partie
+
+    Args:
+        game: Objet Game
+        action: Code de l'action
+        arg: Argument de l'action
+    """
+    handler = _HANDLERS.get(action)
+    if handler is None:
+        raise ValueError(f"Action inconnue dans le journal : {action}")
+    handler(game, arg)
+
+
+class Replay:
+    """Relecture d'un journal d'actions"""
+
+    def __init__(self, data, keyframe_interval=64):
+        """
+        Initialisation de la relecture
+
+        Args:
+            data: Contenu binaire du journal
+            keyframe_interval: Nombre d'actions entre deux instantanés clés
+        """
+        self.seed, self.records = action_log.read_log(data)
+        _, rows, cols, difficulty = action_log.read_header(data)
+        self.keyframe_interval = keyframe_interval
+        # Profil enregistré dans l'en-tête du journal, et non le profil actif du processus
+        self.game = Game(seed=self.seed, rows=rows, cols=cols, difficulty=difficulty)
+        self.turn = 0
+        # keyframes[i] : sauvegarde après i * keyframe_interval actions
+        self.keyframes = [savegame.dumps(self.game)]
+
+    @classmethod
+    def from_file(cls, path, keyframe_interval=64):
+        """Créer une relecture depuis un fichier journal"""
+        with open(path, "rb") as f:
+            return cls(f.read(), keyframe_interval)
+
+    def __len__(self):
+        return len(self.records)
+
+    def step(self):
+        """
+        Rejouer l'action suivante
+
+        Returns:
+            bool: False si le journal est terminé
+        """
+        if self.turn >= len(self.records):
+            return False
+        action, arg = self.records[self.turn]
+        apply_action(self.game, action, arg)
+        # La boucle principale appelle update() à chaque image, donc entre deux actions
+        self.game.update()
+        self.turn += 1
+        if self.turn % self.keyframe_interval == 0 and self.turn // self.keyframe_interval == len(self.keyframes):
+            self.keyframes.append(savegame.dumps(self.game))
+        return True
+
+    def seek(self, turn):
+        """
+        Se positionner après la N-ième action
+
+        Args:
+            turn: Nombre d'actions à avoir appliquées (borné à la longueur du journal)
+
+        Returns:
+            Objet Game dans l'état correspondant
+        """
+        turn = max(0, min(turn, len(self.records)))
+        # Repartir de l'instantané clé le plus proche s'il évite de rejouer des actions
+        index = min(turn // self.keyframe_interval, len(self.keyframes) - 1)
+        keyframe_turn = index * self.keyframe_interval
+        if turn < self.turn or keyframe_turn > self.turn:
+            savegame.loads(self.game, self.keyframes[index])
+            self.turn = keyframe_turn
+        while self.turn < turn:
+            self.step()
+        return self.game
+
+    def run(self):
+        """
+        Rejouer le journal jusqu'à la fin
+
+        Returns:
+            Objet Game dans l'état final
+        """
+        return self.seek(len(self.records))
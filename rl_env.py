@@ -0,0 +1,621 @@
+"""
+Environnement d'apprentissage par renforcement (compatible Gymnasium)
+BluePrinceEnv expose reset(seed) / step(action) sur une partie sans rendu, avec une observation
+de forme fixe (grille, portes et serrures, inventaire, salles proposées, état) et un masque des
+actions possibles ; BluePrinceVectorEnv fait avancer N parties en un seul appel.
+
+Les observations sont écrites en place : entièrement au début d'un épisode, puis seulement pour les
+cases touchées par l'action (voisinage du joueur et cases signalées par le flux d'événements).
+Les lots de BluePrinceVectorEnv résident en mémoire partagée : des processus de travail y écrivent
+directement, sans copier ni sérialiser les observations.
+
+numpy est requis ; gymnasium est facultatif (espaces d'observation et d'action, classe de base Env).
+"""
+import multiprocessing
+import random
+from multiprocessing import shared_memory
+import action_log
+import config
+import difficulty
+from events import EventType
+from game import Game, GameState
+from item import ItemId
+from replay import apply_action
+from savegame import get_prototypes
+from simulation import legal_actions
+
+try:
+    import numpy as np
+except ImportError:  # numpy est nécessaire pour construire les observations
+    np = None
+
+try:
+    import gymnasium
+    from gymnasium import spaces
+except ImportError:  # gymnasium est optionnel : mêmes méthodes, sans espaces déclarés
+    gymnasium = None
+    spaces = None
+
+
+# Tailles fixes des parties variables de l'observation et des actions
+MAX_OFFERED = 3
+MAX_ITEMS = 8
+MAX_SHOP_ITEMS = 8
+
+# Récompenses
+VICTORY_REWARD = 1.0
+DEFEAT_REWARD = -1.0
+ROOM_REWARD = 0.01
+INVALID_ACTION_PENALTY = -0.01
+
+DEFAULT_MAX_STEPS = 1000
+
+# Table des actions discrètes : index -> (code de action_log, argument) ; None : salle sélectionnée
+ACTIONS = (
+    [(action_log.MOVE, code) for code in range(len(action_log.DIRECTIONS))]
+    + [(action_log.CHOOSE_ROOM, index) for index in range(MAX_OFFERED)]
+    + [(action_log.REROLL, None), (action_log.CANCEL_SELECTION, 0), (action_log.OPEN_ITEMS, 0),
+       (action_log.OPEN_SHOP, 0), (action_log.CLOSE_MENU, 0)]
+    + [(action_log.INTERACT, index) for index in range(MAX_ITEMS)]
+    + [(action_log.BUY, index) for index in range(MAX_SHOP_ITEMS)]
+)
+ACTION_INDEX = {action: index for index, action in enumerate(ACTIONS)}
+
+_STATES = (GameState.PLAYING, GameState.SELECTING_ROOM, GameState.SELECTING_DIRECTION,
+           GameState.GAME_OVER, GameState.SHOP, GameState.PICKING_ITEMS)
+_STATE_CODES = {state: code for code, state in enumerate(_STATES)}
+_COLORS = ("YELLOW", "GREEN", "PURPLE", "ORANGE", "RED", "BLUE")
+_COLOR_CODES = {color: code + 1 for code, color in enumerate(_COLORS)}
+_DIRECTION_CODES = action_log.DIRECTION_CODES
+
+# Canaux de la grille
+GRID_CHANNELS = ("room", "color", "rarity", "doors", "opened", "locks", "flags")
+_FLAG_EXPLORED = 1
+_FLAG_PLAYER = 2
+
+
+def _room_codes():
+    """Codes des salles par nom (0 : case vide ; ordre du catalogue)"""
+    return {name: code + 1 for code, name in enumerate(get_prototypes())}
+
+
+class _EpisodeSink:
+    """
+    Récepteur d'événements d'une étape : récompense, cases du manoir touchées (salle placée,
+    porte ouverte) et nouveau tirage de salles, pour la mise à jour incrémentale de l'observation
+    """
+
+    def __init__(self):
+        self.reward = 0.0
+        self.victory = None
+        self.cells = set()
+        self.drawn = False
+
+    def write(self, event):
+        event_type = event.type
+        if event_type is EventType.ROOM_PLACED:
+            self.reward += ROOM_REWARD
+            self.cells.add((event.data["row"], event.data["col"]))
+        elif event_type is EventType.DOOR_OPENED:
+            self.cells.add((event.data["row"], event.data["col"]))
+        elif event_type is EventType.ROOM_DRAWN:
+            self.drawn = True
+        elif event_type is EventType.GAME_ENDED:
+            self.victory = event.data["victory"]
+            self.reward += VICTORY_REWARD if self.victory else DEFEAT_REWARD
+
+    def clear(self):
+        self.reward = 0.0
+        self.cells.clear()
+        self.drawn = False
+
+    def close(self):
+        pass
+
+
+def observation_shapes(rows=None, cols=None):
+    """
+    Formes et types des tableaux de l'observation
+
+    Args:
+        rows: Nombre de lignes du manoir (config.GRID_ROWS par défaut)
+        cols: Nombre de colonnes du manoir (config.GRID_COLS par défaut)
+
+    Returns:
+        dict: nom -> (forme, dtype)
+    """
+    rows = config.GRID_ROWS if rows is None else rows
+    cols = config.GRID_COLS if cols is None else cols
+    return {
+        "grid": ((rows, cols, len(GRID_CHANNELS)), np.int16),
+        "inventory": ((max(ItemId) + 1,), np.int32),
+        "offered": ((MAX_OFFERED, 4), np.int16),
+        "status": ((4,), np.int16),
+    }
+
+
+def observation_spaces(rows=None, cols=None):
+    """Espaces gymnasium de l'observation (gymnasium requis)"""
+    shapes = observation_shapes(rows, cols)
+    bounds = {"grid": (0, 255), "inventory": (0, np.iinfo(np.int32).max), "offered": (0, 255),
+              "status": (-1, max(shapes["grid"][0][0], shapes["grid"][0][1], len(_STATES)))}
+    return {name: spaces.Box(bounds[name][0], bounds[name][1], shape, dtype)
+            for name, (shape, dtype) in shapes.items()}
+
+
+_EnvBase = gymnasium.Env if gymnasium is not None else object
+
+
+class BluePrinceEnv(_EnvBase):
+    """
+    Partie sans rendu exposée comme environnement d'apprentissage
+
+    L'observation et le masque des actions sont écrits dans des tableaux réutilisés d'une étape à
+    l'autre (voir bind) : copier l'observation pour la conserver au-delà de l'étape suivante.
+    """
+
+    metadata = {"render_modes": []}
+
+    def __init__(self, rows=None, cols=None, difficulty_name=None, max_steps=DEFAULT_MAX_STEPS):
+        """
+        Initialisation de l'environnement
+
+        Args:
+            rows: Nombre de lignes du manoir (config.GRID_ROWS par défaut)
+            cols: Nombre de colonnes du manoir (config.GRID_COLS par défaut)
+            difficulty_name: Profil de difficulté (profil actif par défaut)
+            max_steps: Nombre d'étapes avant troncature de l'épisode
+        """
+        if np is None:
+            raise ImportError("numpy est requis pour l'environnement d'apprentissage")
+        self.max_steps = max_steps
+        self.game = Game(0, rows, cols, difficulty_name)
+        self.rows, self.cols = self.game.mansion.rows, self.game.mansion.cols
+        self.rng_state = random.getstate()
+        self.room_codes = _room_codes()
+        self.sink = self.game.events.subscribe(_EpisodeSink())
+        self.steps = 0
+        self._seeds = random.Random()
+        self.bind(self.empty_observation(), np.zeros(len(ACTIONS), dtype=bool))
+        if spaces is not None:
+            self.action_space = spaces.Discrete(len(ACTIONS))
+            self.observation_space = spaces.Dict(observation_spaces(self.rows, self.cols))
+
+    def observation_shapes(self):
+        """Formes et types des tableaux de l'observation (nom -> (forme, dtype))"""
+        return observation_shapes(self.rows, self.cols)
+
+    def empty_observation(self):
+        """Allouer une observation vide"""
+        return {name: np.zeros(shape, dtype) for name, (shape, dtype) in self.observation_shapes().items()}
+
+    def bind(self, observation, mask):
+        """
+        Choisir les tableaux où écrire l'observation et le masque des actions (par exemple une
+        tranche d'un lot en mémoire partagée), puis les remplir entièrement
+
+        Args:
+            observation: dict de tableaux aux formes de observation_shapes
+            mask: Tableau booléen de len(ACTIONS) éléments
+        """
+        self.observation = observation
+        self.mask = mask
+        self.write_observation(observation)
+        self.action_mask(mask)
+
+    def _run(self, func):
+        """Exécuter func avec le générateur et le profil de difficulté de cette partie"""
+        random.setstate(self.rng_state)
+        difficulty.set_profile(self.game.difficulty)
+        try:
+            return func()
+        finally:
+            self.rng_state = random.getstate()
+
+    def reset(self, seed=None, options=None):
+        """
+        Commencer un nouvel épisode
+
+        Args:
+            seed: Graine de la partie (tirée au hasard si None)
+            options: Inutilisé (compatibilité gymnasium)
+
+        Returns:
+            tuple: (observation, info) ; info["action_mask"] contient le masque des actions
+        """
+        if seed is None:
+            seed = self._seeds.randrange(1000000)
+        else:
+            self._seeds.seed(seed)
+        difficulty.set_profile(self.game.difficulty)
+        self.game.reset(seed)
+        self.rng_state = random.getstate()
+        self.steps = 0
+        self.sink.clear()
+        self.sink.victory = None
+        self.write_observation(self.observation)
+        self.action_mask(self.mask)
+        return self.observation, {"action_mask": self.mask, "seed": seed}
+
+    def step(self, action):
+        """
+        Jouer une action
+
+        Args:
+            action: Index dans ACTIONS (une action masquée est ignorée et pénalisée)
+
+        Returns:
+            tuple: (observation, récompense, terminé, tronqué, info)
+        """
+        invalid = not (0 <= action < len(ACTIONS)) or not self.mask[action]
+        if invalid:
+            reward = INVALID_ACTION_PENALTY
+        else:
+            game = self.game
+            code, arg = ACTIONS[action]
+            if arg is None:
+                arg = game.selected_room_index
+            position, offered = (game.player.row, game.player.col), list(game.available_rooms)
+
+            def play():
+                apply_action(game, code, arg)
+                game.update()
+            self._run(play)
+            reward = self.sink.reward
+            self._write_changes(position, offered)
+            self.action_mask(self.mask)
+        self.steps += 1
+        terminated = self.game.state == GameState.GAME_OVER
+        truncated = not terminated and self.steps >= self.max_steps
+        info = {"action_mask": self.mask, "invalid": invalid, "victory": self.sink.victory}
+        self.sink.clear()
+        return self.observation, reward, terminated, truncated, info
+
+    def action_mask(self, out=None):
+        """
+        Masque des actions possibles (tableau booléen aligné sur ACTIONS, écrit dans out s'il est fourni)
+
+        Les actions légales de l'état courant sont filtrées par ce qui peut réussir :
+        porte ouvrable (Door.can_open) et case dans la grille, gemmes suffisantes pour la salle
+        proposée, pièces suffisantes pour l'article, dé disponible pour relancer.
+        """
+        game = self.game
+        if out is None:
+            mask = np.zeros(len(ACTIONS), dtype=bool)
+        else:
+            mask = out
+            mask[:] = False
+        legal = legal_actions(game)
+        player, inventory, mansion = game.player, game.player.inventory, game.mansion
+        room = game.get_current_room()
+        for code, arg in legal:
+            if code == action_log.REROLL:
+                index = ACTION_INDEX[(code, None)]
+            else:
+                index = ACTION_INDEX.get((code, arg))
+                if index is None:
+                    continue
+            if code == action_log.MOVE:
+                direction = action_log.DIRECTIONS[arg]
+                dr, dc = config.DIRECTIONS[direction]
+                door = room.door_objects[direction]
+                if not mansion.in_bounds(player.row + dr, player.col + dc):
+                    continue
+                if not door.opened and not door.can_open(player)[0]:
+                    continue
+            elif code == action_log.CHOOSE_ROOM:
+                if not inventory.gems.has(game.available_rooms[arg].gem_cost):
+                    continue
+            elif code == action_log.BUY:
+                if inventory.coins.amount < room.effects["items"][arg].get("price", 0):
+                    continue
+            mask[index] = True
+        if not mask.any():
+            # Aucune action ne peut réussir : les actions légales restent proposées
+            for code, arg in legal:
+                index = ACTION_INDEX.get((code, None if code == action_log.REROLL else arg))
+                if index is not None:
+                    mask[index] = True
+        return mask
+
+    def write_observation(self, observation):
+        """
+        Écrire entièrement l'observation courante dans des tableaux existants
+        (les étapes ne réécrivent ensuite que ce qui a changé, voir _write_changes)
+        """
+        game = self.game
+        grid = observation["grid"]
+        grid[...] = 0
+        for (row, col), room in game.mansion.rooms.items():
+            self._write_cell(grid, row, col, room)
+        player = game.player
+        if game.mansion.in_bounds(player.row, player.col):
+            grid[player.row, player.col, 6] |= _FLAG_PLAYER
+        observation["inventory"][:] = player.inventory.counts
+        self._write_offered(observation["offered"])
+        observation["status"][:] = (_STATE_CODES[game.state], game.selected_room_index, player.row, player.col)
+
+    def _write_cell(self, grid, row, col, room):
+        """Écrire les canaux d'une case (sans le drapeau du joueur)"""
+        if room is None:
+            grid[row, col] = 0
+            return
+        doors = opened = locks = 0
+        for direction, door in room.door_objects.items():
+            code = _DIRECTION_CODES[direction]
+            doors |= 1 << code
+            locks |= door.lock_level << (2 * code)
+            if door.opened:
+                opened |= 1 << code
+        grid[row, col] = (self.room_codes.get(room.name, len(self.room_codes) + 1), _COLOR_CODES.get(room.color, 0),
+                          room.rarity, doors, opened, locks, _FLAG_EXPLORED if room.explored else 0)
+
+    def _write_offered(self, offered):
+        room_codes = self.room_codes
+        offered[...] = 0
+        for index, room in enumerate(self.game.available_rooms[:MAX_OFFERED]):
+            doors = 0
+            for direction in room.doors:
+                doors |= 1 << _DIRECTION_CODES[direction]
+            offered[index] = (room_codes.get(room.name, len(room_codes) + 1), _COLOR_CODES.get(room.color, 0),
+                              room.gem_cost, doors)
+
+    def _write_changes(self, position, offered):
+        """
+        Mettre à jour l'observation après une action, sans parcourir tout le manoir
+
+        Une action ne modifie que les cases voisines de la position du joueur avant et après
+        l'action (déplacement d'une case, salle placée, portes ouvertes des deux côtés) ;
+        les cases signalées par les événements sont réécrites elles aussi.
+
+        Args:
+            position: Position du joueur avant l'action
+            offered: Salles proposées avant l'action
+        """
+        game = self.game
+        player = game.player
+        rows, cols = self.rows, self.cols
+        cells = self.sink.cells
+        for row, col in (position, (player.row, player.col)):
+            cells.update(((row, col), (row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)))
+        observation = self.observation
+        grid = observation["grid"]
+        rooms = game.mansion.rooms
+        for row, col in cells:
+            if 0 <= row < rows and 0 <= col < cols:
+                self._write_cell(grid, row, col, rooms.get((row, col)))
+        if 0 <= player.row < rows and 0 <= player.col < cols:
+            grid[player.row, player.col, 6] |= _FLAG_PLAYER
+        observation["inventory"][:] = player.inventory.counts
+        if self.sink.drawn or offered != game.available_rooms:
+            self._write_offered(observation["offered"])
+        observation["status"][:] = (_STATE_CODES[game.state], game.selected_room_index, player.row, player.col)
+
+
+def _layout(shapes, num_envs):
+    """
+    Disposition d'un lot d'environnements dans un bloc de mémoire
+
+    Returns:
+        tuple: (nom -> (forme, dtype, décalage), taille totale en octets)
+    """
+    fields = {name: ((num_envs,) + shape, np.dtype(dtype)) for name, (shape, dtype) in shapes.items()}
+    # Dernière observation des épisodes terminés, copiée avant la remise à zéro automatique
+    fields.update({"final_" + name: field for name, field in fields.items()})
+    fields.update(
+        action_mask=((num_envs, len(ACTIONS)), np.dtype(bool)),
+        reward=((num_envs,), np.dtype(np.float32)),
+        terminated=((num_envs,), np.dtype(bool)),
+        truncated=((num_envs,), np.dtype(bool)),
+        actions=((num_envs,), np.dtype(np.int64)),
+    )
+    layout = {}
+    size = 0
+    for name, (shape, dtype) in fields.items():
+        size = -(-size // 8) * 8
+        layout[name] = (shape, dtype, size)
+        size += int(np.prod(shape)) * dtype.itemsize
+    return layout, max(size, 1)
+
+
+class SharedBatch:
+    """
+    Lot d'observations, de masques, de récompenses et d'actions de N environnements dans un seul
+    bloc de mémoire partagée : les tableaux numpy sont des vues sur le bloc, lisibles par tous les
+    processus qui l'ouvrent par son nom, sans sérialisation ni copie
+    """
+
+    def __init__(self, shapes, num_envs, name=None):
+        """
+        Créer le bloc, ou ouvrir un bloc existant si name est fourni
+
+        Args:
+            shapes: Formes de l'observation d'un environnement (observation_shapes)
+            num_envs: Nombre d'environnements
+            name: Nom d'un bloc déjà créé par un autre processus
+        """
+        layout, size = _layout(shapes, num_envs)
+        self.owner = name is None
+        self.memory = shared_memory.SharedMemory(name=name, create=self.owner, size=size if self.owner else 0)
+        self.arrays = {field: np.ndarray(shape, dtype, buffer=self.memory.buf, offset=offset)
+                       for field, (shape, dtype, offset) in layout.items()}
+        self.observations = {field: self.arrays[field] for field in shapes}
+        self.final_observations = {field: self.arrays["final_" + field] for field in shapes}
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    def observation(self, index):
+        """Vues de l'observation de l'environnement index"""
+        return {field: batch[index] for field, batch in self.observations.items()}
+
+    def close(self):
+        """Fermer le bloc (et le détruire si ce processus l'a créé)"""
+        self.arrays = self.observations = self.final_observations = {}
+        try:
+            self.memory.close()
+        except BufferError:
+            # Des vues sont encore référencées : le bloc est libéré avec elles
+            pass
+        if self.owner:
+            self.memory.unlink()
+            self.owner = False
+
+
+def _step_envs(envs, batch, start):
+    """
+    Jouer l'action de chaque environnement (batch.arrays["actions"]) ; les parties finies recommencent,
+    après copie de leur dernière observation dans batch.final_observations
+    """
+    arrays = batch.arrays
+    actions, rewards = arrays["actions"], arrays["reward"]
+    terminated, truncated = arrays["terminated"], arrays["truncated"]
+    for index, env in enumerate(envs, start):
+        _, rewards[index], terminated[index], truncated[index], _ = env.step(int(actions[index]))
+        if terminated[index] or truncated[index]:
+            for field, final in batch.final_observations.items():
+                final[index] = batch.observations[field][index]
+            env.reset()
+
+
+def _worker(name, shapes, num_envs, start, stop, env_args, connection):
+    """Processus hébergeant les environnements [start, stop) d'un lot partagé"""
+    batch = SharedBatch(shapes, num_envs, name)
+    envs = []
+    for index in range(start, stop):
+        env = BluePrinceEnv(*env_args)
+        env.bind(batch.observation(index), batch.arrays["action_mask"][index])
+        envs.append(env)
+    try:
+        while True:
+            command, arg = connection.recv()
+            if command == "step":
+                _step_envs(envs, batch, start)
+            elif command == "reset":
+                for index, env in enumerate(envs, start):
+                    env.reset(None if arg is None else arg + index)
+            else:
+                break
+            connection.send(None)
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        envs.clear()
+        batch.close()
+        connection.close()
+
+
+class BluePrinceVectorEnv:
+    """
+    N environnements avancés en un seul appel, observations écrites en place dans des lots préalloués
+
+    Avec num_workers > 0, les parties sont réparties entre des processus qui écrivent directement
+    dans un lot en mémoire partagée (SharedBatch) : seules les commandes passent par les tubes.
+    Les tableaux renvoyés sont réutilisés d'un appel à l'autre.
+    """
+
+    def __init__(self, num_envs, rows=None, cols=None, difficulty_name=None, max_steps=DEFAULT_MAX_STEPS,
+                 num_workers=0):
+        """
+        Initialisation
+
+        Args:
+            num_envs: Nombre de parties
+            rows, cols, difficulty_name, max_steps: voir BluePrinceEnv
+            num_workers: Nombre de processus (0 : toutes les parties dans ce processus)
+        """
+        if np is None:
+            raise ImportError("numpy est requis pour l'environnement d'apprentissage")
+        self.num_envs = num_envs
+        shapes = observation_shapes(rows, cols)
+        self.batch = SharedBatch(shapes, num_envs)
+        self.observations = self.batch.observations
+        self.action_masks = self.batch.arrays["action_mask"]
+        self.envs = []
+        self.workers = []
+        env_args = (rows, cols, difficulty_name, max_steps)
+        if num_workers <= 0:
+            for index in range(num_envs):
+                env = BluePrinceEnv(*env_args)
+                env.bind(self.batch.observation(index), self.action_masks[index])
+                self.envs.append(env)
+        else:
+            num_workers = min(num_workers, num_envs)
+            bounds = [num_envs * worker // num_workers for worker in range(num_workers + 1)]
+            for start, stop in zip(bounds, bounds[1:]):
+                parent, child = multiprocessing.Pipe()
+                process = multiprocessing.Process(
+                    target=_worker, args=(self.batch.name, shapes, num_envs, start, stop, env_args, child), daemon=True)
+                process.start()
+                child.close()
+                self.workers.append((process, parent))
+        if spaces is not None:
+            self.single_action_space = spaces.Discrete(len(ACTIONS))
+            self.single_observation_space = spaces.Dict(observation_spaces(rows, cols))
+
+    def _command(self, command, arg=None):
+        for _, connection in self.workers:
+            connection.send((command, arg))
+        for _, connection in self.workers:
+            connection.recv()
+
+    def reset(self, seed=None):
+        """
+        Commencer un épisode dans chaque partie (graines seed, seed + 1, ... si seed est fourni)
+
+        Returns:
+            tuple: (observations en lot, info avec "action_mask")
+        """
+        if self.workers:
+            self._command("reset", seed)
+        for index, env in enumerate(self.envs):
+            env.reset(None if seed is None else seed + index)
+        return self.observations, {"action_mask": self.action_masks}
+
+    def step(self, actions):
+        """
+        Jouer une action dans chaque partie ; les parties terminées recommencent aussitôt
+
+        Args:
+            actions: Index d'action de chaque partie
+
+        Returns:
+            tuple: (observations, récompenses, terminés, tronqués, info) en lots ; pour les parties
+                   terminées, observations est déjà celle du nouvel épisode et la dernière observation
+                   de l'épisode terminé est dans info["final_observation"] (convention Gymnasium :
+                   tableau d'objets, None pour les autres parties, masque dans info["_final_observation"])
+        """
+        arrays = self.batch.arrays
+        arrays["actions"][:] = actions
+        if self.workers:
+            self._command("step")
+        else:
+            _step_envs(self.envs, self.batch, 0)
+        info = {"action_mask": self.action_masks}
+        done = arrays["terminated"] | arrays["truncated"]
+        if done.any():
+            # Copies : le lot des dernières observations est réécrit à la fin d'épisode suivante
+            final = np.full(self.num_envs, None, dtype=object)
+            for index in np.flatnonzero(done):
+                final[index] = {field: batch[index].copy() for field, batch in self.batch.final_observations.items()}
+            info["final_observation"] = final
+            info["_final_observation"] = done
+        return self.observations, arrays["reward"], arrays["terminated"], arrays["truncated"], info
+
+    def close(self):
+        """Arrêter les processus et libérer la mémoire partagée"""
+        for process, connection in self.workers:
+            try:
+                connection.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+            connection.close()
+        for process, _ in self.workers:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self.workers = []
+        self.envs = []
+        self.observations = self.action_masks = None
+        self.batch.close()
@@ -2,9 +2,75 @@
 Définition de la classe Room
 """
 import random
-from item import FoodItem, TreasureChest, DiggingSpot, Locker, ConsumableItem
-from door import Door
+from collections import OrderedDict
+from door import Door, roll_lock_levels
+from events import EventType
 import config
+import difficulty
+import loot
+import pool
+
+
+# Masques de légalité par modèle et taille de grille (un bit par case, index row * cols + col) :
+#   (id de la condition, portes, lignes, colonnes) -> (condition, masque des cases légales, masque de la condition)
+# Cache LRU : au-delà de PLACEMENT_MASK_CACHE_SIZE entrées (catalogues ou tailles de grille successifs),
+# les masques les moins récemment utilisés sont oubliés
+PLACEMENT_MASK_CACHE_SIZE = 512
+_PLACEMENT_MASKS = OrderedDict()
+
+
+def static_condition(condition):
+    """
+    Marquer une condition de placement comme ne dépendant que de la case et de la taille de la grille
+    (elle est alors précalculée en masque de cases ; les autres conditions sont évaluées à chaque tirage)
+    
+    Args:
+        condition: Prédicat (row, col, mansion) -> bool
+    
+    Returns:
+        La condition, marquée
+    """
+    condition.static = True
+    return condition
+
+
+def placement_masks(condition, doors, mansion):
+    """
+    Obtenir les masques de légalité d'un modèle (calculés une seule fois par condition, portes et taille de grille)
+    
+    Args:
+        condition: Condition de placement statique (ou None)
+        doors: Directions des portes
+        mansion: Manoir (seules ses dimensions sont utilisées par les conditions statiques)
+    
+    Returns:
+        tuple: (cases légales une fois la grille entamée, cases où la condition est satisfaite),
+               en bytes à un bit par case
+    """
+    rows, cols = mansion.rows, mansion.cols
+    doors = tuple(doors)
+    key = (id(condition), doors, rows, cols)
+    cached = _PLACEMENT_MASKS.get(key)
+    if cached is not None and cached[0] is condition:
+        _PLACEMENT_MASKS.move_to_end(key)
+        return cached[1], cached[2]
+    size = (rows * cols + 7) // 8
+    legal, satisfied = bytearray(size), bytearray(size)
+    offsets = [config.DIRECTIONS[direction] for direction in doors]
+    for row in range(rows):
+        for col in range(cols):
+            if condition is not None and not condition(row, col, mansion):
+                continue
+            index = row * cols + col
+            satisfied[index >> 3] |= 1 << (index & 7)
+            if all(0 <= row + dr < rows and 0 <= col + dc < cols for dr, dc in offsets):
+                legal[index >> 3] |= 1 << (index & 7)
+    masks = (bytes(legal), bytes(satisfied))
+    _PLACEMENT_MASKS[key] = (condition,) + masks
+    _PLACEMENT_MASKS.move_to_end(key)
+    while len(_PLACEMENT_MASKS) > PLACEMENT_MASK_CACHE_SIZE:
+        _PLACEMENT_MASKS.popitem(last=False)
+    return masks
 
 
 class Room:
@@ -46,31 +112,107 @@ class Room:
         
         # Si elle a été explorée
         self.explored = False
+        
+        # Masques de légalité de la salle (voir can_place_at), recalculés si la grille ou les portes changent
+        self._placement = None
     
-    def set_position(self, row, col):
-        """Définir la position de la salle dans la grille"""
-        # Sauvegarder l'état des portes ouvertes
-        opened_doors = set()
-        if hasattr(self, 'door_objects') and self.door_objects:
-            for direction, door in self.door_objects.items():
-                if door.opened:
-                    opened_doors.add(direction)
+    @classmethod
+    def acquire(cls, name, color="BLUE", rarity=0, gem_cost=0,
+                doors=None, items=None, effects=None, placement_condition=None,
+                image_path=None):
+        """Obtenir une salle, recyclée depuis la réserve si possible (mêmes arguments que le constructeur)"""
+        room = pool.ROOMS.acquire()
+        if room is None:
+            return cls(name, color, rarity, gem_cost, doors, items, effects, placement_condition, image_path)
+        room.reset(name, color, rarity, gem_cost, doors, items, effects, placement_condition, image_path)
+        return room
+    
+    def reset(self, name, color="BLUE", rarity=0, gem_cost=0,
+              doors=None, items=None, effects=None, placement_condition=None,
+              image_path=None):
+        """Réinitialiser la salle sur place en réutilisant ses listes (mêmes arguments que le constructeur)"""
+        self.name = name
+        self.color = color
+        self.rarity = rarity
+        self.gem_cost = gem_cost
+        self.doors[:] = doors or ()
+        self.items[:] = items or ()
+        self.effects = effects or {}
+        self.placement_condition = placement_condition
+        self.image_path = image_path
+        self.row = None
+        self.col = None
+        self.door_objects.clear()
+        self.explored = False
+        self._placement = None
+    
+    def clone(self):
+        """
+        Copier la salle (portes et objets compris), à partir d'objets recyclés si possible
+        
+        Returns:
+            Objet Room indépendant de l'original
+        """
+        memo = {}
+        room = Room.acquire(
+            self.name, self.color, self.rarity, self.gem_cost, list(self.doors),
+            [pool.clone_item(item, memo) for item in self.items],
+            pool.clone_effects(self.effects, memo) if self.effects else None,
+            self.placement_condition, self.image_path
+        )
+        room.row = self.row
+        room.col = self.col
+        room.explored = self.explored
+        for direction, door in self.door_objects.items():
+            copy = Door.acquire(direction, door.lock_level)
+            copy.opened = door.opened
+            room.door_objects[direction] = copy
+        return room
+    
+    def set_position(self, row, col, grid_rows=None):
+        """
+        Définir la position de la salle dans la grille
         
+        Les objets porte existants sont conservés (avec leur état ouvert) ; leurs serrures
+        ne sont tirées à nouveau que si la salle change de ligne.
+        
+        Args:
+            row: Position de la ligne
+            col: Position de la colonne
+            grid_rows: Nombre de lignes de la grille (config.GRID_ROWS par défaut), pour les serrures
+        """
+        moved = row != self.row
         self.row = row
         self.col = col
-        # Créer les objets porte
-        self._create_doors()
-        
-        # Restaurer l'état des portes ouvertes
-        for direction in opened_doors:
-            if direction in self.door_objects:
-                self.door_objects[direction].opened = True
+        door_objects = self.door_objects
+        if len(door_objects) == len(self.doors) and all(direction in door_objects for direction in self.doors):
+            if moved:
+                levels = roll_lock_levels(row, len(self.doors), grid_rows)
+                for direction, level in zip(self.doors, levels):
+                    door_objects[direction].lock_level = level
+        else:
+            # Créer les objets porte, en conservant l'état des portes déjà ouvertes
+            opened_doors = {direction for direction, door in door_objects.items() if door.opened}
+            self._create_doors(grid_rows)
+            for direction in opened_doors:
+                if direction in door_objects:
+                    door_objects[direction].opened = True
     
-    def _create_doors(self):
-        """Créer des objets Door en fonction des directions des portes"""
-        self.door_objects = {}
-        for direction in self.doors:
-            self.door_objects[direction] = Door(direction, row=self.row)
+    def _create_doors(self, grid_rows=None):
+        """Créer des objets Door en fonction des directions des portes (les anciens objets sont réinitialisés sur place)"""
+        door_objects = self.door_objects
+        spare = list(door_objects.values())
+        door_objects.clear()
+        levels = roll_lock_levels(self.row, len(self.doors), grid_rows)
+        for direction, level in zip(self.doors, levels):
+            if spare:
+                door = spare.pop()
+                door.reset(direction, level)
+            else:
+                door = Door.acquire(direction, level)
+            door_objects[direction] = door
+        for door in spare:
+            pool.DOORS.release(door)
     
     def can_place_at(self, row, col, mansion):
         """
@@ -84,16 +226,32 @@ class Room:
         Returns:
             tuple: (peut_placer, raison)
         """
+        condition = self.placement_condition
+        rows, cols = mansion.rows, mansion.cols
+        if 0 <= row < rows and 0 <= col < cols and (condition is None or getattr(condition, "static", False)):
+            # Légalité précalculée par case : seul le cas de la grille vide dépend de l'état
+            cached = self._placement
+            if cached is None or cached[0] != rows or cached[1] != cols or cached[2] is not condition:
+                cached = self._placement = (rows, cols, condition) + placement_masks(condition, self.doors, mansion)
+            index = row * cols + col
+            if cached[3][index >> 3] >> (index & 7) & 1:
+                return True, "Peut être placée"
+            if not cached[4][index >> 3] >> (index & 7) & 1:
+                return False, "Ne satisfait pas la condition de placement de la salle"
+            if mansion.count_explored_rooms() == 0:
+                return True, "Peut être placée"
+            return False, "La porte ne peut pas mener hors de la grille"
+        
         # Vérifier la condition de placement
-        if self.placement_condition:
-            if not self.placement_condition(row, col, mansion):
+        if condition:
+            if not condition(row, col, mansion):
                 return False, "Ne satisfait pas la condition de placement de la salle"
         
         # Vérifier les bordures
         for direction in self.doors:
             dr, dc = config.DIRECTIONS[direction]
             new_row, new_col = row + dr, col + dc
-            if not (0 <= new_row < config.GRID_ROWS and 0 <= new_col < config.GRID_COLS):
+            if not (0 <= new_row < rows and 0 <= new_col < cols):
                 # La porte mène hors de la grille, vérifier si elle est connectée à une salle existante
                 # Si c'est la première salle, autoriser
                 if mansion.count_explored_rooms() == 0:
@@ -110,57 +268,19 @@ class Room:
         Args:
             inventory: Objet Inventory, utilisé pour considérer les effets des objets permanents
         """
-        base_probability = inventory.get_item_find_probability()
-        key_coin_prob = inventory.get_key_coin_probability()
-        
-        # Générer des objets en fonction de la couleur de la salle
-        if self.color == "GREEN":
-            # Salle VERTE : Forte probabilité de contenir des gemmes, des points à creuser, des objets permanents
-            if random.random() < 0.6 * base_probability:
-                self.items.append(ConsumableItem("Gemme", random.randint(1, 3)))
-            if random.random() < 0.4 * base_probability:
-                self.items.append(DiggingSpot())
-            if random.random() < 0.1 * base_probability:
-                permanent_items = ["Pelle", "Marteau", "Kit de crochetage", "Détecteur de métaux", "Patte de lapin porte-bonheur"]
-                self.items.append(("Objet Permanent", random.choice(permanent_items)))
-        
-        elif self.color == "YELLOW":
-            # Salle JAUNE (Magasin) : Contient généralement des pièces d'or
-            if random.random() < 0.5:
-                self.items.append(ConsumableItem("Pièces d'or", random.randint(10, 30)))
-        
-        elif self.color == "PURPLE":
-            # Salle VIOLETTE (Chambre) : Peut contenir de la nourriture
-            if random.random() < 0.5 * base_probability:
-                foods = [
-                    FoodItem("Pomme", 2),
-                    FoodItem("Banane", 3),
-                    FoodItem("Gâteau", 10)
-                ]
-                self.items.append(random.choice(foods))
-        
-        elif self.color == "BLUE":
-            # Salle BLEUE : Objets divers
-            if random.random() < 0.3 * key_coin_prob:
-                self.items.append(ConsumableItem("Clé", random.randint(1, 2)))
-            if random.random() < 0.3 * key_coin_prob:
-                self.items.append(ConsumableItem("Pièces d'or", random.randint(5, 15)))
-            if random.random() < 0.2 * base_probability:
-                self.items.append(ConsumableItem("Gemme", 1))
-            if random.random() < 0.1 * base_probability:
-                self.items.append(TreasureChest())
-        
-        # Génération d'objets pour les salles spéciales (définie dans rooms_data.py)
-        # Note : Les articles du magasin (quand effects["shop"] est True) ne doivent pas être générés comme des objets à ramasser
-        if "items" in self.effects and not self.effects.get("shop"):
-            for item_spec in self.effects["items"]:
-                # Vérifier s'il y a un champ "probability" (les articles du magasin n'en ont pas, seulement les objets de salle spéciale)
-                if "probability" in item_spec:
-                    if random.random() < item_spec.get("probability", 1.0) * base_probability:
-                        self.items.append(item_spec["item"])
-                else:
-                    # Pas de champ "probability", ajouter directement (peut être un autre type de définition d'objet)
-                    pass
+        profile = difficulty.active()
+        scales = loot.multipliers(inventory)
+        
+        # Générer des objets en fonction de la couleur de la salle (tables du profil de difficulté)
+        table = profile.room_items.get(self.color)
+        if table:
+            self.items.extend(loot.roll(table, scales))
+        
+        # Objets des salles spéciales (table effects["loot"] compilée par rooms_data, jamais pour une boutique),
+        # tirés avec le facteur de probabilité du profil
+        special = self.effects.get("loot")
+        if special:
+            self.items.extend(loot.roll(profile.special_items(special), scales))
     
     def apply_effect(self, player, mansion):
         """
@@ -180,6 +300,9 @@ class Room:
         if self.color == "RED" and "lose_steps" in self.effects:
             steps_lost = self.effects["lose_steps"]
             player.inventory.steps.remove(min(steps_lost, player.inventory.steps.amount))
+            if player.events is not None:
+                player.events.emit(EventType.STEPS_SPENT, amount=steps_lost,
+                                   remaining=player.inventory.steps.amount, cause=self.name)
             return f"Perdu {steps_lost} pas dans {self.name}"
         
         # Autres effets spéciaux
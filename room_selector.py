@@ -3,9 +3,9 @@ Système de sélection des salles
 Gère la logique de tirage et de sélection des salles
 """
 import random
-import copy
-import config
+import difficulty
 from room import Room
+from events import EventType
 
 
 class RoomSelector:
@@ -19,7 +19,7 @@ class RoomSelector:
             room_templates: liste de modèles de salles
         """
         self.room_templates = room_templates
-        self.available_rooms = copy.deepcopy(room_templates)  # Pioche de salles disponibles
+        self.available_rooms = [room.clone() for room in room_templates]  # Pioche de salles disponibles
         # Accumulation des effets globaux
         self.green_prob_multiplier_global = 1.0
         # Multiplicateurs globaux par couleur
@@ -31,6 +31,8 @@ class RoomSelector:
             "RED": 1.0,
             "BLUE": 1.0,
         }
+        # Flux d'événements (EventBus), relié par Game
+        self.events = None
     
     def draw_rooms(self, row, col, mansion, player, count=3, required_direction=None):
         """
@@ -52,7 +54,8 @@ class RoomSelector:
             can_place, reason = room.can_place_at(row, col, mansion)
             if can_place:
                 # Si une direction est requise, la nouvelle salle doit contenir la porte opposée
-                if required_direction:
+                # (sauf une salle sans porte : salle d'arrivée, comme le Hall Avant, où la partie s'achève)
+                if required_direction and room.doors:
                     opposite = {'UP': 'DOWN', 'DOWN': 'UP', 'LEFT': 'RIGHT', 'RIGHT': 'LEFT'}[required_direction]
                     if opposite not in room.doors:
                         continue
@@ -98,8 +101,9 @@ class RoomSelector:
         if current_room and current_room.effects.get("increase_green_probability"):
             green_prob_multiplier = 2.0
         
+        rarity_weights = difficulty.active().rarity_weights
         for room in valid_rooms:
-            base_weight = config.RARITY_WEIGHTS.get(room.rarity, 1.0)
+            base_weight = rarity_weights.get(room.rarity, 1.0)
             # Multiplicateurs globaux par couleur
             base_weight *= self.color_multipliers.get(room.color, 1.0)
             # Bonus pour les salles vertes
@@ -115,7 +119,7 @@ class RoomSelector:
         # Garantir au moins une salle à coût 0
         if zero_cost_rooms:
             zero_room = random.choice(zero_cost_rooms)
-            selected_rooms.append(copy.deepcopy(zero_room))
+            selected_rooms.append(zero_room.clone())
             if zero_room in temp_valid:
                 idx = temp_valid.index(zero_room)
                 temp_valid.pop(idx)
@@ -134,12 +138,17 @@ class RoomSelector:
                 normalized_weights = [w / total_weight for w in temp_weights]
                 selected = random.choices(temp_valid, weights=normalized_weights)[0]
             
-            selected_rooms.append(copy.deepcopy(selected))
+            selected_rooms.append(selected.clone())
             
             idx = temp_valid.index(selected)
             temp_valid.pop(idx)
             temp_weights.pop(idx)
         
+        if self.events is not None:
+            self.events.emit(EventType.ROOM_DRAWN, row=row, col=col,
+                             rooms=[r.name for r in selected_rooms],
+                             gem_costs=[r.gem_cost for r in selected_rooms])
+        
         # Retourner les salles choisies
         return selected_rooms
     
@@ -190,6 +199,9 @@ class RoomSelector:
         
         # Enregistrer les effets globaux
         self._note_placed_room_effects(placed_room)
+        if self.events is not None:
+            self.events.emit(EventType.ROOM_PLACED, name=placed_room.name, color=placed_room.color,
+                             row=row, col=col, gem_cost=room.gem_cost)
         return True, f"Salle choisie : {placed_room.name}"
     
     def reroll(self, row, col, mansion, player, required_direction=None):
@@ -216,7 +228,7 @@ class RoomSelector:
     def reset(self, room_templates):
         """Réinitialiser la pioche de salles disponibles"""
         self.room_templates = room_templates
-        self.available_rooms = copy.deepcopy(room_templates)
+        self.available_rooms = [room.clone() for room in room_templates]
         self.green_prob_multiplier_global = 1.0
         for k in self.color_multipliers:
             self.color_multipliers[k] = 1.0
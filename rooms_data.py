@@ -1,259 +1,258 @@
 """
 Configuration des données des salles
-Définit tous les types de salles et leurs propriétés
+Les modèles de salles sont décrits dans un fichier déclaratif (rooms.json ou TOML) ;
+le catalogue est compilé une seule fois (conditions de placement en prédicats, objets en fabriques)
+et mis en cache selon l'empreinte du fichier
 """
-from room import Room
-from item import FoodItem, TreasureChest, DiggingSpot, Locker, ConsumableItem
+import hashlib
+import json
+import os
 import random
+from room import Room, static_condition
+from item import FoodItem, TreasureChest, DiggingSpot, Locker, ConsumableItem
+import config
+import loot
+import pool
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11 : seuls les catalogues JSON sont pris en charge
+    tomllib = None
 
 
-def create_room_templates():
+# Catalogues compilés : empreinte SHA-256 du fichier -> liste de modèles compilés
+_CATALOG_CACHE = {}
+# Chemin -> ((date de modification, taille), empreinte), pour ne pas relire un fichier inchangé
+_FILE_DIGESTS = {}
+
+
+def _compile_condition(spec):
     """
-    Créer tous les modèles de salles
-    
+    Compiler une condition de placement déclarative en prédicat (row, col, mansion) -> bool
+
+    Clés reconnues (combinées par ET) : row, col, min_row, max_row, min_col, max_col,
+    edge (bool), all / any (listes de conditions), not (condition)
+    """
+    checks = []
+    for key, value in spec.items():
+        if key == "row":
+            checks.append(lambda row, col, mansion, v=value: row == v)
+        elif key == "col":
+            checks.append(lambda row, col, mansion, v=value: col == v)
+        elif key == "min_row":
+            checks.append(lambda row, col, mansion, v=value: row >= v)
+        elif key == "max_row":
+            checks.append(lambda row, col, mansion, v=value: row <= v)
+        elif key == "min_col":
+            checks.append(lambda row, col, mansion, v=value: col >= v)
+        elif key == "max_col":
+            checks.append(lambda row, col, mansion, v=value: col <= v)
+        elif key == "edge":
+            checks.append(lambda row, col, mansion, v=bool(value): mansion.is_edge_position(row, col) == v)
+        elif key == "all":
+            parts = [_compile_condition(part) for part in value]
+            checks.append(lambda row, col, mansion, p=parts: all(f(row, col, mansion) for f in p))
+        elif key == "any":
+            parts = [_compile_condition(part) for part in value]
+            checks.append(lambda row, col, mansion, p=parts: any(f(row, col, mansion) for f in p))
+        elif key == "not":
+            part = _compile_condition(value)
+            checks.append(lambda row, col, mansion, p=part: not p(row, col, mansion))
+        else:
+            raise ValueError(f"Condition de placement inconnue : {key}")
+    if len(checks) == 1:
+        return checks[0]
+    return lambda row, col, mansion: all(check(row, col, mansion) for check in checks)
+
+
+def _compile_item(spec):
+    """
+    Compiler une description d'objet en fabrique sans argument
+
+    Types reconnus : consumable (name, amount : entier ou [min, max] tiré à la création),
+    food (name, steps), chest, digging_spot, locker
+    """
+    kind = spec.get("type")
+    if kind == "consumable":
+        name, amount = spec["name"], spec["amount"]
+        if isinstance(amount, list):
+            low, high = amount
+            return lambda: pool.new_item(ConsumableItem, name, random.randint(low, high))
+        return lambda: pool.new_item(ConsumableItem, name, amount)
+    if kind == "food":
+        name, steps = spec["name"], spec["steps"]
+        return lambda: pool.new_item(FoodItem, name, steps)
+    if kind == "chest":
+        return lambda: pool.new_item(TreasureChest)
+    if kind == "digging_spot":
+        return lambda: pool.new_item(DiggingSpot)
+    if kind == "locker":
+        return lambda: pool.new_item(Locker)
+    raise ValueError(f"Type d'objet inconnu : {kind}")
+
+
+def _loot_entry(entry):
+    """Convertir un objet de salle spéciale tiré avec une probabilité en entrée de table de butin (loot)"""
+    spec = entry["item"]
+    if spec.get("type") == "food":
+        spec = {"type": "food", "choices": [[spec["name"], spec["steps"]]]}
+    return {"probability": entry["probability"], "scale": "find", "reward": spec}
+
+
+def _compile_effects(spec):
+    """
+    Compiler les effets d'une salle en fabrique de dictionnaire d'effets
+    (les objets des listes "items" sont recréés pour chaque salle ; ceux qui ont une probabilité,
+    hors boutique, forment la table effects["loot"], tirée par Room.generate_items avec le profil actif)
+    """
+    if not spec:
+        return dict
+    static = {key: value for key, value in spec.items() if key != "items"}
+    items = spec.get("items", ())
+    if not spec.get("shop"):
+        drops = [_loot_entry(entry) for entry in items if "probability" in entry]
+        if drops:
+            loot.compile_table(drops)  # validation dès le chargement du catalogue
+            static["loot"] = json.dumps(drops, sort_keys=True, ensure_ascii=False)
+        items = [entry for entry in items if "probability" not in entry]
+    entries = [
+        ({key: value for key, value in entry.items() if key != "item"}, _compile_item(entry["item"]))
+        for entry in items
+    ]
+
+    def make_effects():
+        effects = {key: value.copy() if isinstance(value, dict) else value for key, value in static.items()}
+        if entries:
+            effects["items"] = [dict(fields, item=make_item()) for fields, make_item in entries]
+        return effects
+    return make_effects
+
+
+def _compile_room(spec):
+    """Compiler la description d'une salle en fabrique de Room (salles et objets recyclés si possible)"""
+    try:
+        name = spec["name"]
+        color = spec.get("color", "BLUE")
+        rarity = spec.get("rarity", 0)
+        gem_cost = spec.get("gem_cost", 0)
+        doors = tuple(spec.get("doors", ()))
+        image_path = spec.get("image")
+        # Les conditions déclaratives ne dépendent que de la case et de la taille de la grille
+        condition = static_condition(_compile_condition(spec["placement"])) if spec.get("placement") else None
+        item_factories = [_compile_item(item) for item in spec.get("items", ())]
+        make_effects = _compile_effects(spec.get("effects"))
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Salle invalide dans le catalogue ({spec.get('name', '?')}) : {e}") from e
+    for direction in doors:
+        if direction not in config.DIRECTIONS:
+            raise ValueError(f"Salle invalide dans le catalogue ({name}) : direction inconnue {direction}")
+
+    def make_room():
+        return Room.acquire(
+            name=name,
+            color=color,
+            rarity=rarity,
+            gem_cost=gem_cost,
+            doors=list(doors),
+            items=[make_item() for make_item in item_factories],
+            effects=make_effects(),
+            placement_condition=condition,
+            image_path=image_path
+        )
+    return name, make_room
+
+
+def _parse_catalog(data, path):
+    """Décoder le contenu d'un fichier catalogue (JSON ou TOML selon l'extension)"""
+    if path.endswith(".toml"):
+        if tomllib is None:
+            raise ValueError("Les catalogues TOML nécessitent Python 3.11 ou plus")
+        return tomllib.loads(data.decode("utf-8"))
+    return json.loads(data.decode("utf-8"))
+
+
+def compile_catalog(document):
+    """
+    Compiler un catalogue de salles
+
+    Args:
+        document: dict avec "rooms" (liste de descriptions) et "copies" (nom -> nombre de copies supplémentaires)
+
     Returns:
-        list: liste d’objets Room
+        list: fabriques de Room, dans l'ordre du deck
     """
-    rooms = []
-    
-    # Hall d’entrée (déjà créé dans Mansion, pas répété ici)
-    
-    # Hall avant (salle objectif)
-    front_hall = Room(
-        name="Hall Avant",
-        color="BLUE",
-        rarity=0,
-        gem_cost=0,
-        doors=[],  # Le hall avant n’a pas de portes (point final)
-        placement_condition=lambda row, col, mansion: row == 0,  # Ne peut être placé qu’à la première ligne
-        image_path="images/HallAvant.png"
-    )
-    rooms.append(front_hall)
-    
-    # Salle bleue basique
-    basic_room = Room(
-        name="Salle Ordinaire",
-        color="BLUE",
-        rarity=0,
-        gem_cost=0,
-        doors=['UP', 'DOWN'],
-        image_path="images/SalleOrdinaire.png"
-    )
-    rooms.append(basic_room)
-    
-    # Salle du trésor
-    vault = Room(
-        name="Salle du Trésor",
-        color="BLUE",
-        rarity=3,
-        gem_cost=3,
-        doors=['UP'],
-        items=[ConsumableItem("Pièce d’or", 40)],
-        image_path="images/SalleDuTresor.png"
-    )
-    rooms.append(vault)
-    
-    # Véranda (salle verte, uniquement en bordure)
-    veranda = Room(
-        name="Véranda",
-        color="GREEN",
-        rarity=2,
-        gem_cost=2,
-        doors=['UP', 'DOWN'],
-        placement_condition=lambda row, col, mansion: mansion.is_edge_position(row, col),
-        effects={
-            "effect": lambda player, mansion: None,  # Augmente la probabilité de salle verte (géré dans room_selector)
-            "increase_green_probability": True
-        },
-        image_path="images/Veranda.png"
-    )
-    rooms.append(veranda)
-    
-    # Bureau
-    study = Room(
-        name="Bureau",
-        color="BLUE",
-        rarity=1,
-        gem_cost=1,
-        doors=['UP', 'DOWN', 'LEFT', 'RIGHT'],
-        items=[ConsumableItem("Gemme", 1)],
-        effects={
-            "items": [
-                {"item": TreasureChest(), "probability": 0.3}
-            ]
-        },
-        image_path="images/Bureau.png"
-    )
-    rooms.append(study)
-    
-    # Cave
-    cellar = Room(
-        name="Cave",
-        color="BLUE",
-        rarity=1,
-        gem_cost=1,
-        doors=['UP'],
-        items=[ConsumableItem("Clé", random.randint(1, 2))],
-        image_path="images/Cave.png"
-    )
-    rooms.append(cellar)
-    
-    # Boutique (salle jaune)
-    shop = Room(
-        name="Boutique",
-        color="YELLOW",
-        rarity=1,
-        gem_cost=1,
-        doors=['UP', 'DOWN', 'LEFT', 'RIGHT'],
-        effects={
-            "shop": True,
-            "items": [
-                {"name": "Clé", "price": 10, "item": ConsumableItem("Clé", 1)},
-                {"name": "Gemme", "price": 15, "item": ConsumableItem("Gemme", 1)},
-                {"name": "Dé", "price": 20, "item": ConsumableItem("Dé", 1)},
-                {"name": "Pomme", "price": 5, "item": FoodItem("Pomme", 2)},
-            ]
-        },
-        image_path="images/Boutique.png"
-    )
-    rooms.append(shop)
-    
-    # Chambre (salle violette)
-    bedroom = Room(
-        name="Chambre",
-        color="PURPLE",
-        rarity=1,
-        gem_cost=1,
-        doors=['UP', 'DOWN'],
-        image_path="images/Chambre.png"
-    )
-    rooms.append(bedroom)
+    factories = []
+    by_name = {}
+    for spec in document.get("rooms", ()):
+        name, make_room = _compile_room(spec)
+        factories.append(make_room)
+        by_name.setdefault(name, make_room)
+    # Copies supplémentaires des salles fréquentes pour augmenter la taille du deck
+    for name, count in document.get("copies", {}).items():
+        if name not in by_name:
+            raise ValueError(f"Copie d'une salle absente du catalogue : {name}")
+        factories.extend([by_name[name]] * count)
+    return factories
+
+
+def load_room_catalog(path=None):
+    """
+    Charger le catalogue compilé (mis en cache selon l'empreinte du fichier)
+
+    Args:
+        path: Fichier catalogue (par défaut config.ROOM_CATALOG_PATH, relatif au dossier du jeu)
+
+    Returns:
+        list: fabriques de Room
+    """
+    if path is None:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), config.ROOM_CATALOG_PATH)
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    known = _FILE_DIGESTS.get(path)
+    if known is not None and known[0] == stamp and known[1] in _CATALOG_CACHE:
+        return _CATALOG_CACHE[known[1]]
+
+    with open(path, "rb") as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    _FILE_DIGESTS[path] = (stamp, digest)
+    catalog = _CATALOG_CACHE.get(digest)
+    if catalog is None:
+        catalog = compile_catalog(_parse_catalog(data, path))
+        _CATALOG_CACHE[digest] = catalog
+    return catalog
+
+
+def create_room_templates(path=None):
+    """
+    Créer tous les modèles de salles à partir du catalogue
     
-    # Salle du fourneau : augmente la probabilité des salles rouges
-    furnace = Room(
-        name="Salle du Fourneau",
-        color="RED",
-        rarity=1,
-        gem_cost=1,
-        doors=['UP', 'DOWN'],
-        effects={
-            "increase_color_weights": {"RED": 1.5}
-        },
-        image_path="images/SalleDuFourneau.png"
-    )
-    rooms.append(furnace)
+    Args:
+        path: Fichier catalogue (par défaut celui de la configuration)
     
-    # Serre : augmente la probabilité des salles vertes
-    greenhouse = Room(
-        name="Serre",
-        color="GREEN",
-        rarity=1,
-        gem_cost=1,
-        doors=['UP', 'DOWN', 'LEFT'],
-        effects={
-            "increase_color_weights": {"GREEN": 1.5}
-        },
-        image_path="images/Serre.png"
-    )
-    rooms.append(greenhouse)
+    Returns:
+        list: liste d’objets Room
+    """
+    # Hall d’entrée : créé par Mansion (create_entrance_room), absent du catalogue
+    return [make_room() for make_room in load_room_catalog(path)]
+
+
+def create_entrance_room():
+    """
+    Créer la salle d'entrée (placée par Mansion, hors de la pioche)
     
-    # Salle d’exposition solaire : augmente la probabilité des salles bleues
-    solarium = Room(
-        name="Solarium",
+    Returns:
+        Objet Room
+    """
+    return Room.acquire(
+        name="Hall d'entrée",
         color="BLUE",
-        rarity=1,
-        gem_cost=1,
-        doors=['UP', 'RIGHT'],
-        effects={
-            "increase_color_weights": {"BLUE": 1.3}
-        },
-        image_path="images/Solarium.png"
-    )
-    rooms.append(solarium)
-    
-    # Couloir (salle orange)
-    corridor = Room(
-        name="Couloir",
-        color="ORANGE",
         rarity=0,
         gem_cost=0,
-        doors=['UP', 'DOWN', 'LEFT', 'RIGHT'],
-        image_path="images/Couloir.png"
+        doors=['UP'],  # La seule entrée est une porte orientée vers le haut.
+        image_path="images/SalleOrdinaire.png"  # L'entrée utilise l'image de salle ordinaire
     )
-    rooms.append(corridor)
-    
-    # Salle dangereuse (rouge)
-    dangerous_room = Room(
-        name="Salle Dangereuse",
-        color="RED",
-        rarity=1,
-        gem_cost=1,
-        doors=['UP'],  # Peu de portes
-        effects={
-            "lose_steps": 5  # Perdre 5 pas
-        },
-        image_path="images/SalleDangereuse.png"
-    )
-    rooms.append(dangerous_room)
-    
-    # Jardin (salle verte)
-    garden = Room(
-        name="Jardin",
-        color="GREEN",
-        rarity=1,
-        gem_cost=1,
-        doors=['UP', 'DOWN', 'LEFT'],
-        image_path="images/Jardin.png"
-    )
-    rooms.append(garden)
-    
-    # Vestiaire (contient un casier)
-    cloakroom = Room(
-        name="Vestiaire",
-        color="BLUE",
-        rarity=1,
-        gem_cost=1,
-        doors=['UP', 'DOWN'],
-        items=[Locker()],
-        image_path="images/Vestiaire.png"
-    )
-    rooms.append(cloakroom)
-    
-    # Cuisine (peut contenir de la nourriture)
-    kitchen = Room(
-        name="Cuisine",
-        color="BLUE",
-        rarity=1,
-        gem_cost=1,
-        doors=['UP', 'DOWN', 'LEFT', 'RIGHT'],
-        effects={
-            "items": [
-                {"item": FoodItem("Sandwich", 15), "probability": 0.5},
-                {"item": FoodItem("Repas Copieux", 25), "probability": 0.2}
-            ]
-        },
-        image_path="images/Cuisine.png"
-    )
-    rooms.append(kitchen)
-    
-    # Ajouter des copies de certaines salles communes pour augmenter la taille du deck
-    common_rooms = [basic_room, corridor, bedroom]
-    for room_template in common_rooms:
-        # Créer plusieurs copies pour les salles fréquentes
-        for i in range(2):
-            new_room = Room(
-                name=room_template.name,
-                color=room_template.color,
-                rarity=room_template.rarity,
-                gem_cost=room_template.gem_cost,
-                doors=room_template.doors.copy(),
-                effects=room_template.effects.copy() if room_template.effects else {},
-                placement_condition=room_template.placement_condition,
-                image_path=room_template.image_path
-            )
-            rooms.append(new_room)
-    
-    return rooms
 
 
 def get_room_by_name(name, rooms_list):
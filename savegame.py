@@ -0,0 +1,530 @@
+"""
+Sauvegarde et chargement de l'état complet d'une partie
+Format binaire compact et versionné, conçu pour un chargement très rapide
+(stockage de nombreux instantanés en cours de partie lors des simulations)
+
+Disposition (petit-boutiste) :
+    en-tête        : magic (4 o), version (1 o), graine (8 o), lignes et colonnes de la grille (2 x 2 o)
+    partie         : état, index de sélection, direction en attente, position cible
+    joueur         : position + 10 compteurs d'inventaire
+    multiplicateurs: multiplicateur vert global + 6 multiplicateurs de couleur
+    chaînes        : table des chaînes (noms des salles, des objets, messages)
+    salles         : grille, pioche restante, salles proposées
+    messages       : message courant, message de fin de partie
+    difficulté     : nom du profil de difficulté (index dans la table des chaînes)
+    aléatoire      : état complet du générateur `random`
+"""
+import hashlib
+import random
+import struct
+import config
+import difficulty
+import loot
+import pool
+from door import Door
+from mansion import Mansion
+from inventory import FIELD_IDS
+from item import ConsumableItem, FoodItem, TreasureChest, DiggingSpot, Locker, ItemId
+from room import Room
+from rooms_data import create_room_templates, create_entrance_room
+
+
+MAGIC = b"BPSV"
+VERSION = 1
+
+# Codes stables des énumérations (ne pas réordonner : cela casserait les sauvegardes existantes)
+_STATES = ("playing", "selecting_room", "selecting_direction", "game_over", "shop", "picking_items")
+_DIRECTIONS = ("UP", "DOWN", "LEFT", "RIGHT")
+_COLORS = ("YELLOW", "GREEN", "PURPLE", "ORANGE", "RED", "BLUE")
+_NONE = 255
+_NO_POSITION = 0xFFFF
+_MAX_LOCK_LEVEL = 2
+
+# Types d'objets dans les salles
+_ITEM_CONSUMABLE = 0
+_ITEM_FOOD = 1
+_ITEM_CHEST = 2
+_ITEM_DIGGING_SPOT = 3
+_ITEM_LOCKER = 4
+_ITEM_REWARD = 5
+
+_HEADER = struct.Struct("<4sBQ")
+_DIMENSIONS = struct.Struct("<HH")
+_GAME = struct.Struct("<BBBBBhhB")
+_PLAYER = struct.Struct("<HH10i")
+_MULTIPLIERS = struct.Struct("<7d")
+_ROOM = struct.Struct("<HHHBBBBB")
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_ITEM_NAMED = struct.Struct("<BHi")
+_REWARD = struct.Struct("<BiH")  # identifiant (ItemId), quantité, nom
+_RNG_STATE = struct.Struct("<B625IB")
+_GAUSS = struct.Struct("<d")
+
+_DIRECTION_CODES = {d: i for i, d in enumerate(_DIRECTIONS)}
+_COLOR_CODES = {c: i for i, c in enumerate(_COLORS)}
+_STATE_CODES = {s: i for i, s in enumerate(_STATES)}
+
+# Prototypes des salles (effets, conditions de placement, images) indexés par nom
+_prototypes = None
+
+
+def get_prototypes():
+    """
+    Obtenir les prototypes de salles par nom (construits une seule fois)
+
+    La création des modèles consomme des tirages aléatoires (quantités initiales) :
+    l'état du générateur est préservé pour ne pas perturber la partie en cours.
+    """
+    global _prototypes
+    if _prototypes is None:
+        rng_state = random.getstate()
+        try:
+            prototypes = {}
+            for room in [create_entrance_room()] + create_room_templates():
+                prototypes.setdefault(room.name, room)
+        finally:
+            random.setstate(rng_state)
+        _prototypes = prototypes
+    return _prototypes
+
+
+def _lookup(table, index, what):
+    """Élément d'une table désigné par un index lu dans la sauvegarde (ValueError s'il est hors limites)"""
+    if not 0 <= index < len(table):
+        raise ValueError(f"Sauvegarde corrompue : index de {what} invalide ({index})")
+    return table[index]
+
+
+def _check_position(row, col, rows, cols, what):
+    """Position lue dans la sauvegarde (ValueError si elle est absente ou hors de la grille)"""
+    if row is None or col is None or not (0 <= row < rows and 0 <= col < cols):
+        raise ValueError(f"Sauvegarde corrompue : position {what} hors de la grille ({row}, {col})")
+
+
+class _Writer:
+    """Tampon d'écriture avec table de chaînes"""
+
+    def __init__(self):
+        self.body = bytearray()
+        self.strings = {}
+
+    def string(self, text):
+        """Obtenir l'index d'une chaîne dans la table"""
+        index = self.strings.get(text)
+        if index is None:
+            index = len(self.strings)
+            self.strings[text] = index
+        return index
+
+    def reward(self, reward):
+        """Écrire une récompense typée"""
+        self.body += _REWARD.pack(reward.kind, reward.amount, self.string(reward.name))
+
+    def contents(self, contents):
+        """Écrire le contenu d'un conteneur (liste de récompenses)"""
+        self.body += _U8.pack(len(contents))
+        for reward in contents:
+            self.reward(reward)
+
+    def item(self, item):
+        """Écrire un objet de salle"""
+        body = self.body
+        if isinstance(item, loot.Reward):
+            body += _U8.pack(_ITEM_REWARD)
+            self.reward(item)
+        elif isinstance(item, FoodItem):
+            body += _ITEM_NAMED.pack(_ITEM_FOOD, self.string(item.name), item.steps_restored)
+        elif isinstance(item, ConsumableItem):
+            body += _ITEM_NAMED.pack(_ITEM_CONSUMABLE, self.string(item.name), item.amount)
+        elif isinstance(item, TreasureChest):
+            body += _U8.pack(_ITEM_CHEST) + _U8.pack(int(item.opened))
+            self.contents(item.contents)
+        elif isinstance(item, DiggingSpot):
+            body += _U8.pack(_ITEM_DIGGING_SPOT) + _U8.pack(int(item.dug))
+            self.contents(item.contents)
+        elif isinstance(item, Locker):
+            body += _U8.pack(_ITEM_LOCKER) + _U8.pack(int(item.opened))
+            self.contents(item.contents)
+        else:
+            raise ValueError(f"Objet non sauvegardable : {item!r}")
+
+    def room(self, room):
+        """Écrire une salle (portes, état des serrures et objets compris)"""
+        self.body += _ROOM.pack(
+            self.string(room.name),
+            _NO_POSITION if room.row is None else room.row,
+            _NO_POSITION if room.col is None else room.col,
+            _COLOR_CODES[room.color],
+            room.rarity,
+            room.gem_cost,
+            int(room.explored),
+            len(room.doors),
+        )
+        for direction in room.doors:
+            # bits 0-1 : direction, 2-3 : niveau de serrure, 4 : ouverte, 5 : objet Door présent
+            code = _DIRECTION_CODES[direction]
+            door = room.door_objects.get(direction)
+            if door is not None:
+                code |= (door.lock_level << 2) | (int(door.opened) << 4) | 0x20
+            self.body += _U8.pack(code)
+        self.body += _U8.pack(len(room.items))
+        for item in room.items:
+            self.item(item)
+
+    def rooms(self, rooms):
+        """Écrire une liste de salles"""
+        self.body += _U16.pack(len(rooms))
+        for room in rooms:
+            self.room(room)
+
+
+class _Reader:
+    """Lecture séquentielle d'une sauvegarde"""
+
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.offset = 0
+        self.strings = []
+        self.prototypes = get_prototypes()
+
+    def unpack(self, fmt):
+        """Lire une structure"""
+        values = fmt.unpack_from(self.data, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def u8(self):
+        if self.offset >= len(self.data):
+            raise ValueError("Sauvegarde tronquée")
+        value = self.data[self.offset]
+        self.offset += 1
+        return value
+
+    def string(self, index):
+        """Obtenir une chaîne de la table (index vérifié)"""
+        return _lookup(self.strings, index, "chaîne")
+
+    def u16(self):
+        return self.unpack(_U16)[0]
+
+    def read_strings(self):
+        """Lire la table des chaînes"""
+        count = self.u16()
+        strings = []
+        data = self.data
+        for _ in range(count):
+            length = self.u16()
+            strings.append(str(data[self.offset:self.offset + length], "utf-8"))
+            self.offset += length
+        self.strings = strings
+
+    def reward(self):
+        """Lire une récompense typée"""
+        kind, amount, name = self.unpack(_REWARD)
+        return loot.Reward(ItemId(kind), amount, self.string(name))
+
+    def contents(self):
+        """Lire le contenu d'un conteneur"""
+        return [self.reward() for _ in range(self.u8())]
+
+    def item(self):
+        """Lire un objet de salle"""
+        kind = self.u8()
+        self.offset -= 1
+        if kind == _ITEM_REWARD:
+            self.offset += 1
+            return self.reward()
+        if kind in (_ITEM_CONSUMABLE, _ITEM_FOOD):
+            _, name, amount = self.unpack(_ITEM_NAMED)
+            if kind == _ITEM_FOOD:
+                return pool.new_item(FoodItem, self.string(name), amount)
+            return pool.new_item(ConsumableItem, self.string(name), amount)
+        self.offset += 1
+        flag = bool(self.u8())
+        if kind == _ITEM_CHEST:
+            item = pool.new_item(TreasureChest)
+            item.opened = flag
+        elif kind == _ITEM_DIGGING_SPOT:
+            item = pool.new_item(DiggingSpot)
+            item.dug = flag
+        elif kind == _ITEM_LOCKER:
+            item = pool.new_item(Locker)
+            item.opened = flag
+        else:
+            raise ValueError(f"Type d'objet inconnu dans la sauvegarde : {kind}")
+        item.contents = self.contents()
+        return item
+
+    def room(self):
+        """Lire une salle"""
+        name, row, col, color, rarity, gem_cost, explored, door_count = self.unpack(_ROOM)
+        name = self.string(name)
+        color = _lookup(_COLORS, color, "couleur")
+        if self.offset + door_count > len(self.data):
+            raise ValueError("Sauvegarde tronquée")
+        doors = []
+        door_objects = {}
+        data = self.data
+        for i in range(self.offset, self.offset + door_count):
+            code = data[i]
+            direction = _DIRECTIONS[code & 0x03]
+            doors.append(direction)
+            if code & 0x20:
+                lock_level = (code >> 2) & 0x03
+                if lock_level > _MAX_LOCK_LEVEL:
+                    raise ValueError(f"Sauvegarde corrompue : niveau de serrure invalide ({lock_level})")
+                door = Door.acquire(direction, lock_level=lock_level)
+                door.opened = bool(code & 0x10)
+                door_objects[direction] = door
+        self.offset += door_count
+        items = [self.item() for _ in range(self.u8())]
+
+        # Les effets et conditions de placement (fonctions) proviennent du prototype de même nom ;
+        # les objets des effets sont copiés (ils rejoignent les objets de la salle une fois placée)
+        prototype = self.prototypes.get(name)
+        room = Room.acquire(
+            name=name,
+            color=color,
+            rarity=rarity,
+            gem_cost=gem_cost,
+            doors=doors,
+            items=items,
+            effects=pool.clone_effects(prototype.effects, {}) if prototype else None,
+            placement_condition=prototype.placement_condition if prototype else None,
+            image_path=prototype.image_path if prototype else None,
+        )
+        room.row = None if row == _NO_POSITION else row
+        room.col = None if col == _NO_POSITION else col
+        room.door_objects.update(door_objects)
+        room.explored = bool(explored)
+        return room
+
+    def rooms(self):
+        """Lire une liste de salles"""
+        return [self.room() for _ in range(self.u16())]
+
+
+def dumps(game):
+    """
+    Sérialiser l'état complet d'une partie
+
+    Args:
+        game: Objet Game
+
+    Returns:
+        bytes: Sauvegarde binaire
+    """
+    writer = _Writer()
+    body = writer.body
+    target_row, target_col = game.target_position if game.target_position else (-1, -1)
+    body += _GAME.pack(
+        _STATE_CODES[game.state],
+        game.selected_room_index,
+        game.item_selection_index,
+        game.shop_selection_index,
+        _DIRECTION_CODES.get(game.pending_direction, _NONE),
+        target_row,
+        target_col,
+        _DIRECTION_CODES.get(game.selected_direction, _NONE),
+    )
+
+    player = game.player
+    inventory = player.inventory
+    body += _PLAYER.pack(
+        player.row,
+        player.col,
+        *[inventory.counts[item_id] for item_id in FIELD_IDS]
+    )
+
+    selector = game.room_selector
+    body += _MULTIPLIERS.pack(
+        selector.green_prob_multiplier_global,
+        *[selector.color_multipliers[color] for color in _COLORS]
+    )
+
+    writer.rooms(game.mansion.get_all_rooms())
+    writer.rooms(selector.available_rooms)
+    writer.rooms(game.available_rooms)
+    body += _U16.pack(writer.string(game.message or ""))
+    body += _U16.pack(writer.string(game.game_over_message or ""))
+    body += _U16.pack(writer.string(game.difficulty))
+
+    version, internal_state, gauss_next = random.getstate()
+    body += _RNG_STATE.pack(version, *internal_state, int(gauss_next is not None))
+    if gauss_next is not None:
+        body += _GAUSS.pack(gauss_next)
+
+    # La table des chaînes précède les salles pour permettre une lecture en une passe
+    table = bytearray(_U16.pack(len(writer.strings)))
+    for text in writer.strings:
+        encoded = text.encode("utf-8")
+        table += _U16.pack(len(encoded)) + encoded
+
+    game_size = _GAME.size + _PLAYER.size + _MULTIPLIERS.size
+    return b"".join((
+        _HEADER.pack(MAGIC, VERSION, game.seed),
+        _DIMENSIONS.pack(game.mansion.rows, game.mansion.cols),
+        bytes(body[:game_size]),
+        bytes(table),
+        bytes(body[game_size:]),
+    ))
+
+
+def state_hash(game):
+    """
+    Empreinte canonique de l'état du manoir, du joueur et du sélecteur de salles (profil de difficulté compris)
+    Mêmes encodages que dumps(), sans l'interface (sélections, messages) ni le générateur aléatoire ;
+    les salles du manoir sont parcourues par position, de sorte que deux parties dans le même état
+    ont la même empreinte quel que soit l'ordre dans lequel leurs salles ont été placées ou chargées.
+
+    Args:
+        game: Objet Game
+
+    Returns:
+        str: Empreinte hexadécimale (BLAKE2b, 16 octets)
+    """
+    writer = _Writer()
+    body = writer.body
+    mansion = game.mansion
+    player = game.player
+    inventory = player.inventory
+    selector = game.room_selector
+    body += _DIMENSIONS.pack(mansion.rows, mansion.cols)
+    body += _U16.pack(writer.string(game.difficulty))
+    body += _PLAYER.pack(player.row, player.col, *[inventory.counts[item_id] for item_id in FIELD_IDS])
+    body += _MULTIPLIERS.pack(
+        selector.green_prob_multiplier_global,
+        *[selector.color_multipliers[color] for color in _COLORS]
+    )
+    rooms = mansion.rooms
+    writer.rooms([rooms[position] for position in sorted(rooms)])
+    writer.rooms(selector.available_rooms)
+    # Les chaînes sont indexées dans l'ordre de parcours, lui-même canonique
+    digest = hashlib.blake2b(body, digest_size=16)
+    digest.update("\0".join(writer.strings).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def loads(game, data):
+    """
+    Restaurer l'état d'une partie à partir d'une sauvegarde
+
+    Args:
+        game: Objet Game à remplacer (ses modèles de salles sont conservés)
+        data: Sauvegarde produite par dumps()
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("Sauvegarde tronquée")
+    magic, version, seed = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Ce fichier n'est pas une sauvegarde Blue Prince")
+    if version != VERSION:
+        raise ValueError(f"Version de sauvegarde non prise en charge : {version}")
+
+    reader = _Reader(data)
+    reader.offset = _HEADER.size
+    rows, cols = reader.unpack(_DIMENSIONS)
+    for size in (rows, cols):
+        if not config.MIN_GRID_SIZE <= size <= config.MAX_GRID_SIZE:
+            raise ValueError(f"Dimension de grille invalide : {size}")
+    (state, selected_room_index, item_selection_index, shop_selection_index,
+     pending_direction, target_row, target_col, selected_direction) = reader.unpack(_GAME)
+    # Énumérations vérifiées avant toute modification de la partie
+    state = _lookup(_STATES, state, "état")
+    pending_direction = None if pending_direction == _NONE else _lookup(_DIRECTIONS, pending_direction, "direction")
+    selected_direction = None if selected_direction == _NONE else _lookup(_DIRECTIONS, selected_direction, "direction")
+    player_values = reader.unpack(_PLAYER)
+    multipliers = reader.unpack(_MULTIPLIERS)
+    reader.read_strings()
+    placed_rooms = reader.rooms()
+    deck = reader.rooms()
+    offered_rooms = reader.rooms()
+    message = reader.string(reader.u16())
+    game_over_message = reader.string(reader.u16())
+    profile = difficulty.get_profile(reader.string(reader.u16()))
+    rng_values = reader.unpack(_RNG_STATE)
+    gauss_next = reader.unpack(_GAUSS)[0] if rng_values[-1] else None
+
+    # Positions vérifiées avant toute modification de la partie : salles placées (une par case),
+    # joueur, case cible, et salles de la pioche ou proposées lorsqu'elles ont une position
+    for room in placed_rooms:
+        _check_position(room.row, room.col, rows, cols, "de salle")
+    if len({(room.row, room.col) for room in placed_rooms}) != len(placed_rooms):
+        raise ValueError("Sauvegarde corrompue : plusieurs salles sur la même case")
+    for room in deck + offered_rooms:
+        if room.row is not None or room.col is not None:
+            _check_position(room.row, room.col, rows, cols, "de salle")
+    _check_position(player_values[0], player_values[1], rows, cols, "du joueur")
+    if target_row >= 0 or target_col >= 0:
+        _check_position(target_row, target_col, rows, cols, "cible")
+
+    # Les salles de l'état remplacé retournent à la réserve (les modèles sont conservés)
+    pool.release_rooms(
+        list(game.mansion.rooms.values()) + game.room_selector.available_rooms + game.available_rooms
+    )
+
+    # Manoir (recréé si la sauvegarde utilise d'autres dimensions de grille)
+    if (game.mansion.rows, game.mansion.cols) != (rows, cols):
+        game.mansion = Mansion(rows, cols)
+    mansion = game.mansion
+    mansion.clear()
+    for room in placed_rooms:
+        mansion.restore_room(room.row, room.col, room)
+
+    # Joueur
+    player = game.player
+    player.row, player.col = player_values[0], player_values[1]
+    inventory = player.inventory
+    counts = [0] * len(inventory.counts)
+    for item_id, count in zip(FIELD_IDS, player_values[2:12]):
+        counts[item_id] = count
+    inventory.restore(counts)
+
+    # Sélecteur de salles
+    selector = game.room_selector
+    selector.available_rooms = deck
+    selector.green_prob_multiplier_global = multipliers[0]
+    for color, multiplier in zip(_COLORS, multipliers[1:]):
+        selector.color_multipliers[color] = multiplier
+
+    # Partie
+    game.seed = seed
+    game.state = state
+    game.selected_room_index = selected_room_index
+    game.item_selection_index = item_selection_index
+    game.shop_selection_index = shop_selection_index
+    game.pending_direction = pending_direction
+    game.selected_direction = selected_direction
+    game.target_position = None if target_row < 0 else (target_row, target_col)
+    game.available_rooms = offered_rooms
+    game.message = message
+    game.game_over_message = game_over_message
+    game.is_moving = False
+    game.difficulty = difficulty.set_profile(profile.name).name
+
+    random.setstate((rng_values[0], tuple(rng_values[1:626]), gauss_next))
+
+
+def save_game(game, path):
+    """
+    Sauvegarder la partie dans un fichier
+
+    Args:
+        game: Objet Game
+        path: Chemin du fichier de sauvegarde
+    """
+    with open(path, "wb") as f:
+        f.write(dumps(game))
+
+
+def load_game(game, path):
+    """
+    Charger une partie depuis un fichier
+
+    Args:
+        game: Objet Game à remplacer
+        path: Chemin du fichier de sauvegarde
+    """
+    with open(path, "rb") as f:
+        loads(game, f.read())
@@ -0,0 +1,589 @@
+"""
+Serveur de parties (asyncio, JSON ligne par ligne sur TCP)
+Un seul processus héberge de nombreuses parties sans rendu : chaque requête est une ligne JSON,
+chaque réponse aussi. Les actions sont validées côté serveur (actions légales de simulation.py)
+et appliquées par la même table de dispatch que la relecture ; le serveur renvoie les différences
+d'état depuis la réponse précédente de la session : en JSON ("diff"), ou en cadres binaires de sync.py
+encodés en base64 ("frame") pour les sessions créées avec "binary": true.
+
+Requêtes (champ "op") :
+    new    : créer une session (seed, rows, cols, difficulty, binary facultatifs)
+    act    : jouer une action (session, action : code de action_log, arg)
+    state  : état complet d'une session et actions légales (session)
+    restart: recommencer la partie (session)
+    close  : fermer une session (session)
+    watch  : suivre une session en spectateur (session, max_lag facultatif) ; la connexion ne reçoit
+             ensuite que les messages de diffusion de broadcast.py (instantané, événements, différences)
+
+Avec un magasin de sessions (session_store.py, --store), les sessions modifiées sont enregistrées
+périodiquement (un instantané par session et par période, quel que soit le nombre d'actions, puis
+écriture différée par lots) et au déchargement : une session absente de la mémoire est rechargée à sa
+première requête, les sessions les moins récemment utilisées sont déchargées au-delà de max_sessions,
+et une connexion fermée n'efface plus ses sessions (seul "close" les supprime).
+
+Le jeu tire ses nombres aléatoires dans le module global `random` et lit le profil de difficulté actif :
+chaque session conserve l'état de son générateur, réinstallé avant chacune de ses actions.
+Aucun fil d'exécution par session : toutes les parties avancent dans la boucle asyncio.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import random
+from collections import OrderedDict
+import config
+import difficulty
+import savegame
+from action_log import ActionLog
+from broadcast import SpectatorHub
+from game import Game, GameState
+from replay import apply_action
+from session_store import SessionRecord, SqliteSessionStore, WriteBehindStore
+from simulation import legal_actions
+from sync import CellTracker, StateEncoder
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_MAX_SESSIONS = 10000
+# Période (s) d'enregistrement des sessions modifiées
+DEFAULT_SAVE_INTERVAL = 1.0
+# Dimensions de grille acceptées pour une session (protège la mémoire du serveur)
+MIN_GRID_SIZE = config.MIN_GRID_SIZE
+MAX_GRID_SIZE = config.MAX_GRID_SIZE
+
+# Bits des portes ouvertes dans l'état d'une case (dans l'ordre de ces directions)
+_DOOR_BITS = {direction: 1 << i for i, direction in enumerate(("UP", "DOWN", "LEFT", "RIGHT"))}
+
+
+def _cell_view(room):
+    """État visible d'une case : [nom de la salle, portes ouvertes]"""
+    opened = 0
+    for direction, door in room.door_objects.items():
+        if door.opened:
+            opened |= _DOOR_BITS[direction]
+    return [room.name, opened]
+
+
+def state_view(game, cells=None):
+    """
+    Obtenir l'état visible d'une partie, sérialisable en JSON
+
+    Args:
+        game: Objet Game
+        cells: Cases déjà relevées (reprises telles quelles) ; None pour relever tout le manoir
+
+    Returns:
+        dict: état de la partie, position et inventaire du joueur, salles proposées,
+              cases du manoir ("ligne,colonne" -> [nom de la salle, portes ouvertes])
+    """
+    player = game.player
+    if cells is None:
+        cells = {f"{row},{col}": _cell_view(room) for (row, col), room in game.mansion.rooms.items()}
+    return {
+        "state": game.state,
+        "row": player.row,
+        "col": player.col,
+        "inventory": list(player.inventory.counts),
+        "offered": [room.name for room in game.available_rooms],
+        "selected": game.selected_room_index,
+        "message": game.message,
+        "game_over_message": game.game_over_message,
+        "cells": cells,
+    }
+
+
+def _encode(response):
+    return json.dumps(response, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def diff_views(old, new, cells=None):
+    """
+    Calculer les différences entre deux états visibles
+
+    Args:
+        old: État précédent (state_view)
+        new: Nouvel état
+        cells: Différences des cases déjà calculées ; None pour comparer toutes les cases
+
+    Returns:
+        dict: Champs modifiés ; "cells" ne contient que les cases modifiées (None : case vidée)
+    """
+    diff = {key: value for key, value in new.items() if key != "cells" and old.get(key) != value}
+    if cells is None:
+        old_cells, new_cells = old.get("cells", {}), new["cells"]
+        cells = {key: value for key, value in new_cells.items() if old_cells.get(key) != value}
+        for key in old_cells:
+            if key not in new_cells:
+                cells[key] = None
+    if cells:
+        diff["cells"] = cells
+    return diff
+
+
+class Session:
+    """Partie hébergée par le serveur, avec l'état de son propre générateur aléatoire"""
+
+    def __init__(self, session_id, seed, rows=None, cols=None, difficulty_name=None):
+        """
+        Initialisation de la session
+
+        Args:
+            session_id: Identifiant de la session
+            seed: Graine de la partie
+            rows: Nombre de lignes du manoir
+            cols: Nombre de colonnes du manoir
+            difficulty_name: Nom du profil de difficulté
+        """
+        self.session_id = session_id
+        self.game = Game(seed, rows, cols, difficulty_name)
+        self.rng_state = random.getstate()
+        # Cases modifiées d'une réponse à l'autre (seules celles-ci sont relevées)
+        self.cells = CellTracker(self.game)
+        self.cells.changes()
+        self.view = state_view(self.game)
+        # Actions légales de l'état courant (calculées une fois par action)
+        self.actions = [list(action) for action in legal_actions(self.game)]
+        self.turns = 0
+        # Codeur des cadres binaires (sessions "binary" uniquement)
+        self.encoder = None
+        # Concentrateur de diffusion (créé au premier spectateur)
+        self.hub = None
+
+    def _run(self, func):
+        """Exécuter func avec le générateur et le profil de difficulté de la session"""
+        random.setstate(self.rng_state)
+        difficulty.set_profile(self.game.difficulty)
+        try:
+            return func()
+        finally:
+            self.rng_state = random.getstate()
+
+    def legal_actions(self):
+        """Actions légales dans l'état courant (liste de [code, argument])"""
+        return self.actions
+
+    def play(self, action, arg):
+        """
+        Valider et jouer une action
+
+        Args:
+            action: Code de l'action (action_log)
+            arg: Argument de l'action
+
+        Returns:
+            dict: Différences d'état depuis la réponse précédente
+
+        Raises:
+            ValueError: si l'action n'est pas légale dans l'état courant
+        """
+        if [action, arg] not in self.actions:
+            raise ValueError(f"Action illégale : {action} {arg}")
+
+        def step():
+            apply_action(self.game, action, arg)
+            self.game.update()
+        self._run(step)
+        self.turns += 1
+        return self.sync()
+
+    def restart(self):
+        """Recommencer la partie (même graine de session, générateur poursuivi)"""
+        self._run(self.game.restart)
+        return self.sync()
+
+    def frame(self, full=False):
+        """Cadre binaire de synchronisation depuis le cadre précédent, en base64 (instantané si full)"""
+        if full:
+            self.encoder.request_full()
+        return base64.b64encode(self.encoder.encode()).decode("ascii")
+
+    def sync(self):
+        """Calculer les différences depuis la réponse précédente et mémoriser le nouvel état"""
+        game = self.game
+        changed = self.cells.changes()
+        if changed is None:
+            view = state_view(game)
+            diff = diff_views(self.view, view)
+        else:
+            # Seules les cases modifiées sont relevées, dans le dictionnaire de cases de l'état précédent
+            cells, rooms, updates = self.view["cells"], game.mansion.rooms, {}
+            for row, col in changed:
+                key = f"{row},{col}"
+                room = rooms.get((row, col))
+                value = _cell_view(room) if room is not None else None
+                if cells.get(key) != value:
+                    updates[key] = value
+                    if value is None:
+                        del cells[key]
+                    else:
+                        cells[key] = value
+            view = state_view(game, cells)
+            diff = diff_views(self.view, view, updates)
+        self.view = view
+        self.actions = [list(action) for action in legal_actions(game)]
+        if self.hub is not None and diff:
+            self.hub.publish({"type": "diff", "diff": diff})
+        return diff
+
+    def watch(self, max_lag=None):
+        """
+        Ajouter un spectateur à la session
+
+        Args:
+            max_lag: Retard maximal (en messages) avant de repartir d'un instantané
+
+        Returns:
+            broadcast.Viewer
+        """
+        if self.hub is None:
+            self.hub = self.game.events.subscribe(SpectatorHub(lambda: self.view))
+        return self.hub.add_viewer(max_lag)
+
+    def record(self):
+        """
+        Enregistrement persistant de la session (session_store.SessionRecord)
+
+        Returns:
+            SessionRecord: instantané de la partie (générateur de la session compris) et journal d'actions
+        """
+        game = self.game
+        snapshot = self._run(lambda: savegame.dumps(game))
+        log = game.action_log
+        return SessionRecord(self.session_id, game.seed, game.mansion.rows, game.mansion.cols, game.difficulty,
+                             self.turns, snapshot, log.getvalue() if log is not None else b"")
+
+    @classmethod
+    def restore(cls, record):
+        """
+        Reprendre une session enregistrée
+
+        Args:
+            record: SessionRecord produit par record()
+
+        Returns:
+            Session
+        """
+        session = cls(record.session_id, record.seed, record.rows, record.cols, record.difficulty)
+        game = session.game
+        session._run(lambda: savegame.loads(game, record.snapshot))
+        if record.actions:
+            game.record_actions(ActionLog.resume(record.actions))
+        session.turns = record.turns
+        session.cells.changes()
+        session.view = state_view(game)
+        session.actions = [list(action) for action in legal_actions(game)]
+        return session
+
+    def close(self):
+        """Fermer la session (les spectateurs reçoivent leurs derniers messages)"""
+        self.cells.close()
+        if self.encoder is not None:
+            self.encoder.close()
+        if self.hub is not None:
+            self.game.events.unsubscribe(self.hub)
+            self.hub.close()
+
+
+class GameServer:
+    """Serveur hébergeant les sessions, indépendant du transport (voir serve)"""
+
+    def __init__(self, max_sessions=DEFAULT_MAX_SESSIONS, store=None, save_interval=DEFAULT_SAVE_INTERVAL):
+        """
+        Args:
+            max_sessions: Nombre maximal de sessions simultanées (en mémoire, avec un magasin)
+            store: Magasin de sessions (session_store.WriteBehindStore), None pour ne rien conserver
+            save_interval: Période (s) d'enregistrement des sessions modifiées (voir serve)
+        """
+        self.max_sessions = max_sessions
+        self.store = store
+        self.save_interval = save_interval
+        # Sessions modifiées depuis leur dernier enregistrement
+        self._dirty = set()
+        self._autosave = None
+        # Sessions en mémoire, de la moins à la plus récemment utilisée
+        self.sessions = OrderedDict()
+        self._next_id = store.max_id() + 1 if store is not None else 1
+        # Graines des sessions créées sans graine (générateur propre : ne touche pas `random`)
+        self._seeds = random.Random()
+
+    def create_session(self, seed=None, rows=None, cols=None, difficulty_name=None):
+        """
+        Créer une session
+
+        Returns:
+            Session
+        """
+        if len(self.sessions) >= self.max_sessions and self.store is None:
+            raise ValueError("Nombre maximal de sessions atteint")
+        if seed is None:
+            seed = self._seeds.randrange(1000000)
+        for value in (rows, cols):
+            if value is not None and not (isinstance(value, int) and MIN_GRID_SIZE <= value <= MAX_GRID_SIZE):
+                raise ValueError(f"Dimension de grille invalide : {value}")
+        if difficulty_name is not None and difficulty_name not in difficulty.PROFILES:
+            raise ValueError(f"Profil de difficulté inconnu : {difficulty_name}")
+        session = Session(self._next_id, seed, rows, cols, difficulty_name)
+        self._next_id += 1
+        if self.store is not None:
+            game = session.game
+            game.record_actions(ActionLog(game.seed, rows=game.mansion.rows, cols=game.mansion.cols,
+                                          difficulty=game.difficulty))
+        self._add(session)
+        self.persist(session)
+        return session
+
+    def _add(self, session):
+        """Ajouter une session en mémoire, en déchargeant les moins récemment utilisées au besoin"""
+        self.sessions[session.session_id] = session
+        if self.store is None:
+            return
+        excess = len(self.sessions) - self.max_sessions
+        for session_id in list(self.sessions):
+            if excess <= 0:
+                break
+            idle = self.sessions[session_id]
+            # Une session suivie par des spectateurs n'est pas inactive
+            if idle is session or (idle.hub is not None and idle.hub.viewers):
+                continue
+            self.evict(session_id)
+            excess -= 1
+
+    def persist(self, session):
+        """Marquer une session comme modifiée (enregistrée par save_dirty ; sans magasin : sans effet)"""
+        if self.store is not None:
+            self._dirty.add(session.session_id)
+
+    def save_dirty(self):
+        """Mettre en attente d'écriture un instantané de chaque session modifiée"""
+        sessions = self.sessions
+        for session_id in self._dirty:
+            session = sessions.get(session_id)
+            if session is not None:
+                self.store.put(session.record())
+        self._dirty.clear()
+
+    def evict(self, session_id):
+        """Décharger une session de la mémoire (elle reste dans le magasin)"""
+        session = self.sessions.pop(session_id, None)
+        if session is not None:
+            if session_id in self._dirty:
+                self._dirty.discard(session_id)
+                self.store.put(session.record())
+            session.close()
+
+    def close_session(self, session_id):
+        """Fermer une session (sans effet si elle n'existe plus) et la supprimer du magasin"""
+        session = self.sessions.pop(session_id, None)
+        if session is not None:
+            session.close()
+        if self.store is not None:
+            self._dirty.discard(session_id)
+            self.store.delete(session_id)
+
+    def get_session(self, session_id):
+        """
+        Obtenir une session, rechargée depuis le magasin si elle n'est pas en mémoire
+
+        Returns:
+            Session, ou None si elle est inconnue
+        """
+        session = self.sessions.get(session_id)
+        if session is not None:
+            self.sessions.move_to_end(session_id)
+            return session
+        if self.store is None or not isinstance(session_id, int):
+            return None
+        record = self.store.load(session_id)
+        if record is None:
+            return None
+        session = Session.restore(record)
+        self._add(session)
+        return session
+
+    def _session(self, request):
+        session = self.get_session(request.get("session"))
+        if session is None:
+            raise ValueError("Session inconnue")
+        return session
+
+    def close(self):
+        """Enregistrer les sessions modifiées et fermer le magasin"""
+        if self._autosave is not None:
+            self._autosave.cancel()
+            self._autosave = None
+        if self.store is not None:
+            try:
+                self.save_dirty()
+            finally:
+                self.store.close()
+
+    async def _save_periodically(self):
+        while True:
+            await asyncio.sleep(self.save_interval)
+            try:
+                self.save_dirty()
+            except Exception as e:
+                # Les écritures en échec restent en attente dans le magasin et seront réessayées
+                print(f"Enregistrement des sessions en échec : {e}")
+
+    def handle_request(self, request, owned=None):
+        """
+        Traiter une requête décodée
+
+        Args:
+            request: dict (voir la docstring du module)
+            owned: Ensemble des sessions créées par la connexion (complété par "new")
+
+        Returns:
+            dict: Réponse ("ok" vaut False en cas d'erreur, avec "error")
+        """
+        try:
+            op = request.get("op")
+            if op == "new":
+                session = self.create_session(request.get("seed"), request.get("rows"), request.get("cols"),
+                                              request.get("difficulty"))
+                if owned is not None:
+                    owned.add(session.session_id)
+                response = {"ok": True, "session": session.session_id, "seed": session.game.seed,
+                            "actions": session.legal_actions()}
+                if request.get("binary"):
+                    session.encoder = StateEncoder(session.game)
+                    response["frame"] = session.frame()
+                else:
+                    response["state"] = session.view
+                return response
+            session = self._session(request)
+            if op == "act":
+                action, arg = request.get("action"), request.get("arg", 0)
+                if not isinstance(action, int) or not isinstance(arg, int):
+                    raise ValueError("Action invalide")
+                diff = session.play(action, arg)
+                self.persist(session)
+            elif op == "restart":
+                diff = session.restart()
+                self.persist(session)
+            elif op == "state":
+                response = {"ok": True, "session": session.session_id, "state": session.view,
+                            "actions": session.legal_actions()}
+                if session.encoder is not None:
+                    response["frame"] = session.frame(full=True)
+                return response
+            elif op == "close":
+                self.close_session(session.session_id)
+                if owned is not None:
+                    owned.discard(session.session_id)
+                return {"ok": True, "session": session.session_id}
+            else:
+                raise ValueError(f"Opération inconnue : {op}")
+            response = {"ok": True, "session": session.session_id, "actions": session.legal_actions(),
+                        "over": session.game.state == GameState.GAME_OVER}
+            if session.encoder is not None:
+                response["frame"] = session.frame()
+            else:
+                response["diff"] = diff
+            return response
+        except (ValueError, TypeError) as e:
+            return {"ok": False, "error": str(e)}
+
+    async def handle_client(self, reader, writer):
+        """Servir une connexion : une requête JSON par ligne, une réponse par ligne"""
+        owned = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("Requête invalide")
+                except ValueError as e:
+                    response = {"ok": False, "error": f"JSON invalide : {e}"}
+                else:
+                    if request.get("op") == "watch":
+                        if await self._watch(request, reader, writer):
+                            break
+                        continue
+                    response = self.handle_request(request, owned)
+                writer.write(_encode(response))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            # Les sessions d'une connexion fermée sont libérées (avec un magasin, elles y restent)
+            for session_id in owned:
+                if self.store is not None:
+                    self.evict(session_id)
+                else:
+                    self.close_session(session_id)
+            writer.close()
+
+    async def _watch(self, request, reader, writer):
+        """
+        Transformer la connexion en flux de spectateur jusqu'à la fermeture de la session ou du client
+
+        Returns:
+            bool: False si la requête a été refusée (la connexion reste en mode requête / réponse)
+        """
+        session = self.get_session(request.get("session"))
+        max_lag = request.get("max_lag")
+        if session is None or not (max_lag is None or isinstance(max_lag, int) and max_lag > 0):
+            writer.write(_encode({"ok": False, "error": "Session inconnue" if session is None else "Retard invalide"}))
+            await writer.drain()
+            return False
+        viewer = session.watch(max_lag)
+        writer.write(_encode({"ok": True, "session": session.session_id}))
+        stream = asyncio.ensure_future(viewer.stream(writer))
+        # Fin de la lecture : le spectateur est parti
+        left = asyncio.ensure_future(reader.read())
+        try:
+            await asyncio.wait((stream, left), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stream.cancel()
+            left.cancel()
+            session.hub.remove_viewer(viewer)
+        for task in (stream, left):
+            if task.done() and not task.cancelled() and task.exception() is not None:
+                raise task.exception()
+        return True
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """
+        Démarrer l'écoute TCP
+
+        Returns:
+            asyncio.Server (port effectif dans server.sockets[0].getsockname())
+        """
+        if self.store is not None and self._autosave is None:
+            self._autosave = asyncio.ensure_future(self._save_periodically())
+        return await asyncio.start_server(self.handle_client, host, port)
+
+
+async def _serve_forever(game_server, host, port):
+    server = await game_server.serve(host, port)
+    address = server.sockets[0].getsockname()
+    print(f"Serveur de parties à l'écoute sur {address[0]}:{address[1]}")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serveur de parties Blue Prince (JSON ligne par ligne sur TCP)")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="adresse d'écoute")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port d'écoute")
+    parser.add_argument("--max-sessions", type=int, default=DEFAULT_MAX_SESSIONS, help="sessions simultanées maximales")
+    parser.add_argument("--store", help="base SQLite des sessions (reprises après un redémarrage)")
+    args = parser.parse_args(argv)
+    store = WriteBehindStore(SqliteSessionStore(args.store)) if args.store else None
+    game_server = GameServer(args.max_sessions, store)
+    try:
+        asyncio.run(_serve_forever(game_server, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        game_server.close()
+
+
+if __name__ == "__main__":
+    main()
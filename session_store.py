@@ -0,0 +1,261 @@
+"""
+Persistance des sessions du serveur de parties
+Un magasin conserve, pour chaque session, un instantané compact de la partie (savegame.py) et son
+journal d'actions (action_log.py), de quoi la reprendre après un redémarrage du processus.
+
+Magasins interchangeables (mêmes méthodes save_many, delete_many, load, max_id, close) :
+    MemorySessionStore : dictionnaire en mémoire (tests, serveur sans disque)
+    SqliteSessionStore : base SQLite (par défaut)
+WriteBehindStore les enveloppe : les écritures sont mises en attente et regroupées (une seule par
+session, la plus récente) puis écrites par lots par un fil d'exécution en arrière-plan, sans
+bloquer la boucle du serveur ; les lectures voient les écritures encore en attente. Un lot en échec
+est remis en attente (réessayé après flush_interval) et l'erreur est relancée par l'appel suivant
+de put, delete, flush ou close.
+"""
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_FLUSH_INTERVAL = 0.5
+
+# Enregistrement d'une session : snapshot (savegame.dumps) et actions (ActionLog.getvalue) en binaire
+SessionRecord = namedtuple("SessionRecord",
+                           ["session_id", "seed", "rows", "cols", "difficulty", "turns", "snapshot", "actions"])
+
+
+class MemorySessionStore:
+    """Magasin en mémoire"""
+
+    def __init__(self):
+        self.records = {}
+
+    def save_many(self, records):
+        for record in records:
+            self.records[record.session_id] = record
+
+    def delete_many(self, session_ids):
+        for session_id in session_ids:
+            self.records.pop(session_id, None)
+
+    def load(self, session_id):
+        """Obtenir l'enregistrement d'une session (None si elle est inconnue)"""
+        return self.records.get(session_id)
+
+    def max_id(self):
+        """Plus grand identifiant enregistré (0 si le magasin est vide)"""
+        return max(self.records, default=0)
+
+    def close(self):
+        pass
+
+
+class SqliteSessionStore:
+    """Magasin SQLite (une ligne par session ; connexion partagée entre fils, protégée par un verrou)"""
+
+    def __init__(self, path=":memory:"):
+        """
+        Ouvrir (ou créer) la base
+
+        Args:
+            path: Chemin du fichier SQLite (":memory:" pour une base temporaire)
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.connection:
+            if path != ":memory:":
+                self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "session_id INTEGER PRIMARY KEY, seed INTEGER NOT NULL, rows INTEGER NOT NULL, "
+                "cols INTEGER NOT NULL, difficulty TEXT NOT NULL, turns INTEGER NOT NULL, "
+                "updated REAL NOT NULL, snapshot BLOB NOT NULL, actions BLOB NOT NULL)"
+            )
+
+    def save_many(self, records):
+        """Enregistrer des sessions en une seule transaction"""
+        now = time.time()
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(r.session_id, r.seed, r.rows, r.cols, r.difficulty, r.turns, now, r.snapshot, r.actions)
+                 for r in records],
+            )
+
+    def delete_many(self, session_ids):
+        """Supprimer des sessions en une seule transaction"""
+        with self.lock, self.connection:
+            self.connection.executemany("DELETE FROM sessions WHERE session_id = ?",
+                                        [(session_id,) for session_id in session_ids])
+
+    def load(self, session_id):
+        """Obtenir l'enregistrement d'une session (None si elle est inconnue)"""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT session_id, seed, rows, cols, difficulty, turns, snapshot, actions "
+                "FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return SessionRecord(*row[:6], bytes(row[6]), bytes(row[7])) if row else None
+
+    def max_id(self):
+        """Plus grand identifiant enregistré (0 si le magasin est vide)"""
+        with self.lock:
+            return self.connection.execute("SELECT COALESCE(MAX(session_id), 0) FROM sessions").fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+class WriteBehindStore:
+    """
+    Écriture différée devant un magasin : put() met l'enregistrement en attente et rend la main ;
+    un fil d'arrière-plan écrit les lots (au plus batch_size sessions, au plus tard après
+    flush_interval secondes). Plusieurs put() d'une même session avant l'écriture n'en font qu'une.
+    Un lot en échec est remis en attente (sauf à la fermeture) et réessayé après flush_interval.
+    """
+
+    def __init__(self, backend, batch_size=DEFAULT_BATCH_SIZE, flush_interval=DEFAULT_FLUSH_INTERVAL):
+        """
+        Args:
+            backend: Magasin sous-jacent (SqliteSessionStore, MemorySessionStore...)
+            batch_size: Nombre de sessions qui déclenche une écriture immédiate
+            flush_interval: Délai maximal (s) avant l'écriture d'un lot incomplet
+        """
+        self.backend = backend
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # session_id -> enregistrement, ou None pour une suppression
+        self._pending = {}
+        self._writing = {}
+        self._condition = threading.Condition()
+        self._flushing = False
+        self._closed = False
+        self.batches = 0
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name="WriteBehindStore", daemon=True)
+        self._thread.start()
+
+    def _raise_error(self):
+        """Relancer (une seule fois) la dernière erreur d'écriture du fil d'arrière-plan"""
+        with self._condition:
+            error, self.error = self.error, None
+        if error is not None:
+            raise error
+
+    def put(self, record):
+        """
+        Mettre un enregistrement en attente d'écriture
+
+        Raises:
+            Exception: la dernière erreur d'écriture du fil d'arrière-plan (l'enregistrement reste en attente)
+        """
+        with self._condition:
+            self._pending[record.session_id] = record
+            if len(self._pending) == 1 or len(self._pending) >= self.batch_size:
+                self._condition.notify_all()
+        self._raise_error()
+
+    def delete(self, session_id):
+        """
+        Mettre une suppression en attente
+
+        Raises:
+            Exception: la dernière erreur d'écriture du fil d'arrière-plan (la suppression reste en attente)
+        """
+        with self._condition:
+            self._pending[session_id] = None
+            self._condition.notify_all()
+        self._raise_error()
+
+    def load(self, session_id):
+        """Obtenir l'enregistrement d'une session, en tenant compte des écritures en attente"""
+        with self._condition:
+            for pending in (self._pending, self._writing):
+                if session_id in pending:
+                    return pending[session_id]
+        return self.backend.load(session_id)
+
+    def max_id(self):
+        with self._condition:
+            pending = max((key for key, record in self._pending.items() if record is not None), default=0)
+        return max(pending, self.backend.max_id())
+
+    def _run(self):
+        """Boucle du fil d'écriture"""
+        condition = self._condition
+        while True:
+            with condition:
+                while not self._pending and not self._closed:
+                    condition.wait()
+                deadline = time.monotonic() + self.flush_interval
+                while len(self._pending) < self.batch_size and not (self._flushing or self._closed):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    condition.wait(remaining)
+                if not self._pending and self._closed:
+                    return
+                self._writing, self._pending = self._pending, {}
+            batch = self._writing
+            try:
+                self.backend.save_many([record for record in batch.values() if record is not None])
+                self.backend.delete_many([key for key, record in batch.items() if record is None])
+                error = None
+            except Exception as e:
+                error = e
+            with condition:
+                self._writing = {}
+                self.batches += 1
+                if error is not None:
+                    # Relancée par l'appel suivant ; le lot est remis en attente (sauf si une écriture
+                    # plus récente de la même session l'a remplacé) et réessayé après flush_interval
+                    self.error = error
+                    if not self._closed:
+                        for key, record in batch.items():
+                            self._pending.setdefault(key, record)
+                condition.notify_all()
+                if error is not None:
+                    deadline = time.monotonic() + self.flush_interval
+                    while not self._closed:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        condition.wait(remaining)
+
+    def flush(self):
+        """
+        Attendre l'écriture de tout ce qui est en attente
+
+        Raises:
+            Exception: la dernière erreur d'écriture du fil d'arrière-plan, le cas échéant (les écritures
+                       en échec restent en attente)
+        """
+        with self._condition:
+            self._flushing = True
+            self._condition.notify_all()
+            while (self._pending or self._writing) and self.error is None:
+                self._condition.wait()
+            self._flushing = False
+        self._raise_error()
+
+    def close(self):
+        """
+        Écrire les enregistrements restants, arrêter le fil et fermer le magasin
+
+        Raises:
+            Exception: la dernière erreur d'écriture du fil d'arrière-plan (les écritures en échec
+                       à la fermeture ne sont pas réessayées)
+        """
+        if self._closed:
+            return
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        self.backend.close()
+        self._raise_error()
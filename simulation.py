@@ -0,0 +1,244 @@
+"""
+Simulation de parties sans interface (Monte Carlo)
+Les parties sont jouées par une politique qui choisit parmi les actions légales,
+appliquées par la même table de dispatch que la relecture des journaux
+"""
+import random
+from collections import deque
+import action_log
+import config
+from game import Game, GameState
+from item import TreasureChest, DiggingSpot, Locker
+from replay import apply_action
+
+
+_OPPOSITE = {"UP": "DOWN", "DOWN": "UP", "LEFT": "RIGHT", "RIGHT": "LEFT"}
+
+
+def legal_actions(game):
+    """
+    Lister les actions possibles dans l'état courant
+
+    Args:
+        game: Objet Game
+
+    Returns:
+        list: liste de (code d'action, argument)
+    """
+    actions = []
+    state = game.state
+    if state == GameState.PLAYING or state == GameState.SELECTING_DIRECTION:
+        room = game.get_current_room()
+        if room is None:
+            return actions
+        for direction in room.door_objects:
+            actions.append((action_log.MOVE, action_log.DIRECTION_CODES[direction]))
+        if room.items:
+            actions.append((action_log.OPEN_ITEMS, 0))
+        if room.effects and room.effects.get("shop"):
+            actions.append((action_log.OPEN_SHOP, 0))
+    elif state == GameState.SELECTING_ROOM:
+        for i in range(len(game.available_rooms)):
+            actions.append((action_log.CHOOSE_ROOM, i))
+        if game.player.inventory.dice.has(1):
+            actions.append((action_log.REROLL, game.selected_room_index))
+        actions.append((action_log.CANCEL_SELECTION, 0))
+    elif state == GameState.PICKING_ITEMS:
+        room = game.get_current_room()
+        for i in range(len(room.items) if room else 0):
+            actions.append((action_log.INTERACT, i))
+        actions.append((action_log.CLOSE_MENU, 0))
+    elif state == GameState.SHOP:
+        room = game.get_current_room()
+        for i in range(len(room.effects.get("items", [])) if room and room.effects else 0):
+            actions.append((action_log.BUY, i))
+        actions.append((action_log.CLOSE_MENU, 0))
+    return actions
+
+
+def random_policy(game, actions, rng):
+    """
+    Politique aléatoire : préfère avancer plutôt qu'annuler ou fermer un menu
+
+    Args:
+        game: Objet Game
+        actions: Actions légales
+        rng: Générateur aléatoire propre à la politique (ne perturbe pas celui du jeu)
+
+    Returns:
+        tuple: (code d'action, argument)
+    """
+    preferred = [a for a in actions if a[0] not in (action_log.CANCEL_SELECTION, action_log.CLOSE_MENU)]
+    if preferred and rng.random() < 0.9:
+        return rng.choice(preferred)
+    return rng.choice(actions)
+
+
+def _usable(item, inventory):
+    """Vérifier qu'un objet de salle peut être pris ou ouvert sans gaspiller les clés nécessaires aux portes"""
+    if isinstance(item, TreasureChest):
+        return inventory.hammer.has() or inventory.keys.has(2)
+    if isinstance(item, DiggingSpot):
+        return inventory.shovel.has()
+    if isinstance(item, Locker):
+        return inventory.keys.has(2)
+    return True
+
+
+def _route(game, blocked, row_weight):
+    """
+    Chercher la case de frontière la plus intéressante accessible depuis le joueur (parcours en largeur)
+
+    Args:
+        game: Objet Game
+        blocked: Portes (ligne, colonne, direction) derrière lesquelles aucune salle n'a pu être placée
+        row_weight: Coût d'une ligne d'écart avec la première ligne (Hall Avant)
+
+    Returns:
+        str: Première direction du chemin, ou None si aucune case de frontière n'est accessible
+    """
+    mansion = game.mansion
+    player = game.player
+    start = (player.row, player.col)
+    # Case atteinte -> première direction du chemin depuis le joueur
+    first = {start: None}
+    queue = deque([(start, 0)])
+    best = None
+    while queue:
+        (row, col), distance = queue.popleft()
+        for direction, door in mansion.rooms[row, col].door_objects.items():
+            dr, dc = config.DIRECTIONS[direction]
+            target = (row + dr, col + dc)
+            if target in first or not mansion.in_bounds(*target):
+                continue
+            if not door.opened and not door.can_open(player)[0]:
+                continue
+            step = first[row, col] or direction
+            neighbour = mansion.rooms.get(target)
+            if neighbour is None:
+                if (row, col, direction) in blocked:
+                    continue
+                # Pas jusqu'à la case, lignes restant à franchir, clé éventuelle
+                cost = distance + 1 + row_weight * target[0] + (0 if door.opened or door.lock_level == 0 else 1)
+                if best is None or cost < best[0]:
+                    best = (cost, step)
+            elif _OPPOSITE[direction] in neighbour.door_objects:
+                first[target] = step
+                queue.append((target, distance + 1))
+    return None if best is None else best[1]
+
+
+class GreedyPolicy:
+    """
+    Politique orientée vers le Hall Avant : ramasse les objets utiles, rejoint par le plus court chemin
+    la case de frontière la plus proche de la première ligne et y place la salle la plus prometteuse
+    (Hall Avant, puis porte vers le haut et nombre de portes) ; une action sur epsilon est aléatoire,
+    pour que les parties simulées d'une même graine diffèrent.
+
+    La politique mémorise les portes derrière lesquelles aucune salle n'a pu être placée ; cette mémoire
+    est propre à une partie (run_game crée un générateur de politique par partie). Une instance ne
+    doit donc servir qu'à des parties jouées l'une après l'autre.
+    """
+
+    def __init__(self, epsilon=0.1, row_weight=2.0):
+        """
+        Args:
+            epsilon: Probabilité de jouer une action aléatoire (random_policy)
+            row_weight: Coût d'une ligne d'écart avec la première ligne dans le choix de la case visée
+        """
+        self.epsilon = epsilon
+        self.row_weight = row_weight
+        self._rng = None
+        self._blocked = set()
+        self._last_move = None
+
+    def __call__(self, game, actions, rng):
+        if rng is not self._rng:
+            # Nouvelle partie
+            self._rng = rng
+            self._blocked = set()
+            self._last_move = None
+        player = game.player
+        if self._last_move is not None:
+            # Déplacement vers une case vide resté sans effet : aucune salle ne peut y être placée
+            if game.state == GameState.PLAYING and self._last_move[:2] == (player.row, player.col):
+                self._blocked.add(self._last_move)
+            self._last_move = None
+        if rng.random() < self.epsilon:
+            action = random_policy(game, actions, rng)
+        else:
+            action = self._choose(game, actions, rng)
+        if action[0] == action_log.MOVE:
+            self._last_move = (player.row, player.col, action_log.DIRECTIONS[action[1]])
+        return action
+
+    def _choose(self, game, actions, rng):
+        """Action orientée vers le Hall Avant dans l'état courant"""
+        state = game.state
+        inventory = game.player.inventory
+        room = game.get_current_room()
+        if state == GameState.SELECTING_ROOM:
+            best = None
+            for index, offered in enumerate(game.available_rooms):
+                if not inventory.gems.has(offered.gem_cost):
+                    continue
+                if offered.name == "Hall Avant":
+                    return action_log.CHOOSE_ROOM, index
+                score = 3 * ("UP" in offered.doors) + len(offered.doors) - offered.gem_cost
+                if best is None or score > best[0]:
+                    best = (score, index)
+            if best is not None:
+                return action_log.CHOOSE_ROOM, best[1]
+            if inventory.dice.has(1):
+                return action_log.REROLL, game.selected_room_index
+            return action_log.CANCEL_SELECTION, 0
+        if state == GameState.PICKING_ITEMS:
+            for index, item in enumerate(room.items if room else ()):
+                if _usable(item, inventory):
+                    return action_log.INTERACT, index
+            return action_log.CLOSE_MENU, 0
+        if state == GameState.SHOP:
+            return action_log.CLOSE_MENU, 0
+        if room is not None and any(_usable(item, inventory) for item in room.items):
+            return action_log.OPEN_ITEMS, 0
+        direction = _route(game, self._blocked, self.row_weight)
+        if direction is not None:
+            return action_log.MOVE, action_log.DIRECTION_CODES[direction]
+        # Aucune case de frontière accessible : exploration aléatoire
+        return random_policy(game, actions, rng)
+
+
+def run_game(seed, policy=random_policy, max_actions=1000, before_action=None, after_action=None, game=None,
+             policy_seed=None):
+    """
+    Jouer une partie complète sans rendu
+
+    Args:
+        seed: Graine de la partie (et de la politique)
+        policy: Fonction (game, actions, rng) -> (code, argument)
+        max_actions: Nombre maximal d'actions
+        before_action: Fonction appelée avant chaque action (game, turn, action, arg)
+        after_action: Fonction appelée après chaque action (game, turn, action, arg)
+        game: Partie déjà créée avec cette graine (sinon une nouvelle partie est créée)
+        policy_seed: Graine de la politique (la graine de la partie si None)
+
+    Returns:
+        tuple: (objet Game final, nombre d'actions jouées)
+    """
+    if game is None:
+        game = Game(seed=seed)
+    rng = random.Random(seed if policy_seed is None else policy_seed)
+    turn = 0
+    while turn < max_actions and game.state != GameState.GAME_OVER:
+        actions = legal_actions(game)
+        if not actions:
+            break
+        action, arg = policy(game, actions, rng)
+        if before_action is not None:
+            before_action(game, turn, action, arg)
+        apply_action(game, action, arg)
+        game.update()
+        if after_action is not None:
+            after_action(game, turn, action, arg)
+        turn += 1
+    return game, turn
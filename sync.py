@@ -0,0 +1,458 @@
+"""
+Synchronisation de l'état d'une partie par différences binaires
+Le codeur compare l'état visible de la partie à celui du cadre précédent et n'émet que ce qui a changé
+(cases du manoir, bits des portes, variations d'inventaire, sélection, messages), avec un instantané
+complet périodique ; le décodeur applique les cadres à une partie miroir, affichable par `UI`.
+
+Cadre (petit-boutiste, entiers variables LEB128) :
+    drapeaux       : 1 octet (sections présentes, FULL pour un instantané complet)
+    FULL           : lignes, colonnes (la table des chaînes et les cases sont vidées)
+    STATE          : code de l'état de la partie (1 o)
+    POSITION       : ligne, colonne du joueur
+    INVENTORY      : nombre de variations, puis (identifiant ItemId, variation zigzag)
+    CELLS          : nombre de cases, puis (index row * cols + col, octet de case[, salle])
+                     octet de case : bit 7 salle complète, bit 6 explorée, bits 0-3 portes ouvertes ;
+                     salle : nom, portes présentes (bits 0-3), niveaux des serrures (2 bits par porte)
+    SELECTION      : salles proposées (nombre, noms), index de la salle, de l'objet, de l'article,
+                     direction choisie (255 : aucune)
+    MESSAGES       : message courant, message de fin de partie
+
+Les chaînes (noms de salles, messages) sont transmises une seule fois par instantané : une chaîne est
+désignée par son index dans la table, un index égal à la taille de la table annonce une nouvelle chaîne
+(suivie de sa longueur et de son UTF-8).
+"""
+import config
+import pool
+from door import Door
+from events import EventType
+from game import GameState
+from mansion import Mansion
+from room import Room
+from savegame import get_prototypes
+
+
+FULL = 0x01
+STATE = 0x02
+POSITION = 0x04
+INVENTORY = 0x08
+CELLS = 0x10
+SELECTION = 0x20
+MESSAGES = 0x40
+
+DEFAULT_KEYFRAME_INTERVAL = 64
+
+_STATES = (GameState.PLAYING, GameState.SELECTING_ROOM, GameState.SELECTING_DIRECTION,
+           GameState.GAME_OVER, GameState.SHOP, GameState.PICKING_ITEMS)
+_STATE_CODES = {state: code for code, state in enumerate(_STATES)}
+_DIRECTIONS = ("UP", "DOWN", "LEFT", "RIGHT")
+_DIRECTION_CODES = {direction: code for code, direction in enumerate(_DIRECTIONS)}
+_NONE = 255
+
+_CELL_ROOM = 0x80
+_CELL_EXPLORED = 0x40
+
+_NEIGHBOURHOOD = ((0, 0),) + tuple(config.DIRECTIONS.values())
+
+
+def _varint(out, value):
+    """Écrire un entier positif en LEB128"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _string(out, text):
+    data = text.encode("utf-8")
+    _varint(out, len(data))
+    out += data
+
+
+def _cell(room):
+    """État d'une case : (nom, portes, serrures, portes ouvertes, explorée)"""
+    doors = locks = opened = 0
+    for direction, door in room.door_objects.items():
+        code = _DIRECTION_CODES[direction]
+        doors |= 1 << code
+        locks |= door.lock_level << (2 * code)
+        if door.opened:
+            opened |= 1 << code
+    return (room.name, doors, locks, opened, room.explored)
+
+
+def _capture(game):
+    """
+    Relever l'état visible d'une partie, hors cases du manoir (voir StateEncoder._update_cells)
+
+    Returns:
+        tuple: (dimensions, état, position, inventaire, sélection, messages)
+    """
+    mansion, player = game.mansion, game.player
+    selection = (
+        tuple(room.name for room in game.available_rooms),
+        game.selected_room_index, game.item_selection_index, game.shop_selection_index,
+        _NONE if game.selected_direction is None else _DIRECTION_CODES[game.selected_direction],
+    )
+    return ((mansion.rows, mansion.cols), game.state, (player.row, player.col), tuple(player.inventory.counts),
+            selection, (game.message, game.game_over_message))
+
+
+class CellTracker:
+    """
+    Cases du manoir modifiées d'un relevé à l'autre
+
+    Même principe que zobrist.ZobristHash : les salles placées et les portes ouvertes sont signalées
+    par le flux d'événements, les autres changements d'une case (exploration, portes) se limitent au
+    voisinage de l'ancienne et de la nouvelle position du joueur. Un remplacement en bloc de l'état
+    (reset, restart, chargement d'une sauvegarde, nouveau manoir) impose un relevé complet.
+    """
+
+    def __init__(self, game):
+        """
+        Args:
+            game: Objet Game suivi (un récepteur est abonné à son flux d'événements)
+        """
+        self.game = game
+        # Cases signalées par le flux d'événements depuis le dernier relevé
+        self._cells = set()
+        self._mansion = None
+        self._deck = None
+        self._position = None
+        game.events.subscribe(self)
+
+    def write(self, event):
+        """Récepteur d'événements : noter les cases touchées"""
+        if event.type is EventType.ROOM_PLACED or event.type is EventType.DOOR_OPENED:
+            self._cells.add((event.data["row"], event.data["col"]))
+
+    def reset(self):
+        """Imposer un relevé complet au prochain appel de changes()"""
+        self._mansion = None
+
+    def changes(self):
+        """
+        Relever les cases modifiées depuis l'appel précédent
+
+        Returns:
+            set: Positions (ligne, colonne) à relever, ou None si toutes les cases doivent l'être
+        """
+        game = self.game
+        mansion, deck = game.mansion, game.room_selector.available_rooms
+        position = (game.player.row, game.player.col)
+        cells = self._cells
+        if mansion is not self._mansion or deck is not self._deck:
+            self._mansion, self._deck, self._position = mansion, deck, position
+            cells.clear()
+            return None
+        for row, col in {self._position, position}:
+            for dr, dc in _NEIGHBOURHOOD:
+                cells.add((row + dr, col + dc))
+        self._position = position
+        self._cells = set()
+        return cells
+
+    def close(self):
+        """Désabonner le récepteur du flux d'événements"""
+        self.game.events.unsubscribe(self)
+
+
+class StateEncoder:
+    """Codeur des cadres de synchronisation d'une partie"""
+
+    def __init__(self, game, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL):
+        """
+        Initialisation du codeur
+
+        Args:
+            game: Objet Game observé
+            keyframe_interval: Nombre de cadres entre deux instantanés complets
+        """
+        self.game = game
+        self.keyframe_interval = keyframe_interval
+        self._last = None
+        self._strings = {}
+        self._since_full = 0
+        # Cases du manoir (index -> état de la case), relevées case par case d'un cadre à l'autre
+        self._tracker = CellTracker(game)
+        self._cells = {}
+
+    def close(self):
+        """Désabonner le codeur du flux d'événements de la partie"""
+        self._tracker.close()
+
+    def request_full(self):
+        """Forcer un instantané complet au prochain cadre (nouveau client, désynchronisation)"""
+        self._last = None
+
+    def _string(self, out, text):
+        code = self._strings.get(text)
+        if code is None:
+            code = len(self._strings)
+            self._strings[text] = code
+            _varint(out, code)
+            _string(out, text)
+        else:
+            _varint(out, code)
+
+    def _update_cells(self):
+        """
+        Mettre à jour les cases du manoir depuis le cadre précédent
+
+        Returns:
+            dict: index -> état précédent (None : case nouvellement occupée) des cases modifiées
+        """
+        mansion = self.game.mansion
+        changed = self._tracker.changes()
+        previous = self._cells
+        if changed is None:
+            # Remplacement en bloc de l'état : relevé complet, comparé au précédent
+            cols = mansion.cols
+            cells = self._cells = {row * cols + col: _cell(room) for (row, col), room in mansion.rooms.items()}
+            return {index: previous.get(index) for index in cells.keys() | previous.keys()
+                    if previous.get(index) != cells.get(index)}
+        rows, cols, rooms = mansion.rows, mansion.cols, mansion.rooms
+        updates = {}
+        for row, col in changed:
+            if not (0 <= row < rows and 0 <= col < cols):
+                continue
+            index = row * cols + col
+            room = rooms.get((row, col))
+            cell = _cell(room) if room is not None else None
+            old = previous.get(index)
+            if cell != old:
+                updates[index] = old
+                if cell is None:
+                    del previous[index]
+                else:
+                    previous[index] = cell
+        return updates
+
+    def encode(self):
+        """
+        Coder l'état courant de la partie
+
+        Returns:
+            bytes: Cadre (instantané complet ou différences depuis le cadre précédent)
+        """
+        current = _capture(self.game)
+        updates = self._update_cells()
+        cells = self._cells
+        last = self._last
+        dims, state, position, inventory, selection, messages = current
+        full = (last is None or self._since_full >= self.keyframe_interval or last[0] != dims
+                or any(index not in cells for index in updates))
+        if full:
+            self._strings.clear()
+            self._since_full = 0
+            last = (None, None, None, (0,) * len(inventory), None, None)
+            updates = dict.fromkeys(cells)
+        else:
+            self._since_full += 1
+
+        body = bytearray()
+        flags = 0
+        if full:
+            flags |= FULL
+            _varint(body, dims[0])
+            _varint(body, dims[1])
+        if state != last[1]:
+            flags |= STATE
+            body.append(_STATE_CODES[state])
+        if position != last[2]:
+            flags |= POSITION
+            _varint(body, position[0])
+            _varint(body, position[1])
+        changes = [(item_id, count - previous)
+                   for item_id, (count, previous) in enumerate(zip(inventory, last[3])) if count != previous]
+        if changes:
+            flags |= INVENTORY
+            _varint(body, len(changes))
+            for item_id, delta in changes:
+                body.append(item_id)
+                _varint(body, (delta << 1) ^ (delta >> 63))
+        if updates:
+            flags |= CELLS
+            _varint(body, len(updates))
+            for index in sorted(updates):
+                name, doors, locks, opened, explored = cells[index]
+                _varint(body, index)
+                old = updates[index]
+                code = opened | (_CELL_EXPLORED if explored else 0)
+                if old is None or old[:3] != (name, doors, locks):
+                    body.append(code | _CELL_ROOM)
+                    self._string(body, name)
+                    body.append(doors)
+                    body.append(locks)
+                else:
+                    body.append(code)
+        if selection != last[4]:
+            flags |= SELECTION
+            offered = selection[0]
+            _varint(body, len(offered))
+            for name in offered:
+                self._string(body, name)
+            _varint(body, selection[1])
+            _varint(body, selection[2])
+            _varint(body, selection[3])
+            body.append(selection[4])
+        if messages != last[5]:
+            flags |= MESSAGES
+            self._string(body, messages[0])
+            self._string(body, messages[1])
+
+        self._last = current
+        return bytes((flags,)) + bytes(body)
+
+
+class StateDecoder:
+    """Décodeur des cadres : reproduit l'état visible sur une partie miroir (affichable par UI)"""
+
+    def __init__(self, game):
+        """
+        Initialisation du décodeur
+
+        Args:
+            game: Objet Game miroir (ses salles sont remplacées au premier instantané)
+        """
+        self.game = game
+        self.prototypes = get_prototypes()
+        self._strings = []
+        self._synced = False
+        self.data = b""
+        self.offset = 0
+
+    def _varint(self):
+        data = self.data
+        value = shift = 0
+        while True:
+            byte = data[self.offset]
+            self.offset += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+    def _byte(self):
+        value = self.data[self.offset]
+        self.offset += 1
+        return value
+
+    def _string(self):
+        code = self._varint()
+        strings = self._strings
+        if code == len(strings):
+            length = self._varint()
+            strings.append(bytes(self.data[self.offset:self.offset + length]).decode("utf-8"))
+            self.offset += length
+        elif code > len(strings):
+            raise ValueError("Chaîne inconnue dans le cadre")
+        return strings[code]
+
+    def _room(self, name, doors=None):
+        """Créer une salle miroir d'après le prototype de même nom"""
+        prototype = self.prototypes.get(name)
+        if doors is None:
+            doors = list(prototype.doors) if prototype else []
+        return Room.acquire(
+            name=name,
+            color=prototype.color if prototype else "BLUE",
+            rarity=prototype.rarity if prototype else 0,
+            gem_cost=prototype.gem_cost if prototype else 0,
+            doors=doors,
+            effects=pool.clone_effects(prototype.effects, {}) if prototype else None,
+            placement_condition=prototype.placement_condition if prototype else None,
+            image_path=prototype.image_path if prototype else None,
+        )
+
+    def apply(self, frame):
+        """
+        Appliquer un cadre à la partie miroir
+
+        Args:
+            frame: Cadre produit par StateEncoder.encode
+
+        Raises:
+            ValueError: si le cadre est invalide ou si aucun instantané complet n'a encore été reçu
+        """
+        self.data = memoryview(frame)
+        self.offset = 0
+        try:
+            self._apply()
+        except IndexError:
+            raise ValueError("Cadre de synchronisation tronqué") from None
+
+    def _apply(self):
+        game = self.game
+        flags = self._byte()
+        if flags & FULL:
+            rows, cols = self._varint(), self._varint()
+            if self._synced:
+                # Salles créées par le décodeur : elles retournent à la réserve
+                released = list(game.mansion.rooms.values()) + game.available_rooms
+            else:
+                # Avant la première synchronisation, les salles placées et proposées peuvent encore être
+                # référencées par la pioche de la partie miroir ; seule la salle d'entrée (créée par le
+                # manoir, hors pioche) lui est propre
+                released = [game.mansion.entrance_room] if game.mansion.entrance_room is not None else []
+            game.available_rooms = []
+            if (game.mansion.rows, game.mansion.cols) != (rows, cols):
+                game.mansion = Mansion(rows, cols)
+                # Salle d'entrée du nouveau manoir, aussitôt remplacée par les cases du cadre
+                released.append(game.mansion.entrance_room)
+            pool.release_rooms(released)
+            game.mansion.clear()
+            game.player.inventory.restore([0] * len(game.player.inventory.counts))
+            self._strings.clear()
+            self._synced = True
+        elif not self._synced:
+            raise ValueError("Le premier cadre doit être un instantané complet")
+        mansion = game.mansion
+
+        if flags & STATE:
+            game.state = _STATES[self._byte()]
+        if flags & POSITION:
+            game.player.row, game.player.col = self._varint(), self._varint()
+        if flags & INVENTORY:
+            delta = [0] * len(game.player.inventory.counts)
+            for _ in range(self._varint()):
+                item_id = self._byte()
+                value = self._varint()
+                delta[item_id] = (value >> 1) ^ -(value & 1)
+            game.player.inventory.apply_delta(delta)
+        if flags & CELLS:
+            for _ in range(self._varint()):
+                row, col = divmod(self._varint(), mansion.cols)
+                code = self._byte()
+                if code & _CELL_ROOM:
+                    name = self._string()
+                    doors, locks = self._byte(), self._byte()
+                    room = self._room(name, [d for i, d in enumerate(_DIRECTIONS) if doors >> i & 1])
+                    for direction in room.doors:
+                        i = _DIRECTION_CODES[direction]
+                        room.door_objects[direction] = Door.acquire(direction, (locks >> (2 * i)) & 0x03)
+                    old = mansion.rooms.get((row, col))
+                    if old is not None:
+                        pool.release_rooms([old])
+                    mansion.restore_room(row, col, room)
+                else:
+                    room = mansion.rooms.get((row, col))
+                    if room is None:
+                        raise ValueError("Mise à jour d'une case vide")
+                room.explored = bool(code & _CELL_EXPLORED)
+                for direction, door in room.door_objects.items():
+                    door.opened = bool(code >> _DIRECTION_CODES[direction] & 1)
+        if flags & SELECTION:
+            offered = [self._string() for _ in range(self._varint())]
+            if not flags & FULL:
+                pool.release_rooms(game.available_rooms)
+            game.available_rooms = [self._room(name) for name in offered]
+            game.selected_room_index = self._varint()
+            game.item_selection_index = self._varint()
+            game.shop_selection_index = self._varint()
+            direction = self._byte()
+            game.selected_direction = None if direction == _NONE else _DIRECTIONS[direction]
+        if flags & MESSAGES:
+            game.message = self._string()
+            game.game_over_message = self._string()
+        if self.offset != len(self.data):
+            raise ValueError("Données superflues dans le cadre")
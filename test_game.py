@@ -8,11 +8,42 @@ sys.path.insert(0, '.')
 from player import Player
 from mansion import Mansion
 from inventory import Inventory
-from room import Room
-from door import Door
-from rooms_data import create_room_templates
+from item import ConsumableItem, FoodItem, ItemId
+from room import Room, PLACEMENT_MASK_CACHE_SIZE, placement_masks, static_condition
+from door import Door, lock_table, roll_lock_levels
+from rooms_data import create_room_templates, load_room_catalog
 from room_selector import RoomSelector
+from game import Game, GameState
+from action_log import ActionLog
+from replay import Replay, apply_action
+from events import EventType, RingBufferSink, BatchedWriterSink
+from ui import Camera
+import action_log
+import analytics
+import base64
+import broadcast
+import asyncio
+import csv
+import json
+import os
+import tempfile
+import time
+import savegame
+import server
+import session_store
+import difficulty
+import loot
+import pool
+import rl_env
+import simulation
+import sync
+import random
 import config
+import daily
+import verify
+import zobrist
+import thumbnails
+import pygame
 
 
 def test_inventory():
@@ -52,7 +83,15 @@ def test_mansion():
     # Vérification de la taille de la grille
     assert len(mansion.grid) == config.GRID_ROWS, "Le nombre de lignes de la grille devrait être correct"
     assert len(mansion.grid[0]) == config.GRID_COLS, "Le nombre de colonnes de la grille devrait être correct"
-    
+
+    # Frontière : une impasse devant l'entrée ferme le manoir
+    player = Player()
+    assert not mansion.check_lose_condition(player)[0], "La case derrière l'entrée devrait rester à explorer"
+    mansion.set_room(config.ENTRANCE_ROW - 1, config.ENTRANCE_COL, Room("Impasse", doors=['DOWN']))
+    assert not mansion.frontier, "Plus aucune case libre ne devrait se trouver derrière une porte"
+    lost, reason = mansion.check_lose_condition(player)
+    assert lost and "sans issue" in reason, "Un manoir sans frontière ni Hall Avant devrait être perdu"
+
     print("✓ Test du système de manoir réussi")
 
 
@@ -117,6 +156,150 @@ def test_door():
     print("✓ Test du système de porte réussi")
 
 
+def test_lock_tables():
+    """Teste les tables de verrouillage par ligne et la conservation des portes"""
+    print("Test des tables de verrouillage...")
+    table = lock_table(5)
+    assert table[4] == 0 and table[0] == 2, "L'entrée et le Hall Avant devraient avoir un niveau fixe"
+    assert all(isinstance(table[row], tuple) for row in (1, 2, 3)), "Les lignes intermédiaires devraient être tirées"
+    assert lock_table(5) is table, "La table devrait être calculée une seule fois"
+    
+    random.seed(9)
+    levels = roll_lock_levels(2, 4, 5)
+    random.seed(9)
+    assert levels == [Door('UP', row=2, grid_rows=5).lock_level for _ in range(4)], \
+        "Le tirage groupé devrait donner les mêmes niveaux que des portes créées une à une"
+    
+    room = Room("Test", doors=['UP', 'LEFT'])
+    room.set_position(2, 2)
+    doors = dict(room.door_objects)
+    doors['UP'].opened = True
+    state = random.getstate()
+    room.set_position(2, 3)
+    assert random.getstate() == state, "Rester sur la même ligne ne devrait pas retirer les serrures"
+    room.set_position(3, 3)
+    assert all(room.door_objects[d] is doors[d] for d in doors), "Les objets porte devraient être conservés"
+    assert room.door_objects['UP'].opened, "Une porte ouverte devrait le rester"
+    
+    print("✓ Test des tables de verrouillage réussi")
+
+
+def test_difficulty():
+    """Teste les profils de difficulté et leurs tables de tirage"""
+    print("Test des profils de difficulté...")
+    normal = difficulty.get_profile("normal")
+    assert difficulty.get_profile("normal") is normal, "Un profil devrait être compilé une seule fois"
+    assert loot.roll(normal.chest, loot.multipliers(find=0.0)) == [], "Un facteur nul ne devrait rien donner"
+    contents = loot.roll(normal.chest, loot.multipliers(find=100.0))
+    assert len(contents) == len(normal.chest), "Un facteur élevé devrait donner toutes les entrées"
+    assert contents[3] == loot.Reward(ItemId.DICE, 1, ""), "Les quantités fixes devraient être conservées"
+
+    # Objets des salles spéciales : table compilée par profil, tirée par loot.roll
+    kitchen = next(room for room in create_room_templates() if room.name == "Cuisine")
+    assert "items" not in kitchen.effects and kitchen.effects["loot"], "Les objets tirés devraient former une table"
+    special = normal.special_items(kitchen.effects["loot"])
+    assert special is normal.special_items(kitchen.effects["loot"]), "La table devrait être compilée une seule fois"
+    easy = difficulty.get_profile("facile").special_items(kitchen.effects["loot"])
+    assert [entry[0] for entry in easy] == [1.5 * entry[0] for entry in special], "Le profil devrait pondérer la table"
+    meals = loot.roll(special, loot.multipliers(find=100.0))
+    assert [(meal.name, meal.steps_restored) for meal in meals] == [("Sandwich", 15), ("Repas Copieux", 25)]
+    kitchen.items.clear()
+    kitchen.generate_items(Inventory())
+    foods = [(item.name, item.steps_restored) for item in kitchen.items if isinstance(item, FoodItem)]
+    assert all(food in (("Sandwich", 15), ("Repas Copieux", 25)) for food in foods)
+
+    try:
+        game = Game(seed=1, difficulty="difficile")
+        assert game.difficulty == "difficile" and difficulty.active().name == "difficile", "Le profil devrait être activé"
+        assert lock_table(5) != lock_table(5, normal.lock_bands), "Les serrures devraient suivre le profil actif"
+        difficulty.set_profile("normal")
+        game.restart()
+        assert difficulty.active().name == "difficile", "Le redémarrage devrait conserver le profil de la partie"
+        try:
+            difficulty.set_profile("impossible")
+            assert False, "Un profil inconnu devrait être refusé"
+        except ValueError:
+            pass
+    finally:
+        difficulty.set_profile("normal")
+    
+    print("✓ Test des profils de difficulté réussi")
+
+
+def test_loot():
+    """Teste le moteur de butin (récompenses typées, application par lots, anciennes sauvegardes)"""
+    print("Test du moteur de butin...")
+    table = loot.compile_table([
+        {"probability": 1.0, "reward": {"type": "reward", "kind": "coins", "amount": [2, 4]}},
+        {"probability": 0.5, "scale": "key_coin", "reward": {"type": "reward", "kind": "keys", "amount": 1}},
+        {"probability": 1.0, "reward": {"type": "reward", "kind": "steps", "choices": [["Pomme", 2], ["Gâteau", 10]],
+                                        "weights": [0, 1]}},
+    ])
+    inventory = Inventory()
+    inventory.metal_detector.add()
+    assert loot.multipliers(inventory)[2] > 1.0, "Le détecteur de métaux devrait augmenter le facteur key_coin"
+    rewards = loot.roll(table, loot.multipliers(key_coin=2.0))
+    assert [reward.kind for reward in rewards] == [ItemId.COINS, ItemId.KEYS, ItemId.STEPS], "Toutes les entrées certaines devraient sortir"
+    assert 2 <= rewards[0].amount <= 4 and rewards[2] == loot.Reward(ItemId.STEPS, 10, "Gâteau"), "Quantités et poids devraient être respectés"
+    
+    coins, keys, steps = inventory.coins.amount, inventory.keys.amount, inventory.steps.amount
+    loot.apply_batch([rewards, rewards, [loot.Reward(ItemId.SHOVEL, 1, "")]], inventory)
+    assert inventory.coins.amount == coins + 2 * rewards[0].amount, "Les pièces devraient être cumulées"
+    assert inventory.keys.amount == keys + 2 and inventory.steps.amount == steps + 20, "Les clés et les pas devraient être ajoutés"
+    assert inventory.shovel.has(), "L'article permanent devrait être ajouté"
+    
+    print("✓ Test du moteur de butin réussi")
+
+
+def test_item_ids():
+    """Teste les identifiants entiers des objets (dispatch de l'inventaire, ramassage, boutique)"""
+    print("Test des identifiants d'objets...")
+    inventory = Inventory()
+    assert all(inventory.slots[item_id].item_id == item_id for item_id in ItemId), "Chaque identifiant devrait avoir son emplacement"
+    gems = inventory.gems.amount
+    inventory.add_item(ItemId.GEMS, 3)
+    inventory.add_permanent_item("Patte de lapin porte-bonheur")
+    assert inventory.gems.amount == gems + 3 and inventory.lucky_rabbit_foot.has(), "Les ajouts devraient passer par l'identifiant"
+    
+    # Les noms du catalogue ("Pièce d’or", "Clé"...) sont résolus en identifiants à la création
+    game = Game(seed=2)
+    player = game.player
+    room = game.get_current_room()
+    coins = ConsumableItem("Pièce d’or", 40)
+    assert coins.item_id == ItemId.COINS, "Le nom du catalogue devrait être résolu"
+    room.items.append(coins)
+    before = player.inventory.coins.amount
+    success, _ = player.pick_up_item(coins, game.mansion)
+    assert success and player.inventory.coins.amount == before + 40, "Les pièces du catalogue devraient être ramassées"
+    
+    room.effects = {"shop": True, "items": [{"name": "Clé", "price": 10, "item": ConsumableItem("Clé", 1)}]}
+    player.inventory.coins.amount, keys = 10, player.inventory.keys.amount
+    game.buy(0)
+    assert player.inventory.coins.amount == 0 and player.inventory.keys.amount == keys + 1, "L'achat devrait donner une clé"
+    
+    
+    # Vecteur de quantités : variations en bloc, instantanés, cache des multiplicateurs
+    inventory = Inventory()
+    snapshot = inventory.snapshot()
+    assert inventory.get_item_find_probability() == 1.0
+    delta = [0] * len(inventory.counts)
+    delta[ItemId.KEYS], delta[ItemId.RABBIT_FOOT] = 2, 1
+    inventory.apply_delta(delta)
+    assert inventory.keys.amount == 2 and inventory.get_item_find_probability() == 1.5, "Le cache devrait être invalidé"
+    delta[ItemId.GEMS] = -100
+    try:
+        inventory.apply_delta(delta)
+        assert False, "Une quantité négative devrait être refusée"
+    except ValueError:
+        assert inventory.keys.amount == 2, "Un vecteur refusé ne devrait rien modifier"
+    inventory.lucky_rabbit_foot.count = 0
+    assert inventory.get_item_find_probability() == 1.0, "Modifier un article devrait invalider le cache"
+    inventory.restore(snapshot)
+    assert inventory.snapshot() == snapshot and inventory.keys.amount == 0, "L'instantané devrait être restauré"
+    
+    print("✓ Test des identifiants d'objets réussi")
+
+
 def test_room_selector():
     """Teste le système de sélection de pièce"""
     print("Test du système de sélection de pièce...")
@@ -135,6 +318,18 @@ def test_room_selector():
     zero_cost_rooms = [r for r in rooms if r.gem_cost == 0]
     assert len(zero_cost_rooms) > 0, "Il devrait y avoir au moins une pièce de coût 0"
     
+    # Le Hall Avant (sans porte) peut être proposé en première ligne, depuis une porte vers le haut
+    offered = set()
+    for _ in range(30):
+        offered.update(room.name for room in selector.draw_rooms(0, 4, mansion, player, required_direction="UP"))
+    assert "Hall Avant" in offered, "La salle d'arrivée devrait pouvoir être tirée"
+
+    # Placer la salle d'arrivée gagne la partie directement, sans passer par l'erreur de porte inversée
+    messages = []
+    game, _ = simulation.run_game(11, max_actions=600, after_action=lambda game, *_: messages.append(game.message))
+    assert game.state == GameState.GAME_OVER and "Félicitations" in game.game_over_message, "La partie devrait être gagnée"
+    assert not any("Erreur critique" in message for message in messages), "Placer le Hall Avant ne devrait pas être une erreur"
+
     print("✓ Test du système de sélection de pièce réussi")
 
 
@@ -158,6 +353,849 @@ def test_rooms_data():
     print("✓ Test des données des pièces réussi")
 
 
+def test_room_catalog():
+    """Teste le catalogue déclaratif des salles"""
+    print("Test du catalogue des salles...")
+    path = os.path.join(tempfile.mkdtemp(), "salles.toml")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(
+            '[[rooms]]\nname = "Tour"\ncolor = "GREEN"\nrarity = 2\ndoors = ["DOWN"]\n'
+            'placement = { edge = true, max_row = 1 }\n'
+            'items = [{ type = "consumable", name = "Gemme", amount = [1, 3] }]\n'
+            '[copies]\nTour = 2\n'
+        )
+    
+    catalog = load_room_catalog(path)
+    assert load_room_catalog(path) is catalog, "Le catalogue compilé devrait être mis en cache"
+    rooms = create_room_templates(path)
+    assert len(rooms) == 3, "Les copies devraient être ajoutées au deck"
+    assert rooms[0].items[0] is not rooms[1].items[0], "Chaque salle devrait avoir ses propres objets"
+    assert 1 <= rooms[0].items[0].amount <= 3, "La quantité devrait être tirée dans l'intervalle"
+    
+    mansion = Mansion()
+    assert rooms[0].placement_condition(0, 0, mansion), "Le coin supérieur devrait être autorisé"
+    assert not rooms[0].placement_condition(3, 0, mansion), "La ligne 3 devrait être refusée"
+    assert not rooms[0].placement_condition(1, 4, mansion), "Le centre devrait être refusé"
+    
+    # Légalité précalculée par case : identique à l'évaluation directe, grille vide comprise
+    assert rooms[0].placement_condition.static, "Les conditions du catalogue devraient être statiques"
+    empty = Mansion()
+    empty.clear()
+    for grid in (mansion, empty):
+        for row in range(grid.rows):
+            for col in range(grid.cols):
+                expected = rooms[0].placement_condition(row, col, grid) and (
+                    row + 1 < grid.rows or grid.count_explored_rooms() == 0)
+                assert rooms[0].can_place_at(row, col, grid)[0] == expected, f"Légalité incorrecte en ({row}, {col})"
+    calls = []
+    dynamic = Room("Dynamique", doors=["UP"], placement_condition=lambda row, col, grid: calls.append(row) or True)
+    dynamic.can_place_at(2, 2, mansion)
+    dynamic.can_place_at(2, 2, mansion)
+    assert len(calls) == 2, "Une condition non statique devrait être évaluée à chaque tirage"
+    
+    # Cache des masques borné : les tailles de grille les moins récemment utilisées sont oubliées
+    cells = []
+    counted = static_condition(lambda row, col, grid: cells.append(row) or True)
+    sizes = [(rows, cols) for rows in range(3, 40) for cols in range(3, 40)][:PLACEMENT_MASK_CACHE_SIZE + 1]
+    for rows, cols in sizes:
+        placement_masks(counted, ["UP"], Mansion(rows, cols))
+    computed = len(cells)
+    placement_masks(counted, ["UP"], Mansion(*sizes[-1]))
+    assert len(cells) == computed, "Les masques récents devraient rester en cache"
+    placement_masks(counted, ["UP"], Mansion(*sizes[0]))
+    assert len(cells) == computed + 9, "Les masques les plus anciens devraient avoir été oubliés"
+    
+    print("✓ Test du catalogue des salles réussi")
+
+
+def test_large_mansion():
+    """Teste un manoir de grande taille (dimensions propres à la partie)"""
+    print("Test d'un grand manoir...")
+    game = Game(seed=3, rows=50, cols=60)
+    mansion = game.mansion
+    
+    assert (game.player.row, game.player.col) == (49, 30), "Le joueur devrait partir de l'entrée du grand manoir"
+    assert len(mansion.grid) == 50 and len(mansion.grid[0]) == 60, "La vue dense devrait avoir les dimensions de la partie"
+    assert len(mansion.rooms) == 1, "Seules les cases occupées devraient être stockées"
+    assert mansion.frontier == {(48, 30)}, "La frontière devrait contenir la case derrière la porte de l'entrée"
+    assert mansion.is_edge_position(49, 10) and not mansion.is_edge_position(4, 10), "Les bords devraient suivre la taille de la grille"
+    
+    game.move('UP')
+    assert game.state == "selecting_room", "Une salle devrait être proposée"
+    game.choose_room(0)
+    assert (48, 30) in mansion.rooms and (48, 30) not in mansion.frontier, "La case placée devrait quitter la frontière"
+    
+    restored = Game(seed=1)
+    savegame.loads(restored, savegame.dumps(game))
+    assert (restored.mansion.rows, restored.mansion.cols) == (50, 60), "La sauvegarde devrait conserver les dimensions"
+    assert savegame.dumps(restored) == savegame.dumps(game), "La sauvegarde devrait être restaurée à l'identique"
+    
+    print("✓ Test d'un grand manoir réussi")
+
+
+def test_camera():
+    """Teste la caméra de la grille (fenêtre visible, suivi, zoom)"""
+    print("Test de la caméra...")
+    camera = Camera(600, 600, base_cell_size=60)
+    
+    camera.update(5, 9, 4, 4)
+    assert (camera.x, camera.y) == (0, 0), "Une petite grille devrait rester alignée en haut à gauche"
+    assert camera.visible_range() == (0, 4, 0, 8), "Toute la petite grille devrait être visible"
+    
+    for _ in range(100):
+        camera.update(200, 200, 199, 100)
+    first_row, last_row, first_col, last_col = camera.visible_range()
+    assert last_row == 199 and first_col <= 100 <= last_col, "Le joueur devrait être dans la fenêtre"
+    assert (last_row - first_row + 1) * (last_col - first_col + 1) <= 11 * 11, "Seules les cases visibles devraient être parcourues"
+    
+    camera.zoom(-2)
+    assert camera.cell_size == 30, "Le zoom devrait changer la taille des cases"
+    camera.pan(-10000, 0)
+    for _ in range(100):
+        camera.update(200, 200, 199, 100)
+    assert camera.x == 0, "Le défilement manuel devrait être borné à la grille"
+    camera.update(200, 200, 198, 100)
+    assert camera.follow, "Un déplacement du joueur devrait reprendre le suivi"
+    
+    print("✓ Test de la caméra réussi")
+
+
+def test_savegame():
+    """Teste la sauvegarde binaire et le chargement"""
+    print("Test de la sauvegarde...")
+    game = Game(seed=42)
+    for direction in ['UP', 'UP', 'LEFT', 'RIGHT', 'UP']:
+        game._try_move(direction)
+        if game.available_rooms:
+            game._confirm_room_selection()
+    data = savegame.dumps(game)
+    expected_draw = random.random()
+    
+    restored = Game(seed=7)
+    savegame.loads(restored, data)
+    assert savegame.dumps(restored) == data, "La sauvegarde rechargée devrait être identique"
+    assert random.random() == expected_draw, "L'état du générateur aléatoire devrait être restauré"
+    assert restored.player.get_position() == game.player.get_position(), "La position du joueur devrait être restaurée"
+    assert len(restored.mansion.get_all_rooms()) == len(game.mansion.get_all_rooms()), "La grille devrait être restaurée"
+    assert restored.mansion.entrance_room is not None, "La pièce d'entrée devrait être restaurée"
+    
+    try:
+        savegame.loads(restored, b"XXXX" + data[4:])
+        assert False, "Une sauvegarde invalide devrait être refusée"
+    except ValueError:
+        pass
+    
+    # Sauvegardes corrompues : refusées par ValueError (ou struct.error), jamais par une autre exception
+    import struct
+    rng = random.Random(3)
+    for _ in range(300):
+        corrupted = bytearray(data)
+        for _ in range(rng.randint(1, 8)):
+            corrupted[rng.randrange(len(corrupted))] = rng.randrange(256)
+        try:
+            savegame.loads(restored, bytes(corrupted))
+        except (ValueError, struct.error):
+            pass
+
+    # Positions et serrures vérifiées : salle placée sans position, joueur hors de la grille, serrure de niveau 3
+    before = savegame.state_hash(restored)
+    room = game.mansion.get_room(config.ENTRANCE_ROW - 1, config.ENTRANCE_COL)
+    door = next(iter(room.door_objects.values()))
+    inconsistent = []
+    room.row = None
+    inconsistent.append(savegame.dumps(game))
+    room.row = config.ENTRANCE_ROW - 1
+    player_row, game.player.row = game.player.row, game.mansion.rows + 2
+    inconsistent.append(savegame.dumps(game))
+    game.player.row = player_row
+    lock_level, door.lock_level = door.lock_level, 3
+    inconsistent.append(savegame.dumps(game))
+    door.lock_level = lock_level
+    for corrupted in inconsistent:
+        try:
+            savegame.loads(restored, corrupted)
+            assert False, "Une sauvegarde incohérente devrait être refusée"
+        except ValueError:
+            pass
+        assert savegame.state_hash(restored) == before, "Un chargement refusé ne devrait pas modifier la partie"
+
+    print("✓ Test de la sauvegarde réussi")
+
+
+def test_game_reset():
+    """Teste la réinitialisation d'une partie avec recyclage des salles"""
+    print("Test de la réinitialisation...")
+    game, _ = simulation.run_game(3, max_actions=200)
+    rooms_before = pool.ROOMS.reused
+    
+    game.reset(5)
+    assert savegame.dumps(game) == savegame.dumps(Game(seed=5)), "Une partie réinitialisée devrait être identique à une nouvelle partie"
+    assert pool.ROOMS.reused > rooms_before, "Les salles libérées devraient être réutilisées"
+    
+    replayed, turns = simulation.run_game(5, max_actions=200, game=game)
+    fresh, fresh_turns = simulation.run_game(5, max_actions=200)
+    assert turns == fresh_turns and savegame.dumps(replayed) == savegame.dumps(fresh), "La partie réinitialisée devrait se jouer à l'identique"
+    
+    print("✓ Test de la réinitialisation réussi")
+
+
+def test_replay():
+    """Teste le journal d'actions et la relecture déterministe"""
+    print("Test de la relecture...")
+    game = Game(seed=5)
+    log = ActionLog(game.seed)
+    game.record_actions(log)
+    for direction in ['UP', 'UP', 'LEFT', 'UP', 'RIGHT', 'DOWN', 'UP']:
+        game.move(direction)
+        game.update()
+        if game.available_rooms:
+            game.choose_room(len(game.available_rooms) - 1)
+            game.update()
+    game.restart()
+    game.move('UP')
+    game.update()
+    final_state = savegame.dumps(game)
+    
+    replay = Replay(log.getvalue(), keyframe_interval=4)
+    assert len(replay) == log.count, "Toutes les actions devraient être relues"
+    assert savegame.dumps(replay.run()) == final_state, "La relecture devrait reproduire la partie à l'identique"
+    
+    # Se positionner en arrière puis en avant via les instantanés clés
+    middle_state = savegame.dumps(replay.seek(5))
+    replay.seek(1)
+    assert savegame.dumps(replay.seek(5)) == middle_state, "Le positionnement devrait être déterministe"
+    assert savegame.dumps(replay.run()) == final_state, "La fin de partie devrait être retrouvée"
+    
+    # Argument sur un octet : une valeur plus grande est refusée sans rien écrire
+    count, size = log.count, len(log.getvalue())
+    try:
+        log.record(action_log.INTERACT, 256)
+        assert False, "Un argument hors limites devrait être refusé"
+    except ValueError:
+        pass
+    assert (log.count, len(log.getvalue())) == (count, size), "Le journal ne devrait pas être modifié"
+    
+    print("✓ Test de la relecture réussi")
+
+
+def test_events():
+    """Teste le flux d'événements et ses récepteurs"""
+    print("Test du flux d'événements...")
+    game = Game(seed=5)
+    ring = game.events.subscribe(RingBufferSink(capacity=8))
+    path = os.path.join(tempfile.mkdtemp(), "events.jsonl")
+    batched = game.events.subscribe(BatchedWriterSink(path, batch_size=4))
+    for direction in ['UP', 'UP', 'LEFT', 'UP']:
+        game.move(direction)
+        if game.available_rooms:
+            game.choose_room(0)
+    game.events.close()
+    
+    events = ring.events()
+    assert len(events) <= 8, "Le tampon circulaire devrait être borné"
+    assert events[-1].seq == game.events.seq, "Le tampon devrait conserver les derniers événements"
+    with open(path, encoding="utf-8") as f:
+        lines = f.readlines()
+    assert len(lines) == game.events.seq, "Tous les événements devraient être écrits par lots"
+    types = {json.loads(line)["type"] for line in lines}
+    for event_type in (EventType.DOOR_OPENED, EventType.ROOM_DRAWN, EventType.ROOM_PLACED, EventType.STEPS_SPENT):
+        assert event_type.value in types, f"L'événement {event_type.value} devrait être publié"
+    
+    print("✓ Test du flux d'événements réussi")
+
+
+def test_analytics_export():
+    """Teste l'export colonnaire des simulations (repli CSV)"""
+    print("Test de l'export des simulations...")
+    directory = tempfile.mkdtemp()
+    analytics.export_simulations([1, 2], directory, fmt="csv", max_actions=50, batch_size=16)
+    
+    with open(os.path.join(directory, "turns.csv"), encoding="utf-8") as f:
+        turns = list(csv.DictReader(f))
+    with open(os.path.join(directory, "games.csv"), encoding="utf-8") as f:
+        games = list(csv.DictReader(f))
+    assert len(games) == 2, "Il devrait y avoir un enregistrement par partie"
+    assert len(turns) == sum(int(g["turns"]) for g in games), "Il devrait y avoir un enregistrement par tour"
+    assert any(t["chosen_room"] for t in turns), "Les salles choisies devraient être enregistrées"
+    assert turns[0]["inv_steps"] == str(config.INITIAL_STEPS), "Le vecteur d'inventaire devrait être enregistré"
+    
+    print("✓ Test de l'export des simulations réussi")
+
+
+def test_server():
+    """Teste le serveur de parties (client TCP local, sessions entrelacées)"""
+    print("Test du serveur de parties...")
+    
+    async def scenario():
+        game_server = server.GameServer()
+        tcp = await game_server.serve("127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection("127.0.0.1", tcp.sockets[0].getsockname()[1])
+        
+        async def request(**fields):
+            writer.write(json.dumps(fields).encode("utf-8") + b"\n")
+            await writer.drain()
+            return json.loads(await reader.readline())
+        
+        first = await request(op="new", seed=7)
+        other = await request(op="new", seed=8)
+        assert first["ok"] and first["session"] != other["session"], "Chaque session devrait avoir son identifiant"
+        assert not (await request(op="act", session=first["session"], action=action_log.RESTART))["ok"], \
+            "Une action illégale devrait être refusée"
+        
+        # Deux parties entrelacées : chacune doit suivre son propre générateur aléatoire
+        played, state = [], first["state"]
+        for turn in range(40):
+            for session in (first, other):
+                actions = session["actions"]
+                if not actions:
+                    continue
+                action, arg = actions[turn % len(actions)]
+                response = await request(op="act", session=session["session"], action=action, arg=arg)
+                assert response["ok"], response.get("error")
+                session["actions"] = response["actions"]
+                if session is first:
+                    played.append((action, arg))
+                    state = dict(state, **{key: value for key, value in response["diff"].items() if key != "cells"})
+                    state["cells"] = dict(state["cells"], **response["diff"].get("cells", {}))
+        full = await request(op="state", session=first["session"])
+        assert state == full["state"], "Les différences cumulées devraient reconstruire l'état"
+        
+        writer.close()
+        await writer.wait_closed()
+        tcp.close()
+        await tcp.wait_closed()
+        return played, full["state"], game_server
+    
+    played, remote, game_server = asyncio.run(scenario())
+    assert not game_server.sessions, "Les sessions d'une connexion fermée devraient être libérées"
+    game = Game(seed=7)
+    for action, arg in played:
+        apply_action(game, action, arg)
+        game.update()
+    assert server.state_view(game) == remote, "Une session devrait jouer comme une partie seule"
+    
+    # État tenu à jour case par case, actions légales calculées une fois par action, sans pygame
+    calls = []
+    original = server.legal_actions
+    server.legal_actions = lambda game: calls.append(game) or original(game)
+    try:
+        session = server.GameServer().create_session(seed=7)
+        for turn in range(60):
+            calls.clear()
+            action, arg = session.legal_actions()[turn % len(session.legal_actions())]
+            session.play(action, arg)
+            assert len(calls) == 1, "Les actions légales devraient être calculées une seule fois par action"
+            assert session.view == server.state_view(session.game), "L'état incrémental devrait rester exact"
+            if session.game.state == GameState.GAME_OVER:
+                break
+    finally:
+        server.legal_actions = original
+    assert not pygame.get_init(), "Une partie sans rendu ne devrait pas initialiser pygame"
+    
+    print("✓ Test du serveur de parties réussi")
+
+
+def test_broadcast():
+    """Teste la diffusion aux spectateurs (journal partagé, spectateur lent, flux TCP)"""
+    print("Test de la diffusion aux spectateurs...")
+    state = {"turn": 0}
+    hub = broadcast.SpectatorHub(lambda: dict(state), capacity=8)
+    fast, slow, other = hub.add_viewer(), hub.add_viewer(max_lag=4), hub.add_viewer()
+    for viewer in (fast, slow, other):
+        assert json.loads(viewer.take()[0])["type"] == "snapshot", "Un spectateur devrait partir d'un instantané"
+    for turn in range(1, 10):
+        state["turn"] = turn
+        hub.publish({"type": "diff", "diff": {"turn": turn}})
+        if turn == 3:
+            lines = fast.take()
+            assert [json.loads(line)["diff"]["turn"] for line in lines] == [1, 2, 3], "Les messages devraient arriver dans l'ordre"
+    lines = fast.take()
+    assert len(lines) == 6 and all(a is b for a, b in zip(lines, other.take()[3:])), \
+        "Un message devrait être sérialisé une seule fois pour tous les spectateurs"
+    snapshot = slow.take()
+    assert len(snapshot) == 1 and json.loads(snapshot[0])["state"] == {"turn": 9}, "Un spectateur lent devrait repartir de l'état courant"
+    assert slow.dropped == 9 and not slow.pending(), "Le retard abandonné devrait être compté"
+    
+    async def scenario():
+        game_server = server.GameServer()
+        tcp = await game_server.serve("127.0.0.1", 0)
+        port = tcp.sockets[0].getsockname()[1]
+        player = await asyncio.open_connection("127.0.0.1", port)
+        spectator = await asyncio.open_connection("127.0.0.1", port)
+        
+        async def request(connection, **fields):
+            connection[1].write(json.dumps(fields).encode("utf-8") + b"\n")
+            await connection[1].drain()
+            return json.loads(await connection[0].readline())
+        
+        created = await request(player, op="new", seed=7)
+        assert not (await request(spectator, op="watch", session=999))["ok"], "Une session inconnue devrait être refusée"
+        assert (await request(spectator, op="watch", session=created["session"]))["ok"]
+        actions = created["actions"]
+        for turn in range(20):
+            if not actions:
+                break
+            action, arg = actions[turn % len(actions)]
+            response = await request(player, op="act", session=created["session"], action=action, arg=arg)
+            actions = response["actions"]
+        final = (await request(player, op="state", session=created["session"]))["state"]
+        await request(player, op="close", session=created["session"])
+        
+        messages = [json.loads(line) for line in (await spectator[0].read()).splitlines()]
+        for connection in (player, spectator):
+            connection[1].close()
+            await connection[1].wait_closed()
+        tcp.close()
+        await tcp.wait_closed()
+        return messages, final
+    
+    messages, final = asyncio.run(scenario())
+    assert messages[0]["type"] == "snapshot", "Le flux devrait commencer par un instantané"
+    assert any(message["type"] == "event" for message in messages), "Les événements de la partie devraient être diffusés"
+    view = messages[0]["state"]
+    for message in messages[1:]:
+        if message["type"] == "diff":
+            cells = dict(view["cells"], **message["diff"].get("cells", {}))
+            view = dict(view, **message["diff"])
+            view["cells"] = {key: value for key, value in cells.items() if value is not None}
+    assert view == final, "Le spectateur devrait reconstruire l'état de la partie"
+    
+    print("✓ Test de la diffusion aux spectateurs réussi")
+
+
+def test_session_store():
+    """Teste la persistance des sessions (écriture différée, rechargement, éviction)"""
+    print("Test de la persistance des sessions...")
+    path = os.path.join(tempfile.mkdtemp(), "sessions.db")
+    store = session_store.WriteBehindStore(session_store.SqliteSessionStore(path), flush_interval=0.05)
+    game_server = server.GameServer(max_sessions=2, store=store)
+    reference = server.GameServer()
+    ids = []
+    for seed in (3, 4, 5):
+        created = game_server.handle_request({"op": "new", "seed": seed})
+        reference.handle_request({"op": "new", "seed": seed})
+        ids.append(created["session"])
+    assert list(game_server.sessions) == ids[1:], "La session la moins récemment utilisée devrait être déchargée"
+    
+    def play(turns):
+        for turn in range(turns):
+            for session_id in ids:
+                actions = reference.sessions[session_id].legal_actions()
+                if not actions:
+                    continue
+                action, arg = actions[turn % len(actions)]
+                for target in (game_server, reference):
+                    response = target.handle_request({"op": "act", "session": session_id, "action": action, "arg": arg})
+                    assert response["ok"], response.get("error")
+    
+    # Chaque action recharge la session déchargée depuis le magasin (écritures encore en attente comprises)
+    play(10)
+    assert len(game_server.sessions) == 2, "Au plus max_sessions sessions devraient rester en mémoire"
+    for session_id in ids:
+        state = game_server.handle_request({"op": "state", "session": session_id})
+        assert state["state"] == reference.sessions[session_id].view, "Une session rechargée devrait reprendre à l'identique"
+    game_server.save_dirty()
+    store.flush()
+    assert store.batches < 3 * 10, "Les écritures devraient être regroupées"
+    game_server.close()
+    
+    # Redémarrage du processus : nouvelle instance sur la même base
+    game_server = server.GameServer(max_sessions=2, store=session_store.WriteBehindStore(session_store.SqliteSessionStore(path)))
+    assert not game_server.sessions, "Les sessions devraient être chargées à la demande"
+    play(5)
+    for session_id in ids:
+        session = game_server.get_session(session_id)
+        assert session.view == reference.sessions[session_id].view, "Une session devrait survivre au redémarrage"
+        replay = Replay(session.game.action_log.getvalue())
+        replay.run()
+        assert server.state_view(replay.game) == session.view, "Le journal d'actions devrait rejouer la session"
+    assert game_server.handle_request({"op": "new", "seed": 9})["session"] == ids[-1] + 1, "Les identifiants devraient continuer"
+    game_server.handle_request({"op": "close", "session": ids[0]})
+    game_server.store.flush()
+    assert game_server.store.load(ids[0]) is None, "Une session fermée devrait être supprimée du magasin"
+    game_server.close()
+    
+    # Écriture en échec : le lot est remis en attente et l'erreur relancée par l'appel suivant
+    class FailingStore(session_store.MemorySessionStore):
+        failures = 0
+        
+        def save_many(self, records):
+            if self.failures:
+                self.failures -= 1
+                raise OSError("Disque plein")
+            super().save_many(records)
+    
+    def raises(func, *args):
+        try:
+            func(*args)
+        except OSError:
+            return True
+        return False
+    
+    backend = FailingStore()
+    store = session_store.WriteBehindStore(backend, flush_interval=0.01)
+    record = session_store.SessionRecord(1, 3, 5, 9, "normal", 0, b"snapshot", b"")
+    backend.failures = 1
+    store.put(record)
+    assert raises(store.flush), "flush devrait relancer l'erreur d'écriture"
+    assert store.load(1) == record, "Un lot en échec devrait rester en attente"
+    store.flush()
+    assert backend.load(1) == record, "Un lot en échec devrait être réessayé"
+    backend.failures = 1
+    store.put(record._replace(turns=1))
+    while store.error is None:
+        time.sleep(0.001)
+    assert raises(store.put, record._replace(turns=2)), "put devrait relancer l'erreur d'écriture"
+    store.flush()
+    assert backend.load(1).turns == 2, "L'écriture la plus récente d'une session devrait l'emporter"
+    backend.failures = 1
+    store.put(record._replace(turns=3))
+    assert raises(store.close), "close devrait relancer l'erreur d'écriture"
+    
+    print("✓ Test de la persistance des sessions réussi")
+
+
+def test_sync():
+    """Teste la synchronisation par différences binaires (partie miroir)"""
+    print("Test de la synchronisation...")
+    game = Game(seed=11)
+    encoder = sync.StateEncoder(game, keyframe_interval=16)
+    mirror = Game(seed=12)
+    decoder = sync.StateDecoder(mirror)
+    try:
+        decoder.apply(bytes([sync.STATE, 0]))
+        assert False, "Un cadre de différences avant tout instantané devrait être refusé"
+    except ValueError:
+        pass
+    
+    rng = random.Random(11)
+    sizes = []
+    for turn in range(120):
+        frame = encoder.encode()
+        rng_state = random.getstate()
+        decoder.apply(frame)
+        random.setstate(rng_state)
+        assert server.state_view(mirror) == server.state_view(game), f"Le miroir devrait être à jour (tour {turn})"
+        if not frame[0] & sync.FULL:
+            sizes.append(len(frame))
+        actions = simulation.legal_actions(game)
+        if not actions:
+            break
+        apply_action(game, *simulation.random_policy(game, actions, rng))
+        game.update()
+    assert sizes and sum(sizes) / len(sizes) < 40, "Les cadres de différences devraient être compacts"
+    assert encoder.encode() == bytes([0]), "Un état inchangé devrait tenir sur un octet"
+    
+    # Remplacements en bloc (nouvelle partie, sauvegarde d'une autre taille) : cases relevées en entier
+    larger = Game(seed=3, rows=7, cols=11)
+    for replace in (game.restart, lambda: savegame.loads(game, savegame.dumps(larger))):
+        replace()
+        decoder.apply(encoder.encode())
+        assert server.state_view(mirror) == server.state_view(game), "Le miroir devrait suivre un remplacement en bloc"
+    
+    # Premier instantané d'une autre taille : la salle d'entrée du manoir remplacé retourne à la réserve
+    fresh = Game(seed=12)
+    entrance = fresh.mansion.entrance_room
+    sync.StateDecoder(fresh).apply(sync.StateEncoder(larger).encode())
+    assert fresh.mansion.rows == 7 and server.state_view(fresh) == server.state_view(larger)
+    assert any(room is entrance for room in pool.ROOMS.free + list(fresh.mansion.rooms.values())), \
+        "La salle d'entrée du manoir remplacé devrait retourner à la réserve"
+    
+    # Session binaire du serveur : cadres en base64 à la place des différences JSON
+    game_server = server.GameServer()
+    created = game_server.handle_request({"op": "new", "seed": 4, "binary": True})
+    remote = Game(seed=5)
+    frames = sync.StateDecoder(remote)
+    frames.apply(base64.b64decode(created["frame"]))
+    action, arg = created["actions"][0]
+    response = game_server.handle_request({"op": "act", "session": created["session"], "action": action, "arg": arg})
+    frames.apply(base64.b64decode(response["frame"]))
+    assert "diff" not in response, "Une session binaire ne devrait pas renvoyer de différences JSON"
+    assert server.state_view(remote) == game_server.sessions[created["session"]].view, "Le client devrait être synchronisé"
+    
+    print("✓ Test de la synchronisation réussi")
+
+
+def test_rl_env():
+    """Teste l'environnement d'apprentissage (observations, masque des actions, lots)"""
+    print("Test de l'environnement d'apprentissage...")
+    if rl_env.np is None:
+        print("✓ Test de l'environnement d'apprentissage ignoré (numpy absent)")
+        return
+    np = rl_env.np
+    env = rl_env.BluePrinceEnv(max_steps=200)
+    twin = rl_env.BluePrinceEnv(max_steps=200)
+    obs, info = env.reset(seed=21)
+    twin_obs, twin_info = twin.reset(seed=21)
+    shapes = env.observation_shapes()
+    assert all(obs[name].shape == shape for name, (shape, _) in shapes.items()), "L'observation devrait être de forme fixe"
+    
+    rng = np.random.default_rng(21)
+    ended = False
+    for _ in range(200):
+        mask = info["action_mask"]
+        assert mask.any(), "Au moins une action devrait être possible"
+        for index in np.flatnonzero(mask):
+            code, arg = rl_env.ACTIONS[index]
+            if code == action_log.MOVE:
+                door = env.game.get_current_room().door_objects[action_log.DIRECTIONS[arg]]
+                assert door.can_open(env.game.player)[0], "Une porte masquée possible devrait pouvoir s'ouvrir"
+        action = int(rng.choice(np.flatnonzero(mask)))
+        # Les parties entrelacées gardent chacune leur générateur
+        obs, reward, terminated, truncated, info = env.step(action)
+        twin_obs, twin_reward, _, _, twin_info = twin.step(action)
+        assert not info["invalid"], "Une action du masque devrait être valide"
+        full = env.empty_observation()
+        env.write_observation(full)
+        assert all(np.array_equal(full[k], obs[k]) for k in obs), "La mise à jour incrémentale devrait être complète"
+        assert reward == twin_reward and all(np.array_equal(obs[k], twin_obs[k]) for k in obs), \
+            "Deux environnements de même graine devraient rester identiques"
+        if terminated or truncated:
+            ended = True
+            break
+    assert ended, "L'épisode devrait se terminer ou être tronqué"
+    
+    invalid = int(np.flatnonzero(~info["action_mask"])[0])
+    _, reward, _, _, info = env.step(invalid)
+    assert info["invalid"] and reward == rl_env.INVALID_ACTION_PENALTY, "Une action masquée devrait être pénalisée"
+    
+    # Lots en mémoire partagée : des processus de travail donnent les mêmes observations
+    vector = rl_env.BluePrinceVectorEnv(4, max_steps=20)
+    workers = rl_env.BluePrinceVectorEnv(4, max_steps=20, num_workers=2)
+    # Partie seule jouant comme la première partie des lots jusqu'à la fin de son premier épisode
+    single = rl_env.BluePrinceEnv(max_steps=20)
+    try:
+        batch, info = vector.reset(seed=5)
+        remote, remote_info = workers.reset(seed=5)
+        single.reset(seed=5)
+        final_seen = False
+        assert batch["grid"].shape == (4,) + shapes["grid"][0], "Les observations devraient être regroupées"
+        for _ in range(30):
+            actions = [int(np.flatnonzero(mask)[0]) for mask in info["action_mask"]]
+            batch, rewards, terminated, truncated, info = vector.step(actions)
+            remote, remote_rewards, _, _, remote_info = workers.step(actions)
+            assert rewards.shape == (4,), "Une récompense par partie"
+            assert np.array_equal(rewards, remote_rewards) and all(np.array_equal(batch[k], remote[k]) for k in batch), \
+                "Les processus de travail devraient écrire les mêmes observations"
+            assert np.array_equal(info["action_mask"], remote_info["action_mask"]), "Les masques devraient être partagés"
+            done = terminated | truncated
+            assert ("final_observation" in info) == done.any() and ("final_observation" in remote_info) == done.any()
+            if final_seen:
+                continue
+            last, _, single_terminated, single_truncated, _ = single.step(actions[0])
+            if single_terminated or single_truncated:
+                final_seen = True
+                assert info["_final_observation"][0], "La fin d'épisode devrait être signalée"
+                for final in (info["final_observation"][0], remote_info["final_observation"][0]):
+                    assert all(np.array_equal(final[k], last[k]) for k in last), \
+                        "La dernière observation de l'épisode devrait précéder la remise à zéro"
+            elif done.any():
+                assert info["final_observation"][0] is None, "Seules les parties terminées ont une dernière observation"
+        assert final_seen, "La première partie devrait terminer son épisode"
+        assert all(e.steps < 20 for e in vector.envs), "Les parties terminées devraient recommencer"
+    finally:
+        vector.close()
+        workers.close()
+    
+    print("✓ Test de l'environnement d'apprentissage réussi")
+
+
+def test_daily_leaderboard():
+    """Teste le manoir du jour (graine, analyses précalculées, classement)"""
+    print("Test du manoir du jour...")
+    import datetime
+    day = datetime.date(2026, 1, 31)
+    assert daily.daily_seed(day) == daily.daily_seed(day), "La graine du jour devrait être stable"
+    assert daily.daily_seed(day) != daily.daily_seed(day + datetime.timedelta(days=1)), "Chaque jour devrait avoir sa graine"
+    
+    seed = daily.daily_seed(day)
+    # Le profil du jour est imposé, quel que soit le profil actif
+    difficulty.set_profile("facile")
+    analytics = daily.analyze_seed(seed, rollouts=4, max_actions=300)
+    assert analytics.difficulty == daily.DAILY_DIFFICULTY, "Les analyses devraient utiliser le profil du jour"
+    assert analytics == daily.analyze_seed(seed, rollouts=4, max_actions=300), "Les analyses devraient être déterministes"
+    assert 0.0 <= analytics.win_probability <= 1.0
+    assert analytics.key_rooms, "Des salles clés devraient être retenues"
+    # Politique par défaut orientée vers le Hall Avant : elle gagne, et les analyses dépendent de la graine
+    by_seed = [daily.analyze_seed(other, rollouts=8, max_actions=300) for other in (3, 8)]
+    assert all(other.win_probability > 0 for other in by_seed), "La politique par défaut devrait gagner des parties"
+    assert by_seed[0][3:] != by_seed[1][3:], "Les analyses devraient différer d'une graine à l'autre"
+    
+    path = os.path.join(tempfile.mkdtemp(), "daily.db")
+    store = daily.DailyStore(path, top_size=3)
+    assert store.analytics(seed, compute=False) is None
+    computed = store.analytics(seed, rollouts=2)
+    assert store.analytics(seed, compute=False) == computed, "Les analyses devraient être conservées"
+    assert store.analytics(seed, compute=False, difficulty="difficile") is None, \
+        "Les analyses devraient être conservées par profil de difficulté"
+    
+    assert store.submit(seed, "alice", 1040, 300)
+    assert store.submit(seed, "bob", 60, 200)
+    assert store.submit(seed, "carol", 55, 150)
+    assert not store.submit(seed, "bob", 50, 100), "Un score moins bon ne devrait pas remplacer le meilleur"
+    assert store.submit(seed, "dave", 70, 220)
+    assert [entry.player for entry in store.top(seed)] == ["alice", "dave", "bob"]
+    assert store.submit(seed, "carol", 1100, 400), "Un meilleur score devrait remplacer le précédent"
+    assert [entry.player for entry in store.top(seed)] == ["carol", "alice", "dave"]
+    assert store.rank(seed, 65) == 4 and store.best(seed, "bob").score == 60
+    assert store.top(seed + 1) == []
+    assert store.submit(seed, "erin", 2000, 100, difficulty="difficile")
+    assert [entry.player for entry in store.top(seed, difficulty="difficile")] == ["erin"]
+    assert store.top(seed)[0].player == "carol", "Chaque profil de difficulté devrait avoir son classement"
+    top = store.top(seed)
+    store.close()
+    
+    store = daily.DailyStore(path, top_size=3)
+    assert store.top(seed) == top, "Le classement devrait survivre à la réouverture de la base"
+    assert store.analytics(seed, compute=False) == computed
+    store.close()
+    
+    print("✓ Test du manoir du jour réussi")
+
+
+def test_replay_verification():
+    """Teste la vérification des parties soumises (empreinte canonique, groupe de processus)"""
+    print("Test de la vérification des parties...")
+    submissions = []
+    for seed, profile in ((3, None), (4, None), (5, "difficile"), (6, None), (7, "facile")):
+        game = Game(seed=seed, difficulty=profile or config.DIFFICULTY)
+        log = ActionLog(seed, difficulty=game.difficulty)
+        game.record_actions(log)
+        simulation.run_game(seed, max_actions=150, game=game)
+        digest = savegame.state_hash(game)
+        
+        # Empreinte canonique : indépendante de l'ordre de placement des salles en mémoire
+        copy = Game(seed=seed)
+        savegame.loads(copy, savegame.dumps(game))
+        assert copy.difficulty == game.difficulty, "Le chargement devrait restaurer le profil de difficulté"
+        copy.mansion.rooms = dict(reversed(list(copy.mansion.rooms.items())))
+        assert savegame.state_hash(copy) == digest, "L'empreinte devrait être canonique"
+        submissions.append(verify.Submission(log.getvalue(), digest))
+    assert len({submission.claimed_hash for submission in submissions}) == len(submissions)
+    
+    # Le profil est lu dans l'en-tête du journal, quel que soit le profil actif
+    difficulty.set_profile("facile")
+    replay = Replay(submissions[2].log)
+    assert replay.game.difficulty == "difficile", "La relecture devrait utiliser le profil du journal"
+    assert savegame.state_hash(replay.seek(len(replay))) == submissions[2].claimed_hash
+    
+    # Soumissions falsifiées : empreinte annoncée d'une autre partie, journal tronqué ou invalide,
+    # partie difficile présentée sous un autre profil
+    submissions.append(submissions[0]._replace(claimed_hash=submissions[1].claimed_hash))
+    submissions.append(verify.Submission(submissions[2].log[:-20], submissions[2].claimed_hash))
+    submissions.append(verify.Submission(b"BPLG", "0" * 32))
+    header = len(ActionLog(5, difficulty="difficile").getvalue())
+    relabelled = ActionLog(5, difficulty="normal").getvalue() + submissions[2].log[header:]
+    submissions.append(verify.Submission(relabelled, submissions[2].claimed_hash))
+    expected = [True] * 5 + [False, False, False, False]
+    
+    with verify.ReplayVerifier(workers=0) as verifier:
+        local = list(verifier.verify_many(submissions))
+    assert [verdict.ok for verdict in local] == expected, "Seules les parties authentiques devraient être acceptées"
+    assert [verdict.difficulty for verdict in local[:5]] == ["normal", "normal", "difficile", "normal", "facile"]
+    assert local[-2].error and local[-2].state_hash is None, "Un journal invalide devrait être signalé"
+    with verify.ReplayVerifier(workers=2, chunksize=2) as verifier:
+        pooled = list(verifier.verify_many(submissions))
+    assert pooled == local, "Les processus de travail devraient rendre les mêmes verdicts"
+    
+    # Dimensions forgées (en-tête ou instantané) : verdict d'erreur, sans construire la grille
+    moves = bytes([action_log.MOVE, 0]) * 3
+    huge = Game(seed=1, rows=config.MAX_GRID_SIZE + 1, cols=5)
+    snapshot = ActionLog(1)
+    snapshot.snapshot(savegame.dumps(huge))
+    forged = [ActionLog(1, rows=rows, cols=cols).getvalue() + moves for rows, cols in ((65535, 65535), (0, 0), (5, 300))]
+    for data in forged + [snapshot.getvalue() + moves]:
+        verdict = verify.verify(verify.Submission(data, "0" * 32))
+        assert not verdict.ok and "Dimension de grille invalide" in verdict.error, "Une grille hors limites devrait être refusée"
+    # Parties réutilisées : une par taille de grille, en nombre borné
+    for size in range(3, 4 + verify.MAX_CACHED_GAMES):
+        assert verify.verify(verify.Submission(ActionLog(2, rows=size, cols=size).getvalue() + moves, "")).error is None
+    assert len(verify._games) == verify.MAX_CACHED_GAMES, "Le cache des parties devrait être borné"
+    difficulty.set_profile(config.DIFFICULTY)
+    
+    print("✓ Test de la vérification des parties réussi")
+
+
+def test_zobrist():
+    """Teste l'empreinte incrémentale de Zobrist et la table de transposition"""
+    print("Test de l'empreinte de Zobrist...")
+    # Graine dont la partie aléatoire dure au-delà du tour 120 (sauvegarde au tour 40, rechargement au tour 120)
+    game = Game(seed=14)
+    tracker = zobrist.ZobristHash(game)
+    rng = random.Random(14)
+    start = tracker.value
+    saved = None
+    for turn in range(300):
+        actions = simulation.legal_actions(game)
+        if not actions or game.state == GameState.GAME_OVER:
+            break
+        action, arg = rng.choice(actions)
+        apply_action(game, action, arg)
+        game.update()
+        if turn == 40:
+            saved = (savegame.dumps(game), tracker.update())
+        elif turn == 120:
+            savegame.loads(game, saved[0])
+        value = tracker.update()
+        reference = zobrist.ZobristHash(game)
+        assert value == reference.value, "La mise à jour incrémentale devrait égaler le calcul complet"
+        reference.close()
+    # Même état atteint autrement : sauvegarde rechargée, nouvelle partie sur place
+    savegame.loads(game, saved[0])
+    assert tracker.update() == saved[1], "Un état retrouvé devrait retrouver son empreinte"
+    game.reset(14)
+    assert tracker.update() == start, "Une nouvelle partie devrait retrouver l'empreinte de départ"
+    assert tracker.full_updates == 4, "Seuls les remplacements en bloc devraient tout recalculer"
+    tracker.close()
+    
+    table = zobrist.TranspositionTable(size=3)
+    assert len(table.slots) == 4, "La taille devrait être arrondie à une puissance de 2"
+    assert table.lookup(5) is None
+    assert table.store(5, "a", depth=3)
+    assert table.lookup(5).value == "a"
+    assert not table.store(9, "b", depth=1), "Une entrée plus profonde de la recherche en cours devrait être gardée"
+    assert table.store(9, "b", depth=3) and table.lookup(5) is None, "Une entrée aussi profonde devrait remplacer"
+    table.new_search()
+    assert table.store(13, "c", depth=0), "Une entrée d'une recherche précédente devrait être remplaçable"
+    assert not table.store(13, "d", depth=-1), "Le même état évalué moins profondément ne devrait pas remplacer"
+    assert len(table) == 1 and table.lookup(13).value == "c"
+    
+    print("✓ Test de l'empreinte de Zobrist réussi")
+
+
+def test_thumbnails():
+    """Teste les miniatures hors écran (tuiles en cache, rendu par lots en processus)"""
+    print("Test des miniatures...")
+    directory = tempfile.mkdtemp()
+    sources = []
+    for seed in (2, 3, 4):
+        game, _ = simulation.run_game(seed, max_actions=200)
+        sources.append(os.path.join(directory, f"partie{seed}.bpsv"))
+        savegame.save_game(game, sources[-1])
+    
+    renderer = thumbnails.ThumbnailRenderer(cell_size=16, margin=2)
+    surface = renderer.render(game)
+    assert surface.get_size() == (game.mansion.cols * 16 + 4, game.mansion.rows * 16 + 4)
+    tiles = len(renderer.ui.room_tiles)
+    assert tiles, "Les tuiles des salles explorées devraient être mises en cache"
+    renderer.render(game)
+    assert len(renderer.ui.room_tiles) == tiles, "Un nouveau rendu devrait réutiliser les tuiles"
+    large = renderer.render(Game(seed=1, rows=12, cols=20))
+    assert large.get_size() == (20 * 16 + 4, 12 * 16 + 4), "Toute la grille devrait être dessinée"
+    
+    local = list(thumbnails.render_batch(sources, os.path.join(directory, "local"), cell_size=16, workers=0))
+    pooled = list(thumbnails.render_batch(sources + [directory], os.path.join(directory, "pool"), cell_size=16, workers=1))
+    assert all(thumbnail.error is None for thumbnail in local)
+    assert [thumbnail.error is None for thumbnail in pooled] == [True] * 3 + [False], "Une source illisible devrait être signalée"
+    for thumbnail in local:
+        with open(thumbnail.path, "rb") as f:
+            image = f.read()
+        with open(thumbnails.thumbnail_path(thumbnail.source, os.path.join(directory, "pool")), "rb") as f:
+            assert f.read() == image, "Les processus de travail devraient produire les mêmes images"
+    
+    print("✓ Test des miniatures réussi")
+
+
 def run_all_tests():
     """Exécute tous les tests"""
     print("=" * 50)
@@ -170,8 +1208,29 @@ def run_all_tests():
         test_player()
         test_room()
         test_door()
+        test_lock_tables()
+        test_difficulty()
+        test_loot()
+        test_item_ids()
         test_room_selector()
         test_rooms_data()
+        test_room_catalog()
+        test_large_mansion()
+        test_camera()
+        test_savegame()
+        test_game_reset()
+        test_replay()
+        test_events()
+        test_analytics_export()
+        test_server()
+        test_sync()
+        test_broadcast()
+        test_session_store()
+        test_rl_env()
+        test_daily_leaderboard()
+        test_replay_verification()
+        test_zobrist()
+        test_thumbnails()
         
         print("=" * 50)
         print("✓ Tous les tests réussis !")
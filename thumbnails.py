@@ -0,0 +1,169 @@
+"""
+Miniatures des manoirs des parties archivées
+Le manoir d'une sauvegarde (savegame.py) est dessiné hors écran par le code d'affichage du jeu
+(UI._render_grid) sur une pygame.Surface, sans fenêtre (pilote vidéo "dummy"), puis enregistré en PNG.
+Les sauvegardes sont réparties sur un groupe de processus ; chaque processus garde une interface,
+une partie et une surface par taille de grille, et ses tuiles de salles (UI.room_tiles) servent
+d'une miniature à l'autre.
+
+Utilisation :
+    python thumbnails.py archive/*.bpsv --output miniatures
+    python thumbnails.py archive/*.bpsv --output miniatures --cell-size 16 --workers 4
+"""
+import argparse
+import multiprocessing
+import os
+from collections import namedtuple
+
+# Rendu sans fenêtre ; SIGTERM doit rester fatal pour que le groupe de processus puisse arrêter
+# ses processus de travail (SDL le convertit sinon en événement dès qu'un module pygame l'initialise)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_NO_SIGNAL_HANDLERS", "1")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+import savegame
+from game import Game
+from ui import UI, Camera
+
+
+DEFAULT_CELL_SIZE = 24
+DEFAULT_MARGIN = 4
+DEFAULT_CHUNKSIZE = 16
+
+# Résultat d'une miniature : sauvegarde, image produite (None en cas d'erreur), message d'erreur
+Thumbnail = namedtuple("Thumbnail", ["source", "path", "error"])
+
+
+class ThumbnailRenderer:
+    """Rendu hors écran de manoirs (tuiles de salles en cache d'un rendu à l'autre)"""
+
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE, margin=DEFAULT_MARGIN):
+        """
+        Args:
+            cell_size: Taille d'une case en pixels
+            margin: Marge autour de la grille en pixels
+        """
+        self.cell_size = cell_size
+        self.margin = margin
+        self.ui = UI(cell_size, cell_size, surface=pygame.Surface((cell_size, cell_size)))
+        self.ui.grid_x = self.ui.grid_y = margin
+        # (lignes, colonnes) -> surface à la taille de la grille
+        self.surfaces = {}
+        # Partie réutilisée pour charger les sauvegardes
+        self.game = None
+
+    def render(self, game):
+        """
+        Dessiner le manoir d'une partie en entier
+
+        Args:
+            game: Objet Game
+
+        Returns:
+            pygame.Surface: Image (réutilisée par le rendu suivant de même taille : copiez-la pour la conserver)
+        """
+        rows, cols = game.mansion.rows, game.mansion.cols
+        width, height = cols * self.cell_size, rows * self.cell_size
+        surface = self.surfaces.get((rows, cols))
+        if surface is None:
+            surface = self.surfaces[rows, cols] = pygame.Surface((width + 2 * self.margin, height + 2 * self.margin))
+        surface.fill((0, 0, 0))
+        ui = self.ui
+        ui.screen = surface
+        # Caméra couvrant toute la grille, calée dès la première image
+        ui.camera = Camera(width, height, self.cell_size)
+        ui._render_grid(game)
+        return surface
+
+    def load(self, data):
+        """Charger une sauvegarde dans la partie réutilisée"""
+        if self.game is None:
+            self.game = Game(seed=0)
+        savegame.loads(self.game, data)
+        return self.game
+
+    def save(self, source, path):
+        """
+        Produire la miniature d'une sauvegarde
+
+        Args:
+            source: Chemin de la sauvegarde
+            path: Chemin de l'image PNG
+        """
+        with open(source, "rb") as f:
+            game = self.load(f.read())
+        pygame.image.save(self.render(game), path)
+
+
+# Moteur du processus courant (créé par _init_worker)
+_renderer = None
+
+
+def _init_worker(cell_size, margin):
+    global _renderer
+    _renderer = ThumbnailRenderer(cell_size, margin)
+
+
+def _render_job(job):
+    """Point d'entrée des processus de travail"""
+    source, path = job
+    try:
+        _renderer.save(source, path)
+    except (OSError, ValueError, pygame.error) as e:
+        return Thumbnail(source, None, str(e))
+    return Thumbnail(source, path, None)
+
+
+def thumbnail_path(source, output):
+    """Chemin de la miniature d'une sauvegarde dans le répertoire output"""
+    return os.path.join(output, os.path.splitext(os.path.basename(source))[0] + ".png")
+
+
+def render_batch(sources, output, cell_size=DEFAULT_CELL_SIZE, margin=DEFAULT_MARGIN, workers=None,
+                 chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Produire les miniatures de sauvegardes
+
+    Args:
+        sources: Chemins des sauvegardes
+        output: Répertoire des images (créé si besoin)
+        cell_size: Taille d'une case en pixels
+        margin: Marge autour de la grille en pixels
+        workers: Nombre de processus (nombre de processeurs par défaut ; 0 : rendu dans ce processus)
+        chunksize: Nombre de sauvegardes envoyées à la fois à un processus
+
+    Returns:
+        Itérateur de Thumbnail, dans l'ordre d'achèvement
+    """
+    os.makedirs(output, exist_ok=True)
+    jobs = [(source, thumbnail_path(source, output)) for source in sources]
+    if workers == 0:
+        _init_worker(cell_size, margin)
+        yield from map(_render_job, jobs)
+        return
+    # Processus démarrés à neuf : SDL (polices de l'UI) lance des fils qu'un fork recopierait
+    # avec leurs verrous
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(workers, _init_worker, (cell_size, margin)) as pool:
+        yield from pool.imap_unordered(_render_job, jobs, chunksize)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Miniatures PNG des manoirs de parties sauvegardées")
+    parser.add_argument("saves", nargs="+", help="sauvegardes (savegame.py)")
+    parser.add_argument("--output", default="thumbnails", help="répertoire des images")
+    parser.add_argument("--cell-size", type=int, default=DEFAULT_CELL_SIZE, help="taille d'une case en pixels")
+    parser.add_argument("--workers", type=int, help="nombre de processus (nombre de processeurs par défaut)")
+    args = parser.parse_args(argv)
+    failures = 0
+    for thumbnail in render_batch(args.saves, args.output, args.cell_size, workers=args.workers):
+        if thumbnail.error:
+            failures += 1
+            print(f"{thumbnail.source} : {thumbnail.error}")
+    print(f"{len(args.saves) - failures} miniature(s) dans {args.output}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,6 +4,8 @@ Interface graphique pygame
 import pygame
 import config
 import os
+from item import ITEM_NAMES
+from loot import Reward
 
 
 # Définition des couleurs
@@ -32,27 +34,155 @@ ROOM_COLOR_MAP = {
 }
 
 
+class Camera:
+    """
+    Caméra de la grille : fenêtre d'affichage sur le manoir, avec suivi du joueur,
+    défilement progressif et niveaux de zoom discrets (les tuiles sont mises en cache par niveau)
+    """
+
+    ZOOM_LEVELS = (0.25, 0.5, 0.75, 1.0, 1.5, 2.0)
+
+    def __init__(self, view_width, view_height, base_cell_size=60, smoothing=0.25):
+        """
+        Initialisation de la caméra
+
+        Args:
+            view_width: largeur de la fenêtre d'affichage (pixels)
+            view_height: hauteur de la fenêtre d'affichage (pixels)
+            base_cell_size: taille d'une case au zoom 1
+            smoothing: fraction de la distance à la cible parcourue à chaque image
+        """
+        self.view_width = view_width
+        self.view_height = view_height
+        self.base_cell_size = base_cell_size
+        self.smoothing = smoothing
+        self.zoom_index = self.ZOOM_LEVELS.index(1.0)
+        # Position (pixels de la grille) du coin supérieur gauche de la fenêtre, et sa cible
+        self.x = self.y = 0.0
+        self.target_x = self.target_y = 0.0
+        self.rows = self.cols = 0
+        # Suivi du joueur, suspendu par un défilement manuel jusqu'à son prochain déplacement
+        self.follow = True
+        self.followed = None
+
+    @property
+    def cell_size(self):
+        """Taille d'une case au niveau de zoom courant"""
+        return max(4, int(round(self.base_cell_size * self.ZOOM_LEVELS[self.zoom_index])))
+
+    def _clamp(self, x, y):
+        """Borner une position à la grille (alignée en haut à gauche si la grille tient dans la fenêtre)"""
+        size = self.cell_size
+        max_x = max(0, self.cols * size - self.view_width)
+        max_y = max(0, self.rows * size - self.view_height)
+        return min(max(x, 0), max_x), min(max(y, 0), max_y)
+
+    def center_on(self, row, col):
+        """Viser le centre d'une case"""
+        size = self.cell_size
+        self.target_x, self.target_y = self._clamp(
+            (col + 0.5) * size - self.view_width / 2, (row + 0.5) * size - self.view_height / 2
+        )
+
+    def pan(self, dx, dy):
+        """Défiler manuellement (pixels)"""
+        self.follow = False
+        self.target_x, self.target_y = self._clamp(self.target_x + dx, self.target_y + dy)
+
+    def recenter(self):
+        """Reprendre le suivi du joueur"""
+        self.follow = True
+        if self.followed is not None:
+            self.center_on(*self.followed)
+
+    def zoom(self, step, anchor=None):
+        """
+        Changer de niveau de zoom en gardant fixe le point sous l'ancre
+
+        Args:
+            step: nombre de niveaux (positif pour agrandir)
+            anchor: point (pixels, relatif à la fenêtre) à garder fixe ; centre de la fenêtre par défaut
+        """
+        index = min(max(self.zoom_index + step, 0), len(self.ZOOM_LEVELS) - 1)
+        if index == self.zoom_index:
+            return
+        if anchor is None:
+            anchor = (self.view_width / 2, self.view_height / 2)
+        ratio = self.ZOOM_LEVELS[index] / self.ZOOM_LEVELS[self.zoom_index]
+        self.zoom_index = index
+        self.x, self.y = self._clamp((self.x + anchor[0]) * ratio - anchor[0],
+                                     (self.y + anchor[1]) * ratio - anchor[1])
+        self.target_x, self.target_y = self._clamp((self.target_x + anchor[0]) * ratio - anchor[0],
+                                                   (self.target_y + anchor[1]) * ratio - anchor[1])
+        if self.follow and self.followed is not None:
+            self.center_on(*self.followed)
+
+    def update(self, rows, cols, player_row, player_col):
+        """
+        Avancer la caméra d'une image
+
+        Args:
+            rows: nombre de lignes du manoir
+            cols: nombre de colonnes du manoir
+            player_row: ligne du joueur
+            player_col: colonne du joueur
+        """
+        first_frame = self.followed is None
+        self.rows, self.cols = rows, cols
+        if (player_row, player_col) != self.followed:
+            self.followed = (player_row, player_col)
+            self.follow = True
+        if self.follow:
+            self.center_on(player_row, player_col)
+        if first_frame:
+            self.x, self.y = self.target_x, self.target_y
+            return
+        self.x += (self.target_x - self.x) * self.smoothing
+        self.y += (self.target_y - self.y) * self.smoothing
+        if abs(self.target_x - self.x) < 0.5 and abs(self.target_y - self.y) < 0.5:
+            self.x, self.y = self.target_x, self.target_y
+
+    def visible_range(self):
+        """
+        Cases intersectant la fenêtre
+
+        Returns:
+            tuple: (première ligne, dernière ligne, première colonne, dernière colonne), bornes incluses
+        """
+        size = self.cell_size
+        first_row = max(0, int(self.y // size))
+        first_col = max(0, int(self.x // size))
+        last_row = min(self.rows - 1, int((self.y + self.view_height - 1) // size))
+        last_col = min(self.cols - 1, int((self.x + self.view_width - 1) // size))
+        return first_row, last_row, first_col, last_col
+
+
 class UI:
     """Classe de l'interface graphique"""
 
-    def __init__(self, width=1200, height=800):
+    def __init__(self, width=1200, height=800, surface=None):
         """
         Initialisation de l'UI
 
         Args:
             width: largeur de la fenêtre
             height: hauteur de la fenêtre
+            surface: pygame.Surface de dessin hors écran (sans fenêtre) ; une fenêtre est ouverte si None
         """
         self.width = width
         self.height = height
-        self.screen = pygame.display.set_mode((width, height))
-        pygame.display.set_caption("Prince Bleu - Blue Prince")
+        if surface is None:
+            self.screen = pygame.display.set_mode((width, height))
+            pygame.display.set_caption("Prince Bleu - Blue Prince")
+        else:
+            self.screen = surface
 
         # Position du bouton de réinitialisation (initialisée à None, définie au rendu)
         self.reset_button_rect = None
 
         # Cache d'images
         self.room_images = {}          # Cache des images de salles
+        self.room_tiles = {}           # Cache des tuiles de salles par niveau de zoom
         self.background_image = None   # Image d'arrière-plan
 
         # Chargement de l'image d'arrière-plan
@@ -91,6 +221,9 @@ class UI:
         self.panel_y = 50
         self.panel_width = 450
 
+        # Caméra de la grille : la fenêtre s'arrête avant le panneau et les aides de contrôle
+        self.camera = Camera(self.panel_x - self.grid_x - 10, height - self.grid_y - 160, self.cell_size)
+
     def _get_cjk_font(self, size):
         """
         Obtenir une police supportant au mieux l'affichage CJK
@@ -238,154 +371,190 @@ class UI:
         self._render_controls()
 
     def _render_grid(self, game):
-        """Dessiner la grille de jeu"""
-        for row in range(config.GRID_ROWS):
-            for col in range(config.GRID_COLS):
-                x = self.grid_x + col * self.cell_size
-                y = self.grid_y + row * self.cell_size
-
-                room = game.mansion.get_room(row, col)
-                is_current = (row == game.player.row and col == game.player.col)
-                is_selected_direction = False
-
-                # Vérifier si c'est la case correspondant à la direction sélectionnée
-                from game import GameState
-
-                if game.selected_direction and game.state == GameState.SELECTING_DIRECTION:
-                    dr, dc = config.DIRECTIONS[game.selected_direction]
-                    if row == game.player.row + dr and col == game.player.col + dc:
-                        is_selected_direction = True
-
-                # Dessiner la salle
-                if room:
-                    if room.explored:
-                        # Salle déjà explorée
-                        # Bordure de surbrillance
-                        if is_current:
-                            # Salle actuelle en surbrillance
-                            pygame.draw.rect(
-                                self.screen,
-                                HIGHLIGHT,
-                                (x - 2, y - 2, self.cell_size + 4, self.cell_size + 4),
-                                3,
-                            )
-                        elif is_selected_direction:
-                            # Salle dans la direction sélectionnée en surbrillance
-                            pygame.draw.rect(
-                                self.screen,
-                                CYAN,
-                                (x - 2, y - 2, self.cell_size + 4, self.cell_size + 4),
-                                2,
-                            )
-
-                        # Essayer de charger et dessiner l'image de la salle
-                        room_image = self._get_room_image(room)
-                        if room_image:
-                            self.screen.blit(room_image, (x, y))
-                        else:
-                            # Pas d'image : remplir par une couleur
-                            color = ROOM_COLOR_MAP.get(room.color, BLUE)
-                            pygame.draw.rect(
-                                self.screen, color, (x, y, self.cell_size, self.cell_size)
-                            )
-
-                        # Bordure de la salle
-                        pygame.draw.rect(
-                            self.screen,
-                            WHITE,
-                            (x, y, self.cell_size, self.cell_size),
-                            1,
-                        )
-
-                        # Nom de la salle (abrégé, au-dessus de l'image)
-                        name_text = self.font_small.render(room.name[:4], True, WHITE)
-                        # Fond pour rendre le texte lisible sur l'image
-                        text_bg = pygame.Surface(
-                            (name_text.get_width() + 4, name_text.get_height() + 2)
-                        )
-                        text_bg.set_alpha(180)
-                        text_bg.fill(BLACK)
-                        self.screen.blit(text_bg, (x + 1, y + 1))
-                        self.screen.blit(name_text, (x + 3, y + 2))
-
-                        # Dessiner les portes
-                        self._render_doors(x, y, room)
-                    else:
-                        # Salle non explorée (gris foncé)
-                        pygame.draw.rect(
-                            self.screen,
-                            DARK_GRAY,
-                            (x, y, self.cell_size, self.cell_size),
-                        )
-                        pygame.draw.rect(
-                            self.screen,
-                            GRAY,
-                            (x, y, self.cell_size, self.cell_size),
-                            1,
-                        )
-                else:
-                    # Case vide (noire)
-                    pygame.draw.rect(
-                        self.screen, BLACK, (x, y, self.cell_size, self.cell_size)
-                    )
-                    pygame.draw.rect(
-                        self.screen,
-                        DARK_GRAY,
-                        (x, y, self.cell_size, self.cell_size),
-                        1,
-                    )
+        """Dessiner la partie de la grille visible par la caméra"""
+        from game import GameState
+
+        mansion = game.mansion
+        player = game.player
+        camera = self.camera
+        camera.update(mansion.rows, mansion.cols, player.row, player.col)
+        size = camera.cell_size
+        first_row, last_row, first_col, last_col = camera.visible_range()
+        # Coordonnées écran de la case (0, 0)
+        origin_x = self.grid_x - int(round(camera.x))
+        origin_y = self.grid_y - int(round(camera.y))
+
+        # Limiter le dessin à la fenêtre de la grille (avec une marge pour les surbrillances)
+        previous_clip = self.screen.get_clip()
+        self.screen.set_clip(pygame.Rect(
+            self.grid_x - 4, self.grid_y - 4, camera.view_width + 8, camera.view_height + 8
+        ))
+
+        # Cases vides : fond noir et bordures gris foncé, tracés en une passe sur la zone visible
+        left = origin_x + first_col * size
+        top = origin_y + first_row * size
+        width = (last_col - first_col + 1) * size
+        height = (last_row - first_row + 1) * size
+        pygame.draw.rect(self.screen, BLACK, (left, top, width, height))
+        for col in range(first_col, last_col + 1):
+            x = origin_x + col * size
+            pygame.draw.line(self.screen, DARK_GRAY, (x, top), (x, top + height - 1))
+            pygame.draw.line(self.screen, DARK_GRAY, (x + size - 1, top), (x + size - 1, top + height - 1))
+        for row in range(first_row, last_row + 1):
+            y = origin_y + row * size
+            pygame.draw.line(self.screen, DARK_GRAY, (left, y), (left + width - 1, y))
+            pygame.draw.line(self.screen, DARK_GRAY, (left, y + size - 1), (left + width - 1, y + size - 1))
+
+        # Salles placées : parcourir le plus petit ensemble entre les salles et les cases visibles
+        rooms = mansion.rooms
+        if len(rooms) <= (last_row - first_row + 1) * (last_col - first_col + 1):
+            visible = [
+                (position, room) for position, room in rooms.items()
+                if first_row <= position[0] <= last_row and first_col <= position[1] <= last_col
+            ]
+        else:
+            visible = [
+                ((row, col), rooms[(row, col)])
+                for row in range(first_row, last_row + 1)
+                for col in range(first_col, last_col + 1)
+                if (row, col) in rooms
+            ]
+
+        for (row, col), room in visible:
+            x = origin_x + col * size
+            y = origin_y + row * size
+            if room.explored:
+                # Salle déjà explorée : tuile en cache (image, bordure, nom) puis portes
+                self.screen.blit(self._get_room_tile(room, size), (x, y))
+                self._render_doors(x, y, room, size)
+            else:
+                # Salle non explorée (gris foncé)
+                pygame.draw.rect(self.screen, DARK_GRAY, (x, y, size, size))
+                pygame.draw.rect(self.screen, GRAY, (x, y, size, size), 1)
+
+        # Surbrillances : salle actuelle, ou salle dans la direction sélectionnée
+        current = rooms.get((player.row, player.col))
+        if current is not None and current.explored:
+            x = origin_x + player.col * size
+            y = origin_y + player.row * size
+            pygame.draw.rect(self.screen, HIGHLIGHT, (x - 2, y - 2, size + 4, size + 4), 3)
+        if game.selected_direction and game.state == GameState.SELECTING_DIRECTION:
+            dr, dc = config.DIRECTIONS[game.selected_direction]
+            target = rooms.get((player.row + dr, player.col + dc))
+            if target is not None and target.explored:
+                x = origin_x + (player.col + dc) * size
+                y = origin_y + (player.row + dr) * size
+                pygame.draw.rect(self.screen, CYAN, (x - 2, y - 2, size + 4, size + 4), 2)
 
         # Marquer la position du joueur
-        player_x = (
-            self.grid_x + game.player.col * self.cell_size + self.cell_size // 2
-        )
-        player_y = (
-            self.grid_y + game.player.row * self.cell_size + self.cell_size // 2
-        )
-        pygame.draw.circle(self.screen, WHITE, (player_x, player_y), 8)
-        pygame.draw.circle(self.screen, RED, (player_x, player_y), 6)
+        player_x = origin_x + player.col * size + size // 2
+        player_y = origin_y + player.row * size + size // 2
+        radius = max(3, size * 8 // self.cell_size)
+        pygame.draw.circle(self.screen, WHITE, (player_x, player_y), radius)
+        pygame.draw.circle(self.screen, RED, (player_x, player_y), radius - 2)
+
+        self.screen.set_clip(previous_clip)
 
-    def _render_doors(self, x, y, room):
+    def _get_room_tile(self, room, size):
+        """
+        Obtenir la tuile d'une salle explorée pour un niveau de zoom (avec mise en cache)
+
+        Args:
+            room: objet Room
+            size: taille de la case en pixels
+
+        Returns:
+            pygame.Surface
+        """
+        key = (room.name, room.image_path, room.color, size)
+        tile = self.room_tiles.get(key)
+        if tile is not None:
+            return tile
+
+        tile = pygame.Surface((size, size))
+        room_image = self._get_room_image(room)
+        if room_image:
+            if size != self.cell_size:
+                room_image = pygame.transform.smoothscale(room_image, (size, size))
+            tile.blit(room_image, (0, 0))
+        else:
+            # Pas d'image : remplir par une couleur
+            tile.fill(ROOM_COLOR_MAP.get(room.color, BLUE))
+
+        # Bordure de la salle
+        pygame.draw.rect(tile, WHITE, (0, 0, size, size), 1)
+
+        # Nom de la salle (abrégé, au-dessus de l'image), masqué aux petits niveaux de zoom
+        if size >= 40:
+            name_text = self.font_small.render(room.name[:4], True, WHITE)
+            # Fond pour rendre le texte lisible sur l'image
+            text_bg = pygame.Surface((name_text.get_width() + 4, name_text.get_height() + 2))
+            text_bg.set_alpha(180)
+            text_bg.fill(BLACK)
+            tile.blit(text_bg, (1, 1))
+            tile.blit(name_text, (3, 2))
+
+        self.room_tiles[key] = tile
+        return tile
+
+    def _render_doors(self, x, y, room, size=None):
         """Dessiner les portes de la salle"""
-        door_size = 8
+        size = size or self.cell_size
+        door_size = max(2, size * 8 // self.cell_size)
+        thickness = max(1, size * 4 // self.cell_size)
         for direction in room.door_objects:
             door = room.door_objects[direction]
+            color = GREEN if door.opened else RED
             if direction == "UP":
-                door_x = x + self.cell_size // 2
-                door_y = y
-                color = GREEN if door.opened else RED
-                pygame.draw.rect(
-                    self.screen,
-                    color,
-                    (door_x - door_size // 2, door_y, door_size, 4),
-                )
+                rect = (x + size // 2 - door_size // 2, y, door_size, thickness)
             elif direction == "DOWN":
-                door_x = x + self.cell_size // 2
-                door_y = y + self.cell_size - 4
-                color = GREEN if door.opened else RED
-                pygame.draw.rect(
-                    self.screen,
-                    color,
-                    (door_x - door_size // 2, door_y, door_size, 4),
-                )
+                rect = (x + size // 2 - door_size // 2, y + size - thickness, door_size, thickness)
             elif direction == "LEFT":
-                door_x = x
-                door_y = y + self.cell_size // 2
-                color = GREEN if door.opened else RED
-                pygame.draw.rect(
-                    self.screen,
-                    color,
-                    (door_x, door_y - door_size // 2, 4, door_size),
-                )
+                rect = (x, y + size // 2 - door_size // 2, thickness, door_size)
             elif direction == "RIGHT":
-                door_x = x + self.cell_size - 4
-                door_y = y + self.cell_size // 2
-                color = GREEN if door.opened else RED
-                pygame.draw.rect(
-                    self.screen,
-                    color,
-                    (door_x, door_y - door_size // 2, 4, door_size),
-                )
+                rect = (x + size - thickness, y + size // 2 - door_size // 2, thickness, door_size)
+            else:
+                continue
+            pygame.draw.rect(self.screen, color, rect)
+
+    def handle_camera_key(self, key):
+        """
+        Gérer les touches de la caméra
+
+        Args:
+            key: code de touche pygame
+
+        Returns:
+            bool: True si la touche a été consommée
+        """
+        if key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+            self.camera.zoom(1)
+        elif key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            self.camera.zoom(-1)
+        elif key == pygame.K_c:
+            self.camera.recenter()
+        else:
+            return False
+        return True
+
+    def handle_camera_event(self, event):
+        """
+        Gérer la molette (zoom sous le curseur) et le glisser clic droit (défilement)
+
+        Args:
+            event: événement pygame
+
+        Returns:
+            bool: True si l'événement a été consommé
+        """
+        if event.type == pygame.MOUSEWHEEL:
+            mouse_x, mouse_y = pygame.mouse.get_pos()
+            self.camera.zoom(event.y, (mouse_x - self.grid_x, mouse_y - self.grid_y))
+            return True
+        if event.type == pygame.MOUSEMOTION and event.buttons[2]:
+            self.camera.pan(-event.rel[0], -event.rel[1])
+            return True
+        return False
 
     def _render_inventory_panel(self, game):
         """Dessiner le panneau d'inventaire"""
@@ -707,8 +876,8 @@ class UI:
         controls = [
             move_hint,
             "E : interagir avec les objets  B : boutique (salle jaune)",
-            "R : relancer les salles (nécessite un dé)",
-            "Échap : annuler/retour",
+            "R : relancer les salles (nécessite un dé)  +/- ou molette : zoom  C : recentrer  clic droit : défiler",
+            "Échap : annuler/retour  F5 : sauvegarder  F9 : charger",
         ]
         # Calculez la hauteur totale requise : 4 lignes de texte, chacune d'environ 25 px (espacement compris)
         # font_small est de 20 px ; en ajoutant l'espacement entre les lignes, chaque ligne nécessite en réalité environ 25 px
@@ -741,10 +910,11 @@ class UI:
         start_y = 150
         for i, it in enumerate(items):
             prefix = "▶ " if i == game.item_selection_index else "   "
-            name = it if isinstance(it, str) else getattr(it, "name", None)
-            if not name and isinstance(it, tuple):
-                name = f"{it[0]} x{it[1]}"
-            elif not name:
+            if isinstance(it, Reward):
+                name = f"{it.name or ITEM_NAMES[it.kind]} x{it.amount}"
+            else:
+                name = it if isinstance(it, str) else getattr(it, "name", None)
+            if not name:
                 name = str(it)
             text = self.font_large.render(
                 prefix + name,
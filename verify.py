@@ -0,0 +1,182 @@
+"""
+Vérification des parties soumises au classement
+Chaque journal d'actions (action_log.py) est rejoué sans rendu, avec le profil de difficulté inscrit
+dans son en-tête, et l'empreinte de l'état final (savegame.state_hash, profil compris) est comparée
+à celle annoncée par le joueur. Les relectures sont réparties
+sur un groupe de processus ; chaque processus garde une partie par taille de grille (les
+MAX_CACHED_GAMES plus récentes) et la réinitialise sur place (Game.reset) d'une relecture à l'autre,
+sans instantanés intermédiaires. Les dimensions annoncées par un journal sont bornées comme celles
+des sessions du serveur (config.MIN_GRID_SIZE à config.MAX_GRID_SIZE).
+
+Utilisation :
+    python verify.py partie.bplog ...                  # empreinte finale de chaque journal
+    python verify.py --claims annonces.json            # vérifier {"chemin": "empreinte", ...}
+"""
+import argparse
+import json
+import multiprocessing
+from collections import OrderedDict, namedtuple
+import action_log
+import config
+import savegame
+from game import Game
+from replay import apply_action
+
+
+DEFAULT_CHUNKSIZE = 8
+# Nombre de parties (tailles de grille) gardées par processus
+MAX_CACHED_GAMES = 4
+
+# Partie soumise : journal d'actions, empreinte annoncée
+Submission = namedtuple("Submission", ["log", "claimed_hash"])
+
+# Verdict : index de la soumission, accord des empreintes, empreinte recalculée (None si le journal
+# est invalide), nombre d'actions rejouées, message d'erreur, profil de difficulté lu dans le journal
+Verdict = namedtuple("Verdict", ["index", "ok", "state_hash", "turns", "error", "difficulty"])
+Verdict.__new__.__defaults__ = (None,)
+
+# Parties réutilisées par le processus courant (LRU) : (lignes, colonnes) -> Game
+_games = OrderedDict()
+
+
+def _check_dimensions(rows, cols):
+    """Refuser une grille hors des dimensions acceptées (ValueError)"""
+    for size in (rows, cols):
+        if not config.MIN_GRID_SIZE <= size <= config.MAX_GRID_SIZE:
+            raise ValueError(f"Dimension de grille invalide : {size}")
+
+
+def replay_final(data):
+    """
+    Rejouer un journal jusqu'à la fin (sans instantanés clés, contrairement à replay.Replay)
+
+    Args:
+        data: Contenu binaire du journal
+
+    Returns:
+        tuple: (objet Game dans l'état final, nombre d'actions rejouées)
+    """
+    # Profil de l'en-tête : il ne dépend ni du joueur ni des relectures précédentes du même processus
+    seed, rows, cols, difficulty_name = action_log.read_header(data)
+    _check_dimensions(rows, cols)
+    _, records = action_log.read_log(data)
+    game = _games.pop((rows, cols), None)
+    if game is None or (game.mansion.rows, game.mansion.cols) != (rows, cols):
+        # Partie absente, ou laissée à d'autres dimensions par l'instantané d'un journal précédent
+        game = Game(seed=seed, rows=rows, cols=cols, difficulty=difficulty_name)
+    else:
+        game.difficulty = difficulty_name
+        game.reset(seed)
+    _games[rows, cols] = game
+    while len(_games) > MAX_CACHED_GAMES:
+        _games.popitem(last=False)
+    for action, arg in records:
+        apply_action(game, action, arg)
+        if action == action_log.SNAPSHOT:
+            # Un instantané porte ses propres dimensions de grille
+            _check_dimensions(game.mansion.rows, game.mansion.cols)
+        # Comme replay.Replay : la boucle principale appelle update() entre deux actions
+        game.update()
+    return game, len(records)
+
+
+def verify(submission, index=0):
+    """
+    Vérifier une soumission
+
+    Args:
+        submission: Submission
+        index: Index de la soumission (recopié dans le verdict)
+
+    Returns:
+        Verdict
+    """
+    try:
+        game, turns = replay_final(submission.log)
+        digest = savegame.state_hash(game)
+    except Exception as e:
+        # Journal forgé : toute erreur de relecture ou d'empreinte le rejette sans interrompre le lot
+        return Verdict(index, False, None, 0, f"Journal invalide : {e}")
+    return Verdict(index, digest == submission.claimed_hash, digest, turns, None, game.difficulty)
+
+
+def _verify_indexed(job):
+    """Point d'entrée des processus de travail"""
+    index, submission = job
+    return verify(submission, index)
+
+
+class ReplayVerifier:
+    """Groupe de processus de vérification"""
+
+    def __init__(self, workers=None, chunksize=DEFAULT_CHUNKSIZE):
+        """
+        Args:
+            workers: Nombre de processus (nombre de processeurs par défaut ; 0 : vérification dans ce processus)
+            chunksize: Nombre de soumissions envoyées à la fois à un processus
+        """
+        self.chunksize = chunksize
+        self.pool = multiprocessing.Pool(workers) if workers != 0 else None
+
+    def verify_many(self, submissions):
+        """
+        Vérifier des soumissions
+
+        Args:
+            submissions: Itérable de Submission
+
+        Returns:
+            Itérateur de Verdict, dans l'ordre des soumissions
+        """
+        jobs = enumerate(submissions)
+        if self.pool is None:
+            return map(_verify_indexed, jobs)
+        return self.pool.imap(_verify_indexed, jobs, self.chunksize)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vérification des journaux d'actions soumis au classement")
+    parser.add_argument("logs", nargs="*", help="journaux d'actions")
+    parser.add_argument("--claims", help="fichier JSON {chemin du journal: empreinte annoncée}")
+    parser.add_argument("--workers", type=int, help="nombre de processus (nombre de processeurs par défaut)")
+    args = parser.parse_args(argv)
+    claims = dict.fromkeys(args.logs)
+    if args.claims:
+        with open(args.claims, encoding="utf-8") as f:
+            claims.update(json.load(f))
+    paths = list(claims)
+
+    def submissions():
+        for path in paths:
+            with open(path, "rb") as f:
+                yield Submission(f.read(), claims[path])
+
+    rejected = 0
+    with ReplayVerifier(args.workers) as verifier:
+        for verdict in verifier.verify_many(submissions()):
+            path = paths[verdict.index]
+            if verdict.error:
+                status = verdict.error
+            elif claims[path] is None:
+                status = verdict.state_hash
+            else:
+                status = "ok" if verdict.ok else f"empreinte différente ({verdict.state_hash})"
+            rejected += claims[path] is not None and not verdict.ok
+            print(f"{path} : {status} ({verdict.turns} actions, profil {verdict.difficulty or '?'})")
+    return 1 if rejected else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
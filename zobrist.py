@@ -0,0 +1,260 @@
+"""
+Empreinte incrémentale de l'état (hachage de Zobrist) et table de transposition
+Pour les outils de recherche qui doivent reconnaître un même état atteint par des chemins différents.
+
+L'empreinte est le OU exclusif des clés de 64 bits des composantes de l'état :
+    case       : salle placée (nom) à une position
+    porte      : direction, niveau de serrure et ouverture d'une porte d'une salle placée
+    joueur     : position
+    inventaire : quantité de chaque identifiant (ItemId)
+    pioche     : présence du k-ième exemplaire de chaque salle encore dans la pioche
+    partie     : état de la partie (déplacement, choix de salle, menus...)
+Les clés sont dérivées du nom de la composante (BLAKE2b), identiques d'un processus à l'autre, sans
+toucher au générateur aléatoire du jeu. Une action ne modifie que le voisinage du joueur, son
+inventaire et au plus une salle de la pioche : update() ne revisite que ces composantes, en temps
+constant quelle que soit la taille du manoir. Le contenu des salles (objets) n'entre pas dans
+l'empreinte ; savegame.state_hash couvre l'état complet.
+"""
+import hashlib
+from collections import Counter, namedtuple
+import config
+from events import EventType
+
+
+DEFAULT_TABLE_SIZE = 1 << 16
+
+_NEIGHBOURHOOD = ((0, 0),) + tuple(config.DIRECTIONS.values())
+
+# Clés déjà calculées : composante -> entier de 64 bits
+_keys = {}
+
+
+def zobrist_key(*component):
+    """
+    Clé de 64 bits d'une composante de l'état (calculée une fois par processus)
+
+    Args:
+        *component: Description de la composante, par exemple ("porte", 3, 4, "UP", 1, True)
+
+    Returns:
+        int: Clé
+    """
+    key = _keys.get(component)
+    if key is None:
+        digest = hashlib.blake2b(repr(component).encode("utf-8"), digest_size=8).digest()
+        key = _keys[component] = int.from_bytes(digest, "little")
+    return key
+
+
+def _cell_key(room, row, col):
+    """Clé d'une case : salle placée et état de ses portes (0 pour une case vide)"""
+    if room is None:
+        return 0
+    key = zobrist_key("case", row, col, room.name)
+    for direction, door in room.door_objects.items():
+        key ^= zobrist_key("porte", row, col, direction, door.lock_level, door.opened)
+    return key
+
+
+class ZobristHash:
+    """
+    Empreinte d'une partie, tenue à jour action par action
+
+    Utilisation : appeler update() après chaque action (replay.apply_action...) ; value est alors
+    l'empreinte de l'état courant. Un remplacement en bloc de l'état (reset, restart, chargement
+    d'une sauvegarde) est détecté et provoque un recalcul complet.
+    """
+
+    def __init__(self, game):
+        """
+        Args:
+            game: Objet Game suivi (un récepteur est abonné à son flux d'événements)
+        """
+        self.game = game
+        self.value = 0
+        self.full_updates = 0
+        # Cases signalées par le flux d'événements depuis la dernière mise à jour
+        self._cells = set()
+        # Salles placées depuis la dernière mise à jour (candidates au retrait de la pioche)
+        self._placed = []
+        game.events.subscribe(self)
+        self.recompute()
+
+    def write(self, event):
+        """Récepteur d'événements : noter les composantes touchées"""
+        if event.type is EventType.ROOM_PLACED:
+            self._cells.add((event.data["row"], event.data["col"]))
+            self._placed.append(event.data["name"])
+        elif event.type is EventType.DOOR_OPENED:
+            self._cells.add((event.data["row"], event.data["col"]))
+
+    def recompute(self):
+        """Recalculer entièrement l'empreinte (et les valeurs de référence des mises à jour)"""
+        game = self.game
+        player = game.player
+        value = zobrist_key("partie", game.state) ^ zobrist_key("joueur", player.row, player.col)
+        self._cell_keys = {}
+        for (row, col), room in game.mansion.rooms.items():
+            key = self._cell_keys[row, col] = _cell_key(room, row, col)
+            value ^= key
+        self._counts = list(player.inventory.counts)
+        for item_id, count in enumerate(self._counts):
+            value ^= zobrist_key("inventaire", item_id, count)
+        deck = game.room_selector.available_rooms
+        self._deck = deck
+        self._deck_size = len(deck)
+        self._deck_counts = Counter(room.name for room in deck)
+        for name, copies in self._deck_counts.items():
+            for copy in range(copies):
+                value ^= zobrist_key("pioche", name, copy)
+        self._position = (player.row, player.col)
+        self._state = game.state
+        self._cells.clear()
+        self._placed.clear()
+        self.value = value
+        self.full_updates += 1
+        return value
+
+    def update(self):
+        """
+        Mettre l'empreinte à jour après une action
+
+        Returns:
+            int: Empreinte de l'état courant
+        """
+        game = self.game
+        deck = game.room_selector.available_rooms
+        if deck is not self._deck:
+            # Pioche remplacée : nouvelle partie ou sauvegarde chargée
+            return self.recompute()
+        value = self.value
+        player = game.player
+        position = (player.row, player.col)
+        if game.state != self._state:
+            value ^= zobrist_key("partie", self._state) ^ zobrist_key("partie", game.state)
+            self._state = game.state
+        # Cases modifiables par l'action : voisinage de l'ancienne et de la nouvelle position
+        cells = self._cells
+        for row, col in {self._position, position}:
+            for dr, dc in _NEIGHBOURHOOD:
+                cells.add((row + dr, col + dc))
+        if position != self._position:
+            value ^= zobrist_key("joueur", *self._position) ^ zobrist_key("joueur", *position)
+            self._position = position
+        rooms = game.mansion.rooms
+        cell_keys = self._cell_keys
+        for cell in cells:
+            key = _cell_key(rooms.get(cell), *cell)
+            previous = cell_keys.get(cell, 0)
+            if key != previous:
+                value ^= previous ^ key
+                cell_keys[cell] = key
+        cells.clear()
+        # Inventaire : vecteur de taille fixe
+        counts = player.inventory.counts
+        previous_counts = self._counts
+        for item_id, count in enumerate(counts):
+            previous = previous_counts[item_id]
+            if count != previous:
+                value ^= zobrist_key("inventaire", item_id, previous) ^ zobrist_key("inventaire", item_id, count)
+                previous_counts[item_id] = count
+        # Pioche : un exemplaire en moins par salle placée qui en provenait
+        for name in self._placed:
+            if len(deck) < self._deck_size and self._deck_counts[name] > 0:
+                self._deck_size -= 1
+                self._deck_counts[name] -= 1
+                value ^= zobrist_key("pioche", name, self._deck_counts[name])
+        self._placed.clear()
+        self.value = value
+        return value
+
+    def close(self):
+        """Désabonner le récepteur du flux d'événements"""
+        self.game.events.unsubscribe(self)
+
+
+# Entrée de la table : empreinte complète, profondeur de recherche, valeur associée, génération
+TableEntry = namedtuple("TableEntry", ["key", "depth", "value", "generation"])
+
+
+class TranspositionTable:
+    """
+    Table de transposition de taille bornée, indexée par les bits de poids faible de l'empreinte
+
+    Remplacement d'une entrée occupée par un autre état : la nouvelle entrée la remplace si l'ancienne
+    date d'une recherche précédente (génération plus ancienne) ou si elle a été calculée à une
+    profondeur inférieure ou égale ; les résultats les plus coûteux de la recherche en cours sont gardés.
+    """
+
+    def __init__(self, size=DEFAULT_TABLE_SIZE):
+        """
+        Args:
+            size: Nombre d'entrées (arrondi à la puissance de 2 supérieure)
+        """
+        size = 1 << max(0, size - 1).bit_length()
+        self.mask = size - 1
+        self.slots = [None] * size
+        self.generation = 0
+        self.count = 0
+        self.hits = 0
+        self.misses = 0
+        self.replacements = 0
+        self.rejections = 0
+
+    def __len__(self):
+        return self.count
+
+    def new_search(self):
+        """Commencer une nouvelle recherche : les entrées existantes deviennent remplaçables"""
+        self.generation += 1
+
+    def lookup(self, key):
+        """
+        Chercher un état
+
+        Args:
+            key: Empreinte (ZobristHash.value)
+
+        Returns:
+            TableEntry, ou None si l'état est absent
+        """
+        entry = self.slots[key & self.mask]
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def store(self, key, value, depth=0):
+        """
+        Enregistrer la valeur d'un état
+
+        Args:
+            key: Empreinte
+            value: Valeur associée (évaluation, meilleure action...)
+            depth: Profondeur de recherche ayant produit la valeur
+
+        Returns:
+            bool: False si l'entrée en place a été préférée
+        """
+        index = key & self.mask
+        current = self.slots[index]
+        if current is None:
+            self.count += 1
+        elif current.key != key:
+            if current.generation == self.generation and current.depth > depth:
+                self.rejections += 1
+                return False
+            self.replacements += 1
+        elif current.generation == self.generation and current.depth > depth:
+            # Même état déjà évalué plus profondément dans cette recherche
+            self.rejections += 1
+            return False
+        self.slots[index] = TableEntry(key, depth, value, self.generation)
+        return True
+
+    def clear(self):
+        """Vider la table"""
+        self.slots = [None] * len(self.slots)
+        self.generation = 0
+        self.count = 0